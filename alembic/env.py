@@ -11,6 +11,8 @@ from app.models import Category  # noqa: F401
 from app.models import SubCategory  # noqa: F401
 from app.models import Account  # noqa: F401
 from app.models import MonthlyBudget  # noqa: F401
+from app.models import MonthlySpend  # noqa: F401
+from app.models import NotificationOutbox  # noqa: F401
 from app.core.config import settings
 
 
@@ -30,6 +32,14 @@ if config.config_file_name is not None:
 config.set_main_option("sqlalchemy.url", settings.SQLALCHEMY_DATABASE_URL) 
 target_metadata = Base.metadata
 
+
+
+def include_name(name, type_, parent_names):
+    # The FTS5 search index and its shadow tables come from migrations, not the models.
+    if type_ == "table" and name and name.startswith("transactions_fts"):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -52,6 +62,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -75,7 +86,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_name=include_name
         )
 
         with context.begin_transaction():
@@ -0,0 +1,64 @@
+"""Add monthly spend aggregate
+
+Revision ID: a4d2b8e61f05
+Revises: 7c1e4f2a9b3d
+Create Date: 2026-10-17 16:40:12.804113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2b8e61f05'
+down_revision: Union[str, None] = '7c1e4f2a9b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    monthly_spend = op.create_table('monthly_spend',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('spent', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('year', 'month', name='uq_year_month_spend')
+    )
+    op.create_index(op.f('ix_monthly_spend_id'), 'monthly_spend', ['id'], unique=False)
+
+    # Backfill with the same rules as crud_spend.spending_conditions.
+    transactions = sa.table('transactions',
+        sa.column('amount'), sa.column('transaction_datetime_from_sms'), sa.column('subcategory_id'),
+        sa.column('account_id'), sa.column('override_reimbursable'), sa.column('linked_transaction_hash'),
+    )
+    subcategories = sa.table('subcategories', sa.column('id'), sa.column('exclude_from_budget'), sa.column('is_reimbursable'))
+    accounts = sa.table('accounts', sa.column('id'), sa.column('purpose'))
+    year = sa.cast(sa.extract('year', transactions.c.transaction_datetime_from_sms), sa.Integer)
+    month = sa.cast(sa.extract('month', transactions.c.transaction_datetime_from_sms), sa.Integer)
+    spend_by_period = sa.select(year, month, sa.func.sum(transactions.c.amount))\
+        .select_from(transactions)\
+        .join(subcategories, transactions.c.subcategory_id == subcategories.c.id)\
+        .join(accounts, transactions.c.account_id == accounts.c.id)\
+        .where(
+            transactions.c.transaction_datetime_from_sms.is_not(None),
+            transactions.c.amount.is_not(None),
+            accounts.c.purpose == 'PERSONAL',
+            subcategories.c.exclude_from_budget.is_(False),
+            transactions.c.linked_transaction_hash.is_(None),
+            sa.or_(
+                transactions.c.override_reimbursable.is_(False),
+                sa.and_(transactions.c.override_reimbursable.is_(None), subcategories.c.is_reimbursable.is_(False)),
+            ),
+        )\
+        .group_by(year, month)
+    op.execute(monthly_spend.insert().from_select(['year', 'month', 'spent'], spend_by_period))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_monthly_spend_id'), table_name='monthly_spend')
+    op.drop_table('monthly_spend')
@@ -0,0 +1,28 @@
+"""Add (received_at, id) index to transactions
+
+Revision ID: b7e3c9d14a62
+Revises: a4d2b8e61f05
+Create Date: 2026-10-17 19:05:33.517290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c9d14a62'
+down_revision: Union[str, None] = 'a4d2b8e61f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transactions_received_at_id', 'transactions', ['received_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_received_at_id', table_name='transactions')
@@ -0,0 +1,46 @@
+"""Add transaction list filter indexes
+
+Revision ID: c2f8a6e4d913
+Revises: b7e3c9d14a62
+Create Date: 2026-10-17 20:14:08.339052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8a6e4d913'
+down_revision: Union[str, None] = 'b7e3c9d14a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ix_transactions_account_received_at starts with account_id, so it replaces the
+    # single-column index (one less index to update on every ingest).
+    op.create_index('ix_transactions_account_received_at', 'transactions', ['account_id', 'received_at', 'id'], unique=False)
+    op.drop_index('ix_transactions_account_id', table_name='transactions')
+    op.create_index('ix_transactions_subcategory_received_at', 'transactions', ['subcategory_id', 'received_at', 'id'], unique=False)
+    # A category filter runs one query per subcategory; with a date range too, this index
+    # answers each of them without walking the subcategory's whole history.
+    op.create_index('ix_transactions_subcategory_datetime_from_sms', 'transactions', ['subcategory_id', 'transaction_datetime_from_sms'], unique=False)
+    op.create_index('ix_transactions_status_received_at', 'transactions', ['status', 'received_at', 'id'], unique=False)
+    op.create_index('ix_transactions_datetime_from_sms', 'transactions', ['transaction_datetime_from_sms'], unique=False)
+    op.create_index('ix_transactions_amount', 'transactions', ['amount'], unique=False)
+    op.create_index('ix_transactions_merchant_vpa_lower', 'transactions', [sa.text('lower(merchant_vpa)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_merchant_vpa_lower', table_name='transactions')
+    op.drop_index('ix_transactions_amount', table_name='transactions')
+    op.drop_index('ix_transactions_datetime_from_sms', table_name='transactions')
+    op.drop_index('ix_transactions_status_received_at', table_name='transactions')
+    op.drop_index('ix_transactions_subcategory_datetime_from_sms', table_name='transactions')
+    op.drop_index('ix_transactions_subcategory_received_at', table_name='transactions')
+    op.create_index('ix_transactions_account_id', 'transactions', ['account_id'], unique=False)
+    op.drop_index('ix_transactions_account_received_at', table_name='transactions')
@@ -0,0 +1,60 @@
+"""Add full-text search over transactions
+
+Revision ID: d5a1f7c3b824
+Revises: c2f8a6e4d913
+Create Date: 2026-10-17 21:02:47.190364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a1f7c3b824'
+down_revision: Union[str, None] = 'c2f8a6e4d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 is SQLite only; other databases search with ILIKE (crud_transaction.search_transactions).
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+        "merchant_vpa, description, raw_sms_content, "
+        "content='transactions', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+        "INSERT INTO transactions_fts(rowid, merchant_vpa, description, raw_sms_content) "
+        "VALUES (new.id, new.merchant_vpa, new.description, new.raw_sms_content); END"
+    )
+    op.execute(
+        "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, merchant_vpa, description, raw_sms_content) "
+        "VALUES ('delete', old.id, old.merchant_vpa, old.description, old.raw_sms_content); END"
+    )
+    op.execute(
+        "CREATE TRIGGER transactions_fts_au AFTER UPDATE OF merchant_vpa, description, raw_sms_content "
+        "ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, merchant_vpa, description, raw_sms_content) "
+        "VALUES ('delete', old.id, old.merchant_vpa, old.description, old.raw_sms_content); "
+        "INSERT INTO transactions_fts(rowid, merchant_vpa, description, raw_sms_content) "
+        "VALUES (new.id, new.merchant_vpa, new.description, new.raw_sms_content); END"
+    )
+    # Backfill: index every existing row from the content table.
+    op.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_ai")
+    op.execute("DROP TABLE IF EXISTS transactions_fts")
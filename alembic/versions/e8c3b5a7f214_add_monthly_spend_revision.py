@@ -0,0 +1,29 @@
+"""Add monthly_spend revision
+
+Revision ID: e8c3b5a7f214
+Revises: d5a1f7c3b824
+Create Date: 2026-10-17 22:14:05.628417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c3b5a7f214'
+down_revision: Union[str, None] = 'd5a1f7c3b824'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('monthly_spend', sa.Column('revision', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('monthly_spend', schema=None) as batch_op:
+        batch_op.drop_column('revision')
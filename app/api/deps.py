@@ -1,4 +1,4 @@
-from app.db.session import get_db  # noqa: F401
+from app.db.session import get_db, get_read_db  # noqa: F401
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader
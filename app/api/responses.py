@@ -0,0 +1,31 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(Response):
+    """
+    A JSON response for content that is already plain data (dicts, lists, str, numbers,
+    datetimes), e.g. the rows of the list endpoints. Returning it skips FastAPI's
+    response_model validation and serialization, so build the content in the shape of the
+    route's response_model. Serialized with orjson when it is installed.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -6,6 +6,7 @@ from app.crud import crud_account
 from app.core.config import settings
 from app.schemas import account as account_schema
 from app.api import deps
+from app.services.taxonomy import TAXONOMY
 
 router = APIRouter()
 
@@ -45,6 +46,7 @@ def create_new_account(
         )
     
     account = crud_account.create_account(db=db, obj_in=account_in)
+    TAXONOMY.invalidate()
     return account
 
 @router.get(
@@ -54,7 +56,7 @@ def create_new_account(
     dependencies=[Depends(verify_api_key)]
 )
 def read_all_accounts(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
@@ -135,4 +137,5 @@ def update_existing_account(
         )
 
     updated_account = crud_account.update_account(db=db, db_obj=db_account, obj_in=account_in)
+    TAXONOMY.invalidate()
     return updated_account
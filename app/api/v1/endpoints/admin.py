@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from typing import Any
+
+from app.api import deps
+from app.schemas.admin import ParserStatsResponse, TelegramSenderMetrics
+from app.services.parser_engine import get_parser_stats
+from app.services.telegram_sender import TELEGRAM_SENDER
+
+router = APIRouter()
+
+
+@router.get(
+    "/parsers/stats",
+    response_model=ParserStatsResponse,
+    summary="Per-parser hit, miss and latency counters",
+    dependencies=[Depends(deps.get_api_key)]
+)
+def read_parser_stats() -> Any:
+    """
+    Counters recorded by ParserEngine.run for every parser attempt, and the order in which
+    candidate parsers are currently tried (busiest first).
+    """
+    return get_parser_stats().snapshot()
+
+
+@router.post(
+    "/parsers/reorder",
+    response_model=ParserStatsResponse,
+    summary="Re-rank parsers by hit count now",
+    dependencies=[Depends(deps.get_api_key)]
+)
+def reorder_parsers() -> Any:
+    stats = get_parser_stats()
+    stats.reorder()
+    return stats.snapshot()
+
+
+@router.get(
+    "/telegram/sender",
+    response_model=TelegramSenderMetrics,
+    summary="Telegram send queue depth and counters",
+    dependencies=[Depends(deps.get_api_key)]
+)
+async def read_telegram_sender_metrics() -> Any:
+    """
+    Calls waiting in the rate-limited Telegram queue, edits waiting to be coalesced, and
+    sent/failed/retried/rate-limited/coalesced counts since start-up.
+    """
+    return TELEGRAM_SENDER.metrics()
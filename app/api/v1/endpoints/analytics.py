@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+from datetime import date
+
+from app.api import deps
+from app.schemas.analytics import SpendAnalytics, SpendDimension, SpendPeriod
+from app.services.spend_analytics import get_spend_analytics
+
+router = APIRouter()
+
+@router.get(
+    "/spend",
+    response_model=SpendAnalytics,
+    summary="Spending grouped by category, subcategory, account, merchant and/or period",
+    dependencies=[Depends(deps.get_api_key)]
+)
+def read_spend_analytics(
+    date_from: date,
+    date_to: date,
+    group_by: Optional[SpendDimension] = None,
+    period: Optional[SpendPeriod] = Query(None, description="Also group by day, week (from Monday) or month"),
+    db: Session = Depends(deps.get_read_db),
+) -> Any:
+    """
+    Budgeted spending between two SMS dates (inclusive), counted like the monthly budget:
+    personal accounts only, without excluded or reimbursable subcategories, linked or
+    reimbursable transactions. E.g. `?date_from=2025-01-01&date_to=2025-12-31&group_by=category&period=month`.
+    """
+    if date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from is after date_to.")
+    return get_spend_analytics(db, date_from=date_from, date_to=date_to, group_by=group_by, period=period)
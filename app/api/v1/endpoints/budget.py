@@ -39,7 +39,7 @@ def set_or_update_monthly_budget(
 def get_specific_monthly_budget(
     year: int,
     month: int,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
 ) -> Any:
     """
     Retrieves the budget record for the specified year and month.
@@ -63,7 +63,7 @@ def get_specific_monthly_budget(
     summary="Get Current Budget Summary",
     dependencies=[Depends(deps.get_api_key)]
 )
-def get_budget_summary(db: Session = Depends(deps.get_db)) -> Any:
+def get_budget_summary(db: Session = Depends(deps.get_read_db)) -> Any:
     """
     Returns the current month's budget, amount spent, and remaining spend power.
     """
@@ -15,6 +15,7 @@ from app.schemas.category import (
 from app.models.subcategory import SubCategory as SubCategoryModel
 
 from app.api import deps
+from app.services.taxonomy import TAXONOMY
 
 router = APIRouter()
 
@@ -25,7 +26,7 @@ router = APIRouter()
     description="Returns a list of all categories, each containing its subcategories, ordered by display_order."
 )
 def read_all_categories_with_details(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0, 
     limit: int = 100 
 ) -> Any:
@@ -81,6 +82,7 @@ def create_category_and_subcategory(
         category, subcategory, created_new_category = crud_category.create_category_with_subcategory(
             db=db, obj_in=category_data
         )
+        TAXONOMY.invalidate()
         
         db.refresh(category)
         db.refresh(subcategory)
@@ -129,6 +131,7 @@ def create_new_category(
             detail=f"Category with name '{category_in.name}' already exists.",
         )
     category = crud_category.create_category(db=db, obj_in=category_in)
+    TAXONOMY.invalidate()
     return category
 
 
@@ -153,6 +156,7 @@ def create_new_categories_bulk(
             detail="The list of categories cannot be empty.",
         )
     created_db_categories, errors = crud_category.create_multiple_categories(db=db, categories_in=categories_in.categories)
+    TAXONOMY.invalidate()
     
     return {"created_categories": created_db_categories, "errors": errors}
 
@@ -250,4 +254,5 @@ def update_single_subcategory(
     updated_subcategory = crud_subcategory.update_subcategory(
         db=db, db_obj=db_subcategory, obj_in=subcategory_in
     )
+    TAXONOMY.invalidate()
     return updated_subcategory
\ No newline at end of file
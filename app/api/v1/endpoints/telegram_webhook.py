@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, BackgroundTasks, status
 from sqlalchemy.orm import Session
-from typing import Any
+from typing import Any, Optional, Tuple
 
 from app.api import deps
 from app.core.config import settings
 from app.schemas.telegram import TelegramUpdate
 from app.schemas.transaction import TransactionUpdate, TransactionStatus
 from app.crud import crud_transaction 
+from app.db.session import run_in_db_thread
 from app.services import telegram_notifier
 from app.services.transaction_status_manager import TransactionStatusManager
 
@@ -32,18 +33,37 @@ async def telegram_webhook(
     if update.callback_query.message.chat.id != int(settings.TELEGRAM_CHAT_ID):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized chat")
 
-    callback_data = update.callback_query.data
+    # Looking up and updating the transaction is blocking database I/O; keep it off the event loop.
+    response, updated_transaction_orm = await run_in_db_thread(
+        _apply_callback, db, update.callback_query.data
+    )
+    if updated_transaction_orm is not None:
+        background_tasks.add_task(
+            telegram_notifier.edit_message_after_update,
+            transaction=updated_transaction_orm,
+            chat_id=update.callback_query.message.chat.id,
+            message_id=update.callback_query.message.message_id,
+            db=db
+        )
+    return response
+
+
+def _apply_callback(db: Session, callback_data: str) -> Tuple[dict, Optional[Any]]:
+    """
+    Applies a button press to its transaction. Runs on the DB thread pool.
+    Returns the webhook response and the updated transaction (None if nothing changed).
+    """
     # callback_data is formatted as "action:hash:value"
     # e.g., "set_cat:some_hash_string:5"
     try:
         action, unique_hash, value_str = callback_data.split(":")
     except (ValueError, IndexError):
         print(f"ERROR: Could not parse callback_data: {callback_data}")
-        return {"ok": False, "error": "Invalid callback_data format"}
+        return {"ok": False, "error": "Invalid callback_data format"}, None
 
     db_transaction = crud_transaction.get_transaction_by_hash(db, hash_str=unique_hash, include_relations=False)
     if not db_transaction or not db_transaction.telegram_message_id:
-        return {"ok": True}
+        return {"ok": True}, None
     
     
     update_data = {}
@@ -65,22 +85,14 @@ async def telegram_webhook(
             update_data["status"] = new_status_enum
         except KeyError:
             print(f"ERROR: Invalid status value for sel_mod: {value_str}")
-            return {"ok": False, "error": "Invalid status value"}
+            return {"ok": False, "error": "Invalid status value"}, None
     else:
-        return {"ok": False, "error": "Unknown action"}
+        return {"ok": False, "error": "Unknown action"}, None
     
     update_schema = TransactionUpdate(**update_data)
     
+    # The edited message takes its account and category names from TAXONOMY.
     updated_transaction_orm = crud_transaction.update_transaction(
-        db=db, db_obj=db_transaction, obj_in=update_schema
-    ) # This will have relations loaded
-
-    background_tasks.add_task(
-        telegram_notifier.edit_message_after_update,
-        transaction=updated_transaction_orm, # Pass the ORM object with relations
-        chat_id=update.callback_query.message.chat.id,
-        message_id=update.callback_query.message.message_id,
-        db=db
+        db=db, db_obj=db_transaction, obj_in=update_schema, include_relations=False
     )
-    
-    return {"ok": True}
\ No newline at end of file
+    return {"ok": True}, updated_transaction_orm
@@ -1,23 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from app.services import telegram_notifier
 from sqlalchemy.orm import Session
-from typing import Any, List 
+from typing import Any, List, Optional, Tuple
 
 from app.api import deps
+from app.api.responses import FastJSONResponse
 from app.core.config import settings
-from app.services.parser_engine import ParserEngine
+from app.db.session import ReadSessionLocal, run_in_db_thread
+from app.services.account_resolver import AccountResolver
+from app.services.parser_engine import get_parser_engine
+from app.services.notification_outbox import OUTBOX_WORKER
 from app.services.transaction_status_manager import TransactionStatusManager
+from app.services.taxonomy import TAXONOMY, TaxonomySnapshot
 
 from app.services.rule_engine import RuleEngine
 from app.services.budget_service import get_remaining_spend_power
+from app.services.sms_ingest import BatchIngestor, summarize_results
+from app.services import transaction_export
 
 
 from app.schemas.transaction import (
     TransactionInDB, SMSRecieved, TransactionCreate, TransactionUpdate,
     SubCategoryForTransaction ,
-    AccountForTransaction  
+    AccountForTransaction,
+    SMSBulkReceived, BulkIngestResponse, TransactionPage, TransactionFilter, ExportFormat
 )
-from app.crud import crud_transaction, crud_account, crud_subcategory
+from app.crud import crud_transaction
 
 router = APIRouter()
 
@@ -28,33 +37,42 @@ async def verify_api_key(x_api_key: str = Header(...)):
             detail="Invalid API Key",
         )
         
-def _map_transaction_to_response_schema(transaction: Any) -> TransactionInDB:
-    """Helper to map ORM object to Pydantic schema, populating SubCategoryForTransaction."""
+def _map_transaction_to_response_schema(transaction: Any, taxonomy: Optional[TaxonomySnapshot] = None) -> TransactionInDB:
+    """
+    Helper to map ORM object to Pydantic schema, populating SubCategoryForTransaction.
+    With a `taxonomy`, the nested account and subcategory come from it and the row's
+    relationships are never touched, so the row can be loaded without them.
+    """
     if not transaction:
         return None
     
-    subcategory_for_response = None
-    if transaction.subcategory:
-        parent_name = "N/A"
-        if transaction.subcategory.parent_category: 
-            parent_name = transaction.subcategory.parent_category.name
-        
-        subcategory_for_response = SubCategoryForTransaction(
-            id=transaction.subcategory.id,
-            name=transaction.subcategory.name,
-            icon_name=transaction.subcategory.icon_name,
-            parent_category_id=transaction.subcategory.parent_category_id,
-            parent_category_name=parent_name
+    if taxonomy is not None:
+        account_for_response, subcategory_for_response = _map_references(
+            taxonomy, transaction.account_id, transaction.subcategory_id
         )
+    else:
+        subcategory_for_response = None
+        if transaction.subcategory:
+            parent_name = "N/A"
+            if transaction.subcategory.parent_category: 
+                parent_name = transaction.subcategory.parent_category.name
+            
+            subcategory_for_response = SubCategoryForTransaction(
+                id=transaction.subcategory.id,
+                name=transaction.subcategory.name,
+                icon_name=transaction.subcategory.icon_name,
+                parent_category_id=transaction.subcategory.parent_category_id,
+                parent_category_name=parent_name
+            )
 
-    account_for_response = None
-    if transaction.account:
-        account_for_response = AccountForTransaction(
-            id=transaction.account.id,
-            name=transaction.account.name,
-            account_type=transaction.account.account_type,
-            account_last4=transaction.account.account_last4
-        )
+        account_for_response = None
+        if transaction.account:
+            account_for_response = AccountForTransaction(
+                id=transaction.account.id,
+                name=transaction.account.name,
+                account_type=transaction.account.account_type,
+                account_last4=transaction.account.account_last4
+            )
 
     return TransactionInDB(
         id=transaction.id,
@@ -75,6 +93,90 @@ def _map_transaction_to_response_schema(transaction: Any) -> TransactionInDB:
         override_reimbursable=transaction.override_reimbursable,
         subcategory=subcategory_for_response,
     )
+
+
+def _map_references(
+    taxonomy: TaxonomySnapshot, account_id: Optional[int], subcategory_id: Optional[int]
+) -> Tuple[Optional[AccountForTransaction], Optional[SubCategoryForTransaction]]:
+    """The response's nested account and subcategory, from cached reference data."""
+    subcategory_for_response = None
+    if (subcategory := taxonomy.subcategories.get(subcategory_id)) is not None:
+        subcategory_for_response = SubCategoryForTransaction(
+            id=subcategory.id,
+            name=subcategory.name,
+            icon_name=subcategory.icon_name,
+            parent_category_id=subcategory.parent_category_id,
+            parent_category_name=subcategory.parent_category_name,
+        )
+
+    account_for_response = None
+    if (account := taxonomy.accounts.get(account_id)) is not None:
+        account_for_response = AccountForTransaction(
+            id=account.id,
+            name=account.name,
+            account_type=account.account_type,
+            account_last4=account.account_last4
+        )
+    return account_for_response, subcategory_for_response
+
+
+def _map_row_to_response(row: Any) -> dict:
+    """
+    A TransactionInDB as plain data, from a row of crud_transaction's projected queries:
+    what the list endpoints serialize, without building the schemas per row. Unpacks the
+    row by position (named access costs more than the rest of this function).
+    """
+    (
+        transaction_id, unique_hash, _telegram_message_id, raw_sms_content, received_at, amount, currency,
+        merchant_vpa, transaction_datetime_from_sms, description, transaction_status, account_id, subcategory_id,
+        linked_transaction_hash, override_reimbursable, account_name, account_type, account_last4,
+        subcategory_name, icon_name, parent_category_id, parent_category_name, *_,
+    ) = row
+    return {
+        "amount": amount,
+        "currency": currency,
+        "merchant_vpa": merchant_vpa,
+        "transaction_datetime_from_sms": transaction_datetime_from_sms,
+        "description": description,
+        "raw_sms_content": raw_sms_content,
+        "unique_hash": unique_hash,
+        "linked_transaction_hash": linked_transaction_hash,
+        "override_reimbursable": override_reimbursable,
+        "subcategory_id": subcategory_id,
+        "account_id": account_id,
+        "status": transaction_status.value if transaction_status else None,
+        "id": transaction_id,
+        "received_at": received_at,
+        "account": None if account_name is None else {
+            "id": account_id,
+            "name": account_name,
+            "account_type": account_type.value,
+            "account_last4": account_last4,
+        },
+        "subcategory": None if subcategory_name is None else {
+            "id": subcategory_id,
+            "name": subcategory_name,
+            "icon_name": icon_name,
+            "parent_category_id": parent_category_id,
+            "parent_category_name": parent_category_name or "N/A",
+        },
+    }
+
+
+def _map_created_transaction_to_response_schema(
+    obj_in: TransactionCreate, transaction_id: int, received_at: Any, subcategory_id: int, taxonomy: TaxonomySnapshot
+) -> TransactionInDB:
+    """Builds the response for a just-inserted transaction from its input and cached reference data, without a query."""
+    account_for_response, subcategory_for_response = _map_references(taxonomy, obj_in.account_id, subcategory_id)
+    return TransactionInDB(
+        **obj_in.dict(exclude={"subcategory_id", "status"}),
+        id=transaction_id,
+        received_at=received_at,
+        status=obj_in.status.value,
+        subcategory_id=subcategory_id,
+        account=account_for_response,
+        subcategory=subcategory_for_response,
+    )
     
 
 @router.post("/", response_model=TransactionInDB, dependencies=[Depends(verify_api_key)])
@@ -87,17 +189,17 @@ async def receive_sms(
     """
     Receive SMS content from iPhone Shortcut.
     """
-    parser = ParserEngine(db_session=db)
-    parsed_data = parser.run(sms_text=sms_in.sms_content)
+    # All of the work below is blocking database I/O; keep it off the event loop.
+    return await run_in_db_thread(_ingest_sms, db, sms_in.sms_content)
+
+
+def _ingest_sms(db: Session, sms_content: str) -> TransactionInDB:
+    """Parses, validates and stores one SMS for `receive_sms`. Runs on the DB thread pool."""
+    parsed_data = get_parser_engine().run(sms_text=sms_content, accounts=AccountResolver(db_session=db))
     
     if not parsed_data:
         raise HTTPException(status_code=422, detail={"status":"SMS is not a processable debit transaction or has an unparseable format."})
     
-    existing_transaction = crud_transaction.get_transaction_by_hash(db, hash_str=parsed_data["unique_hash"])
-    if existing_transaction:
-        print(f"DEBUG: Duplicate transaction detected. Returning existing ID {existing_transaction.id}.")
-        return _map_transaction_to_response_schema(existing_transaction)
-    
     rule_engine = RuleEngine(db_session=db)
     auto_subcategory_id = rule_engine.run(parsed_data)
     if auto_subcategory_id:
@@ -109,28 +211,72 @@ async def receive_sms(
     )
 
     parsed_data["status"] = current_status.value
-    parsed_data["raw_sms_content"] = sms_in.sms_content
+    parsed_data["raw_sms_content"] = sms_content
     
     parsed_data.pop("flow_type", None) 
     
     transaction_to_create = TransactionCreate(**parsed_data)
+
+    # Reference data comes from the in-memory taxonomy; the insert below is the only
+    # statement for a new SMS (plus the outbox row, in the same commit).
+    taxonomy = TAXONOMY.current(db)
+    subcategory_id = transaction_to_create.subcategory_id
+    if subcategory_id not in taxonomy.subcategories:
+        if subcategory_id is not None:
+            print(f"WARNING: Provided subcategory_id {subcategory_id} not found. Defaulting to Uncategorized.")
+        subcategory_id = taxonomy.default_subcategory_id or crud_transaction.get_default_uncategorized_subcategory_id(db)
   
     try:
-        db_transaction = crud_transaction.create_transaction(db=db, obj_in=transaction_to_create)
+        # The Telegram notification is queued in the same commit and sent by OUTBOX_WORKER.
+        inserted = crud_transaction.insert_transaction_if_new(
+            db, obj_in=transaction_to_create, subcategory_id=subcategory_id, notify=telegram_notifier.is_configured()
+        )
     except Exception as e:
         print(f"Error creating transaction: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid transaction data: {str(e)}")
-    
-    transaction_with_relations = crud_transaction.get_transaction_by_hash(db, hash_str=db_transaction.unique_hash, include_relations=True)
 
-    message_id = await telegram_notifier.send_new_transaction_notification(
-        transaction=transaction_with_relations, 
-        db=db
+    if inserted is None:
+        existing_transaction = crud_transaction.get_transaction_by_hash(
+            db, hash_str=transaction_to_create.unique_hash, include_relations=False
+        )
+        print(f"DEBUG: Duplicate transaction detected. Returning existing ID {existing_transaction.id}.")
+        return _map_transaction_to_response_schema(existing_transaction, taxonomy)
+    OUTBOX_WORKER.wake()
+
+    transaction_id, received_at = inserted
+    return _map_created_transaction_to_response_schema(
+        transaction_to_create, transaction_id, received_at, subcategory_id, taxonomy
     )
-    if message_id:
-        crud_transaction.update_transaction_message_id(db, transaction_obj=transaction_with_relations, message_id=message_id)
 
-    return _map_transaction_to_response_schema(transaction_with_relations)
+
+@router.post(
+    "/bulk",
+    response_model=BulkIngestResponse,
+    summary="Ingest a batch of SMS (historical backfill)",
+    dependencies=[Depends(verify_api_key)]
+)
+def receive_sms_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    sms_in: SMSBulkReceived,
+) -> Any:
+    """
+    Parse and store many SMS in one go, e.g. when onboarding a phone.
+
+    Duplicates are detected with a single set-based hash lookup and all new rows are
+    inserted in one database transaction. No Telegram notifications are sent for
+    backfilled transactions.
+    """
+    ingestor = BatchIngestor(db_session=db)
+    try:
+        results = ingestor.ingest(enumerate(sms_in.sms_contents))
+    except Exception as e:
+        print(f"Error creating transactions in bulk: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid transaction data: {str(e)}")
+
+    return summarize_results(results)
+
+
 @router.get(
     "/get/by-token",
     response_model=TransactionInDB,
@@ -147,14 +293,60 @@ def get_transaction_by_token(
 
 
 
-@router.get("/list", response_model=List[TransactionInDB])
+@router.get("/list", response_model=TransactionPage)
 def read_transactions(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    db: Session = Depends(deps.get_read_db),
+    filters: TransactionFilter = Depends(),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Transactions matching the filters, newest first. Returns `next_cursor` while there are
+    more: pass it as `cursor`, with the same filters, to get the next page.
+    """
+    try:
+        rows, next_cursor = crud_transaction.get_transactions_page(
+            db, limit=limit, cursor=cursor, filters=filters, projected=True
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return FastJSONResponse({"items": [_map_row_to_response(row) for row in rows], "next_cursor": next_cursor})
+
+@router.get("/search", response_model=List[TransactionInDB])
+def search_transactions_api(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in the merchant, description or SMS"),
+    db: Session = Depends(deps.get_read_db),
+    filters: TransactionFilter = Depends(),
+    limit: int = Query(20, ge=1, le=100),
+) -> Any:
+    """
+    Full-text search, best match first: every word of `q` must appear (as a word prefix)
+    in the merchant, the description or the SMS text. Takes the same filters as /list,
+    e.g. `?q=swiggy&date_from=2025-03-01&date_to=2025-03-31`.
+    """
+    rows = crud_transaction.search_transactions(db, text=q, filters=filters, limit=limit, projected=True)
+    return FastJSONResponse([_map_row_to_response(row) for row in rows])
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Download transactions as CSV or NDJSON",
+    dependencies=[Depends(verify_api_key)]
+)
+def export_transactions(
+    filters: TransactionFilter = Depends(),
+    format: ExportFormat = ExportFormat.CSV,
 ) -> Any:
-    transactions_orm = crud_transaction.get_transactions(db, skip=skip, limit=limit, include_relations=True)
-    return [_map_transaction_to_response_schema(tx) for tx in transactions_orm]
+    """
+    Every transaction matching the filters (the same as /list), newest first, with its
+    account, category and subcategory names. Streamed as it is read, so an export of a
+    million rows takes no more memory than one of a thousand.
+    """
+    return StreamingResponse(
+        transaction_export.stream_transactions(ReadSessionLocal, format, filters),
+        media_type=transaction_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format.value}"'},
+    )
 
 @router.get(
     "/get/{transaction_hash}", 
@@ -191,12 +383,13 @@ def _update_transaction_logic(
     
     # category_name logic is removed. Update is via subcategory_id.
     # Ensure subcategory_id, if provided, is valid (optional check here, or rely on FK constraint)
+    taxonomy = TAXONOMY.current(db)
     if "subcategory_id" in update_data and update_data["subcategory_id"] is not None:
-        if not crud_subcategory.get_subcategory(db=db, subcategory_id=update_data["subcategory_id"]):
+        if update_data["subcategory_id"] not in taxonomy.subcategories:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"SubCategory with ID {update_data['subcategory_id']} not found.")
             
     if "account_id" in update_data and update_data["account_id"] is not None:
-        if not crud_account.get_account(db=db, account_id=update_data["account_id"]):
+        if update_data["account_id"] not in taxonomy.accounts:
              raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Account with ID {update_data['account_id']} not found.")
     
 
@@ -210,7 +403,7 @@ def _update_transaction_logic(
     update_schema = TransactionUpdate(**update_data) 
 
     updated_transaction_orm = crud_transaction.update_transaction(
-        db=db, db_obj=db_transaction, obj_in=update_schema
+        db=db, db_obj=db_transaction, obj_in=update_schema, include_relations=False
     )
     
     if updated_transaction_orm.telegram_message_id:
@@ -222,7 +415,7 @@ def _update_transaction_logic(
             db=db
         )
 
-    return _map_transaction_to_response_schema(updated_transaction_orm)
+    return _map_transaction_to_response_schema(updated_transaction_orm, taxonomy)
 
 @router.patch(
     "/by-token",
@@ -273,9 +466,8 @@ def get_linkable_transactions(
     Returns a list of recent transactions that are not yet linked,
     which can be presented as options for linking.
     """
-    transactions_orm = crud_transaction.get_transactions_for_linking(db=db, days=30, limit=50)
-    
-    return [_map_transaction_to_response_schema(tx) for tx in transactions_orm]
+    rows = crud_transaction.get_transactions_for_linking(db=db, days=30, limit=50, projected=True)
+    return FastJSONResponse([_map_row_to_response(row) for row in rows])
 
 
 @router.get(
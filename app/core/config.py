@@ -5,6 +5,9 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "SMS Finance Tracker"
     SQLALCHEMY_DATABASE_URL: str = "sqlite:///./finance_tracker.db"
+    # Where read-only GET endpoints (deps.get_read_db) query, e.g. a Postgres replica.
+    # Unset: a read-only connection to the same file on SQLite, the main database otherwise.
+    SQLALCHEMY_READ_DATABASE_URL: Optional[str] = None
     APP_SECRET_KEY: Optional[str] = None
     IPHONE_SHORTCUT_API_KEY: Optional[str] = None
     VERSION: str = "0.3.0"
@@ -17,6 +20,66 @@ class Settings(BaseSettings):
     
     LOG_UNPARSED_FINANCE_SMS: bool = False
 
+    # Async endpoints and background tasks run their (synchronous) SQLAlchemy work on a
+    # dedicated thread pool of this size, so a query never blocks the event loop. Keep it
+    # at or below the engine's pool_size + max_overflow (5 + 10 by default).
+    DB_THREAD_POOL_SIZE: int = 8
+
+    # Transaction exports (/transactions/export, scripts/export_transactions) fetch and
+    # write this many rows at a time; memory stays flat however large the export.
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Spending analytics keep the grouped totals of closed months in memory, one entry per
+    # month and grouping (see app/services/spend_analytics.py); least recently used go first.
+    ANALYTICS_CACHE_SIZE: int = 4096
+
+    # SQLite only (ignored for other databases), applied to every new connection; see
+    # app/db/sqlite_profile.py. SQLITE_CACHE_SIZE is per connection: negative means KiB,
+    # positive means pages.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -16384
+    SQLITE_MMAP_SIZE: int = 134217728
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    # Background maintenance while the app runs (seconds between runs; 0 disables one):
+    # PRAGMA optimize, a full ANALYZE, and a passive WAL checkpoint.
+    SQLITE_OPTIMIZE_INTERVAL_SECONDS: float = 3600.0
+    SQLITE_ANALYZE_INTERVAL_SECONDS: float = 86400.0
+    SQLITE_CHECKPOINT_INTERVAL_SECONDS: float = 300.0
+
+    # Directory of parser spec *.json files; defaults to app/services/parsers/specs.
+    PARSER_SPEC_DIR: Optional[str] = None
+    # How often (seconds) spec files are checked for changes; 0 disables hot reload.
+    PARSER_SPEC_RELOAD_SECONDS: float = 1.0
+    # Per-parser hit counters and the derived parser order survive restarts in this file.
+    PARSER_STATS_PATH: Optional[str] = "parser_stats.json"
+    # The file is written at most this long (seconds) after an attempt is recorded, and at
+    # shutdown; 0 saves only on re-ranking and at shutdown.
+    PARSER_STATS_SAVE_SECONDS: float = 60.0
+    # Parsers are re-ranked by hit count after this many parse attempts.
+    PARSER_REORDER_EVERY: int = 500
+
+    # Telegram notifications are queued in the notification_outbox table and sent by a
+    # background worker. It looks for due rows at least this often (seconds)...
+    OUTBOX_POLL_SECONDS: float = 5.0
+    # ...claims at most this many per round...
+    OUTBOX_BATCH_SIZE: int = 20
+    # ...and gives up on a notification after this many failed attempts.
+    OUTBOX_MAX_ATTEMPTS: int = 8
+
+    # Bot API calls are paced to stay under Telegram's limits: messages/second overall,
+    # messages/second per chat, and how many a chat may get in a short burst.
+    TELEGRAM_GLOBAL_RATE: float = 30.0
+    TELEGRAM_CHAT_RATE: float = 1.0
+    TELEGRAM_CHAT_BURST: float = 3.0
+    # Network errors and 5xx responses are retried this many times with backoff.
+    TELEGRAM_MAX_RETRIES: int = 5
+    # One pooled HTTP client is kept open to api.telegram.org; HTTP/2 needs httpx[http2].
+    TELEGRAM_HTTP2: bool = True
+    TELEGRAM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    TELEGRAM_TIMEOUT_SECONDS: float = 15.0
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
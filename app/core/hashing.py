@@ -39,7 +39,7 @@ def generate_transaction_hash(parsed_data: Dict[str, Any], hash_type: str = 'xxh
 
         
         if hash_type == 'xxhash':
-            hash_bytes = xxhash.xxh128(stable_string, seed=2024).digest()
+            hash_bytes = xxhash.xxh128(stable_string.encode('utf-8'), seed=2024).digest()
             encoded_hash = base64.urlsafe_b64encode(hash_bytes).decode('ascii').rstrip('=')
             return encoded_hash
         
@@ -5,16 +5,17 @@ from .crud_category import (
 )
 from .crud_subcategory import get_subcategory, get_subcategories_for_parent 
 from .crud_transaction import (
-    create_transaction, get_transaction, get_transactions, 
+    create_transaction, get_transaction, get_transactions_page, 
     update_transaction, get_transaction_by_hash, update_transaction_message_id,
     get_default_uncategorized_subcategory_id 
 )
 from .crud_budget import get_budget, create_or_update_budget
 
 from .crud_transaction import (
-    create_transaction, get_transaction, get_transactions, 
+    create_transaction, get_transaction, get_transactions_page, 
     update_transaction, get_transaction_by_hash, update_transaction_message_id,
     get_default_uncategorized_subcategory_id,
-    get_transactions_for_linking # New export
+    get_transactions_for_linking, # New export
+    get_existing_hashes, create_transactions_bulk
 )
 from .crud_budget import get_budget, create_or_update_budget
\ No newline at end of file
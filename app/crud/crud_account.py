@@ -1,7 +1,10 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from app.crud import crud_spend
 from app.models.account import Account as AccountModel, AccountType
+from app.models.transaction import Transaction
 from app.schemas.account import AccountCreate, AccountUpdate
 
 # --- READ Operations ---
@@ -42,6 +45,35 @@ def create_account(db: Session, *, obj_in: AccountCreate) -> AccountModel:
     db.refresh(db_obj)
     return db_obj
 
+def get_or_create_account(db: Session, *, obj_in: AccountCreate) -> Tuple[AccountModel, bool]:
+    """
+    Create the account unless (bank_name, account_last4) already exists. Returns the
+    account and whether it was created. If another writer inserts the same account
+    first, the unique constraint rejects ours and the existing row is returned.
+    The insert runs in a SAVEPOINT, so losing that race rolls back only the insert and
+    keeps whatever else the caller has pending in `db`.
+    """
+    existing = get_account_by_identifier(db, bank_name=obj_in.bank_name, account_last4=obj_in.account_last4)
+    if existing:
+        return existing, False
+    db_obj = AccountModel(
+        name=obj_in.name,
+        account_type=obj_in.account_type,
+        bank_name=obj_in.bank_name,
+        account_last4=obj_in.account_last4
+    )
+    try:
+        with db.begin_nested():
+            db.add(db_obj)
+    except IntegrityError:
+        existing = get_account_by_identifier(db, bank_name=obj_in.bank_name, account_last4=obj_in.account_last4)
+        if existing is None:
+            raise
+        return existing, False
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj, True
+
 # --- UPDATE Operation ---
 
 def update_account(
@@ -55,6 +87,10 @@ def update_account(
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     db.add(db_obj)
+    if "purpose" in update_data:
+        # Only personal accounts count towards the budget.
+        db.flush()
+        crud_spend.recompute_periods(db, Transaction.account_id == db_obj.id)
     db.commit()
     db.refresh(db_obj)
     return db_obj
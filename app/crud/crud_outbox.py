@@ -0,0 +1,93 @@
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.models.notification_outbox import NotificationOutbox, OutboxStatus
+from app.models.transaction import Transaction
+
+
+def enqueue_notification(
+    db: Session, *, transaction: Optional[Transaction] = None, transaction_id: Optional[int] = None,
+    kind: str = "new_transaction",
+) -> NotificationOutbox:
+    """
+    Adds an outbox row for the transaction (the pending ORM object, or the ID of an
+    already inserted row) to the session without committing, so it is written in the
+    same database transaction as the transaction itself.
+    """
+    db_obj = NotificationOutbox(kind=kind, status=OutboxStatus.PENDING)
+    if transaction is not None:
+        db_obj.transaction = transaction
+    else:
+        db_obj.transaction_id = transaction_id
+    db.add(db_obj)
+    return db_obj
+
+def claim_due(db: Session, *, limit: int, lease: timedelta, now: Optional[datetime] = None) -> List[NotificationOutbox]:
+    """
+    Claims up to `limit` pending rows whose next attempt is due.
+
+    A row is claimed by pushing its `next_attempt_at` forward by `lease` with a
+    conditional UPDATE, so two workers never send the same row at the same time. A row
+    whose worker died mid-send becomes due again once the lease runs out.
+    """
+    now = now or datetime.now()
+    due = db.query(NotificationOutbox.id, NotificationOutbox.next_attempt_at).filter(
+        NotificationOutbox.status == OutboxStatus.PENDING,
+        NotificationOutbox.next_attempt_at <= now,
+    ).order_by(NotificationOutbox.next_attempt_at).limit(limit).all()
+
+    claimed_ids = []
+    for outbox_id, next_attempt_at in due:
+        claimed = db.query(NotificationOutbox).filter(
+            NotificationOutbox.id == outbox_id,
+            NotificationOutbox.status == OutboxStatus.PENDING,
+            NotificationOutbox.next_attempt_at == next_attempt_at,
+        ).update(
+            {NotificationOutbox.next_attempt_at: now + lease, NotificationOutbox.attempts: NotificationOutbox.attempts + 1},
+            synchronize_session=False,
+        )
+        if claimed:
+            claimed_ids.append(outbox_id)
+    db.commit()
+
+    if not claimed_ids:
+        return []
+    return db.query(NotificationOutbox).filter(NotificationOutbox.id.in_(claimed_ids)).order_by(NotificationOutbox.id).all()
+
+def renew_lease(
+    db: Session, *, outbox_id: int, leased_until: datetime, lease: timedelta, now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Extends a claim made by `claim_due` to `now + lease` right before the row is sent.
+    Returns the new expiry, or None if the row is no longer ours: its lease (ending at
+    `leased_until`) ran out and another worker claimed it, or it was already settled.
+    """
+    now = now or datetime.now()
+    renewed = db.query(NotificationOutbox).filter(
+        NotificationOutbox.id == outbox_id,
+        NotificationOutbox.status == OutboxStatus.PENDING,
+        NotificationOutbox.next_attempt_at == leased_until,
+    ).update({NotificationOutbox.next_attempt_at: now + lease}, synchronize_session=False)
+    db.commit()
+    return now + lease if renewed else None
+
+def mark_sent(db: Session, *, db_obj: NotificationOutbox, message_id: Optional[int]) -> NotificationOutbox:
+    """Marks the row sent and stores the Telegram message id on its transaction, in one commit."""
+    db_obj.status = OutboxStatus.SENT
+    db_obj.sent_at = datetime.now()
+    db_obj.last_error = None
+    if message_id:
+        db_obj.transaction.telegram_message_id = message_id
+    db.commit()
+    return db_obj
+
+def mark_failed(db: Session, *, db_obj: NotificationOutbox, error: str, retry_at: Optional[datetime]) -> NotificationOutbox:
+    """Records a failed attempt; the row is retried at `retry_at`, or given up on if that is None."""
+    db_obj.last_error = error
+    if retry_at is None:
+        db_obj.status = OutboxStatus.FAILED
+    else:
+        db_obj.next_attempt_at = retry_at
+    db.commit()
+    return db_obj
@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, cast, delete, extract, func, literal, null, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.db.session import dialect_insert
+from app.models import Account, AccountPurpose, MonthlySpend, SubCategory, Transaction
+
+# Transaction columns that decide whether, where and how much a transaction counts.
+SPEND_FIELDS = {
+    "amount", "transaction_datetime_from_sms", "subcategory_id", "account_id",
+    "override_reimbursable", "linked_transaction_hash",
+}
+
+
+def spending_conditions():
+    """
+    The rules for a transaction to count towards the monthly budget:
+    a personal account, a budgeted subcategory, not linked to another transaction, and
+    not reimbursable (override_reimbursable wins over the subcategory's is_reimbursable).
+    Needs SubCategory joined; accounts are matched with a subquery rather than a join,
+    which SQLite would put in the outer loop and read every transaction once per account.
+    """
+    return (
+        Transaction.account_id.in_(select(Account.id).where(Account.purpose == AccountPurpose.PERSONAL)),
+        SubCategory.exclude_from_budget.is_(False),
+        Transaction.linked_transaction_hash.is_(None),
+        or_(
+            Transaction.override_reimbursable.is_(False),
+            and_(
+                Transaction.override_reimbursable.is_(None),
+                SubCategory.is_reimbursable.is_(False)
+            )
+        ),
+    )
+
+
+def _period_columns():
+    return (
+        cast(extract("year", Transaction.transaction_datetime_from_sms), Integer),
+        cast(extract("month", Transaction.transaction_datetime_from_sms), Integer),
+    )
+
+
+def _spend_by_period(*where, sign: int = 1):
+    year, month = _period_columns()
+    return select(year, month, sign * func.sum(Transaction.amount))\
+        .select_from(Transaction)\
+        .join(SubCategory, Transaction.subcategory_id == SubCategory.id)\
+        .where(
+            Transaction.transaction_datetime_from_sms.is_not(None), Transaction.amount.is_not(None),
+            *spending_conditions(), *where,
+        )\
+        .group_by(year, month)
+
+
+def _upsert(db: Session, spend_by_period, *, accumulate: bool, first_revision: int = 1) -> None:
+    statement = dialect_insert(db)(MonthlySpend).from_select(
+        ["year", "month", "spent", "revision"], spend_by_period.add_columns(literal(first_revision, Integer))
+    )
+    spent = MonthlySpend.spent + statement.excluded.spent if accumulate else statement.excluded.spent
+    db.execute(statement.on_conflict_do_update(
+        index_elements=["year", "month"], set_={"spent": spent, "revision": MonthlySpend.revision + 1}
+    ))
+
+
+def add_transactions(db: Session, *where) -> None:
+    """
+    Adds the transactions matching `where` (e.g. `Transaction.id == 5`) to their months,
+    in one INSERT ... SELECT. Not committed; call it in the same transaction as the write.
+    """
+    _upsert(db, _spend_by_period(*where), accumulate=True)
+
+
+def remove_transactions(db: Session, *where) -> None:
+    """
+    Takes the transactions matching `where` out of their months, as they are in the
+    database right now. Call it before changing any of SPEND_FIELDS, then flush the
+    change and call `add_transactions`.
+    """
+    _upsert(db, _spend_by_period(*where, sign=-1), accumulate=True)
+
+
+def recompute_periods(db: Session, *where) -> None:
+    """
+    Recomputes every month that has a transaction matching `where`, e.g. after a
+    subcategory's budget flags or an account's purpose changed. Not committed.
+    """
+    year, month = _period_columns()
+    periods = [tuple(row) for row in db.execute(
+        select(year, month).distinct().where(Transaction.transaction_datetime_from_sms.is_not(None), *where)
+    )]
+    if not periods:
+        return
+    db.execute(
+        update(MonthlySpend)
+        .where(tuple_(MonthlySpend.year, MonthlySpend.month).in_(periods))
+        # Also bumps the months left with no spending, which the upsert does not touch.
+        .values(spent=0.0, revision=MonthlySpend.revision + 1)
+    )
+    _upsert(db, _spend_by_period(tuple_(year, month).in_(periods)), accumulate=False)
+
+
+def rebuild(db: Session) -> int:
+    """Recomputes the whole table from the transactions. Returns the number of months."""
+    # New rows start above every revision a month had before, so nothing cached by an
+    # old revision can be mistaken for current.
+    last_revision = db.scalar(select(func.coalesce(func.max(MonthlySpend.revision), 0)))
+    db.execute(delete(MonthlySpend))
+    _upsert(db, _spend_by_period(), accumulate=False, first_revision=last_revision + 1)
+    db.commit()
+    return db.query(MonthlySpend).count()
+
+
+def get_spent(db: Session, *, year: int, month: int) -> Optional[float]:
+    """Budgeted spending of one month; None if the month has no row yet."""
+    return db.query(MonthlySpend.spent).filter(MonthlySpend.year == year, MonthlySpend.month == month).scalar()
+
+
+def get_revisions(db: Session, periods: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], int]:
+    """The revision of each (year, month) of `periods` that has a row; see MonthlySpend.revision."""
+    periods = list(periods)
+    if not periods:
+        return {}
+    rows = db.execute(
+        select(MonthlySpend.year, MonthlySpend.month, MonthlySpend.revision)
+        .where(tuple_(MonthlySpend.year, MonthlySpend.month).in_(periods))
+    )
+    return {(year, month): revision for year, month, revision in rows}
+
+
+def _bucket(db: Session, period: str):
+    """The start of the day, week (Monday) or month of each transaction, as ISO text."""
+    column = Transaction.transaction_datetime_from_sms
+    if db.get_bind().dialect.name == "sqlite":
+        if period == "day":
+            return func.date(column)
+        if period == "week":
+            return func.date(column, "-6 days", "weekday 1")
+        return func.strftime("%Y-%m", column)
+    return func.to_char(func.date_trunc(period, column), "YYYY-MM" if period == "month" else "YYYY-MM-DD")
+
+
+# What spend_groups can group by, within each period.
+GROUP_KEYS = {
+    "subcategory": Transaction.subcategory_id,
+    "account": Transaction.account_id,
+    "merchant": Transaction.merchant_vpa,
+}
+
+
+def spend_groups(
+    db: Session, *, start: datetime, end: datetime, bucket: Optional[str] = None, key: Optional[str] = None
+) -> List[Tuple[int, int, Optional[str], object, float, int]]:
+    """
+    Budgeted spending (the spending_conditions rules) of the transactions in [start, end),
+    as (year, month, bucket, key, spent, count) rows: one GROUP BY over the transactions,
+    per month and, optionally, per day, week or month `bucket` and per GROUP_KEYS `key`.
+    Unused parts of a row are None.
+    """
+    year, month = _period_columns()
+    bucket_column = _bucket(db, bucket) if bucket else null()
+    key_column = GROUP_KEYS[key] if key else null()
+    groups = [year, month] + [column for column, used in ((bucket_column, bucket), (key_column, key)) if used]
+    rows = db.execute(
+        select(year, month, bucket_column, key_column, func.sum(Transaction.amount), func.count(Transaction.id))
+        .select_from(Transaction)
+        .join(SubCategory, Transaction.subcategory_id == SubCategory.id)
+        .where(
+            Transaction.transaction_datetime_from_sms >= start, Transaction.transaction_datetime_from_sms < end,
+            Transaction.amount.is_not(None), *spending_conditions(),
+        )
+        .group_by(*groups)
+    )
+    return [tuple(row) for row in rows]
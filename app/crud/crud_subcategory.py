@@ -1,7 +1,9 @@
 # app/crud/crud_subcategory.py
 from sqlalchemy.orm import Session, selectinload
 from typing import Optional, List
+from app.crud import crud_spend
 from app.models.subcategory import SubCategory as SubCategoryModel
+from app.models.transaction import Transaction
 from app.schemas.category import SubCategoryCreate, SubCategoryUpdate
 
 def get_subcategory(db: Session, subcategory_id: int) -> Optional[SubCategoryModel]:
@@ -26,6 +28,9 @@ def update_subcategory(
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     db.add(db_obj)
+    if not {"exclude_from_budget", "is_reimbursable"}.isdisjoint(update_data):
+        db.flush()
+        crud_spend.recompute_periods(db, Transaction.subcategory_id == db_obj.id)
     db.commit()
     db.refresh(db_obj)
     return db_obj
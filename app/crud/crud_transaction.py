@@ -1,21 +1,38 @@
-from sqlalchemy.orm import Session, selectinload
-from app.models import Transaction, SubCategory, Category
-from sqlalchemy import and_ 
+from sqlalchemy.orm import Session, aliased, selectinload
+from app.models import Account, Transaction, SubCategory, Category, TRANSACTIONS_FTS
+from sqlalchemy import String, and_, func, literal_column, or_, select, tuple_, type_coerce, union_all
 from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import base64
+import json
+import re
 
-from app.schemas.transaction import TransactionCreate, TransactionUpdate 
+from app.schemas.transaction import TransactionCreate, TransactionFilter, TransactionUpdate 
+from app.crud import crud_outbox, crud_spend
+from app.db.session import dialect_insert
 
 
 DEFAULT_UNCATEGORIZED_SUBCATEGORY_ID = 1000
+HASH_LOOKUP_CHUNK_SIZE = 500
 
+# Columns `insert_transaction_if_new` takes from a TransactionCreate.
+_INSERT_FIELDS = {
+    "unique_hash", "raw_sms_content", "amount", "currency", "merchant_vpa",
+    "transaction_datetime_from_sms", "description", "status", "account_id",
+}
 
-def get_transactions_for_linking(db: Session, *, days: int = 30, limit: int = 50) -> list[Transaction]:
+
+def get_transactions_for_linking(
+    db: Session, *, days: int = 30, limit: int = 50, projected: bool = False
+) -> list:
     """
     Retrieves recent transactions that have not yet been linked.
+    With `projected`, returns rows of _get_transaction_rows_query instead of ORM objects.
     """
     time_filter = datetime.now() - timedelta(days=days)
     
-    query = _get_transaction_query(db, include_relations=True).filter(
+    base_query = _get_transaction_rows_query(db) if projected else _get_transaction_query(db, include_relations=True)
+    query = base_query.filter(
         and_(
             Transaction.linked_transaction_hash.is_(None),
             Transaction.transaction_datetime_from_sms >= time_filter
@@ -51,13 +68,14 @@ def get_default_uncategorized_subcategory_id(db: Session) -> int:
 
 
 
-def create_transaction(db: Session, *, obj_in: TransactionCreate) -> Transaction:
+def create_transaction(db: Session, *, obj_in: TransactionCreate, notify: bool = False) -> Transaction:
     """
     Create a new transaction record in the database.
 
     Args:
         db: The database session.
         obj_in: A Pydantic model containing all necessary data for a new transaction.
+        notify: Also queue a Telegram notification in the same commit (see crud_outbox).
     
     Returns:
         The newly created SQLAlchemy Transaction object.
@@ -86,15 +104,130 @@ def create_transaction(db: Session, *, obj_in: TransactionCreate) -> Transaction
     
     
     db.add(db_obj)
+    db.flush()
+    crud_spend.add_transactions(db, Transaction.id == db_obj.id)
+    if notify:
+        crud_outbox.enqueue_notification(db, transaction=db_obj)
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+def insert_transaction_if_new(
+    db: Session, *, obj_in: TransactionCreate, subcategory_id: int, notify: bool = False
+) -> Optional[Tuple[int, datetime]]:
+    """
+    Insert a transaction unless its unique_hash already exists, in one statement:
+    `INSERT ... ON CONFLICT(unique_hash) DO NOTHING RETURNING id, received_at`.
+
+    Unlike `create_transaction` nothing is validated here: the caller passes an already
+    checked `subcategory_id` (see TAXONOMY), and no row is read back afterwards. The
+    month's spend total (see crud_spend) and, with `notify`, the outbox row are written
+    in the same commit.
+
+    Returns:
+        (id, received_at) of the new row, or None if the hash was already stored.
+    """
+    values = obj_in.dict(include=_INSERT_FIELDS)
+    values["subcategory_id"] = subcategory_id
+    statement = dialect_insert(db)(Transaction).values(**values)\
+        .on_conflict_do_nothing(index_elements=[Transaction.unique_hash])\
+        .returning(Transaction.id, Transaction.received_at)
+    try:
+        row = db.execute(statement).first()
+        if row is None:
+            db.rollback()
+            return None
+        crud_spend.add_transactions(db, Transaction.id == row.id)
+        if notify:
+            crud_outbox.enqueue_notification(db, transaction_id=row.id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return row.id, row.received_at
+
+def get_existing_hashes(db: Session, *, hashes: Iterable[str]) -> set[str]:
+    """
+    Returns the subset of `hashes` that already exist in the transactions table.
+    One `IN` query per chunk; chunks keep us under SQLite's bound-parameter limit.
+    """
+    hashes = list(set(hashes))
+    existing: set[str] = set()
+    for start in range(0, len(hashes), HASH_LOOKUP_CHUNK_SIZE):
+        chunk = hashes[start:start + HASH_LOOKUP_CHUNK_SIZE]
+        rows = db.query(Transaction.unique_hash).filter(Transaction.unique_hash.in_(chunk)).all()
+        existing.update(row[0] for row in rows)
+    return existing
+
+def create_transactions_bulk(
+    db: Session,
+    *,
+    objs_in: List[TransactionCreate],
+    valid_subcategory_ids: Optional[Set[int]] = None,
+    default_subcategory_id: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Insert many transactions in a single database transaction.
+
+    Reference data (the default subcategory and the set of valid subcategory IDs) is
+    looked up once for the whole batch rather than once per row, unless the caller
+    passes it in from the cached taxonomy.
+
+    Returns:
+        A mapping of unique_hash -> new transaction ID.
+    """
+    if not objs_in:
+        return {}
+
+    if valid_subcategory_ids is None:
+        requested_subcategory_ids = {obj.subcategory_id for obj in objs_in if obj.subcategory_id is not None}
+        valid_subcategory_ids = set()
+        if requested_subcategory_ids:
+            valid_subcategory_ids = {
+                row[0] for row in db.query(SubCategory.id).filter(SubCategory.id.in_(requested_subcategory_ids)).all()
+            }
+    if default_subcategory_id is None:
+        default_subcategory_id = get_default_uncategorized_subcategory_id(db)
+
+    db_objs = []
+    for obj_in in objs_in:
+        subcategory_id = obj_in.subcategory_id
+        if subcategory_id not in valid_subcategory_ids:
+            if subcategory_id is not None:
+                print(f"WARNING: Provided subcategory_id {subcategory_id} not found. Defaulting to Uncategorized.")
+            subcategory_id = default_subcategory_id
+
+        db_objs.append(Transaction(
+            unique_hash=obj_in.unique_hash,
+            raw_sms_content=obj_in.raw_sms_content,
+            amount=obj_in.amount,
+            currency=obj_in.currency,
+            merchant_vpa=obj_in.merchant_vpa,
+            transaction_datetime_from_sms=obj_in.transaction_datetime_from_sms,
+            description=obj_in.description,
+            status=obj_in.status,
+            account_id=obj_in.account_id,
+            subcategory_id=subcategory_id,
+        ))
+
+    try:
+        db.add_all(db_objs)
+        db.flush()
+        # Read the IDs before commit expires the instances (which would cost a SELECT each).
+        created = {db_obj.unique_hash: db_obj.id for db_obj in db_objs}
+        crud_spend.add_transactions(db, Transaction.id.in_(created.values()))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return created
+
 def update_transaction(
     db: Session,
     *,
     db_obj: Transaction,  
-    obj_in: TransactionUpdate
+    obj_in: TransactionUpdate,
+    include_relations: bool = True
 ) -> Transaction:
     """
     Update an existing transaction.
@@ -103,20 +236,31 @@ def update_transaction(
         db: The database session.
         db_obj: The current transaction object to be updated.
         obj_in: A Pydantic model containing the fields to update.
+        include_relations: Reload the account and subcategory with it. Callers that
+            map names from the cached taxonomy pass False.
 
     Returns:
         The updated transaction object.
     """
 
     update_data = obj_in.dict(exclude_unset=True)
+    affects_spend = not crud_spend.SPEND_FIELDS.isdisjoint(update_data)
+    if affects_spend:
+        # Take the row out of its month as stored, and add it back once changed.
+        crud_spend.remove_transactions(db, Transaction.id == db_obj.id)
 
     for field, value in update_data.items():
         setattr(db_obj, field, value)
 
     db.add(db_obj) 
+    if affects_spend:
+        db.flush()
+        crud_spend.add_transactions(db, Transaction.id == db_obj.id)
     db.commit() 
     db.refresh(db_obj)
     
+    if not include_relations:
+        return db_obj
     return get_transaction_by_hash(db, hash_str=db_obj.unique_hash, include_relations=True)
 
 def update_transaction_message_id(db: Session, *, transaction_obj: Transaction, message_id: int) -> Transaction:
@@ -137,16 +281,257 @@ def _get_transaction_query(db: Session, include_relations: bool = True):
     return query
 
  
+# Aliased so that filters with their own subquery on these tables (the category filter)
+# are never correlated to the joins below.
+_row_account = aliased(Account)
+_row_subcategory = aliased(SubCategory)
+_row_category = aliased(Category)
+
+
+def _join_references(query):
+    """Left-joins the account, subcategory and parent category of each transaction."""
+    return query\
+        .outerjoin(_row_account, Transaction.account_id == _row_account.id)\
+        .outerjoin(_row_subcategory, Transaction.subcategory_id == _row_subcategory.id)\
+        .outerjoin(_row_category, _row_subcategory.parent_category_id == _row_category.id)
+
+
+def _get_transaction_rows_query(db: Session):
+    """
+    The columns of a transaction response, with its account and subcategory joined in:
+    plain rows for the list endpoints, which serialize them without building ORM objects
+    or schemas. transactions._map_row_to_response unpacks them in this order; extra
+    columns may follow.
+    """
+    return _join_references(db.query(
+        Transaction.id, Transaction.unique_hash, Transaction.telegram_message_id, Transaction.raw_sms_content,
+        Transaction.received_at, Transaction.amount, Transaction.currency, Transaction.merchant_vpa,
+        Transaction.transaction_datetime_from_sms, Transaction.description, Transaction.status,
+        Transaction.account_id, Transaction.subcategory_id, Transaction.linked_transaction_hash,
+        Transaction.override_reimbursable,
+        _row_account.name.label("account_name"), _row_account.account_type, _row_account.account_last4,
+        _row_subcategory.name.label("subcategory_name"), _row_subcategory.icon_name,
+        _row_subcategory.parent_category_id, _row_category.name.label("parent_category_name"),
+    ))
+
+
+# The columns of an export (iter_transactions_for_export), named as in EXPORT_FIELDS.
+_EXPORT_COLUMNS = (
+    Transaction.id, Transaction.received_at, Transaction.transaction_datetime_from_sms, Transaction.amount,
+    Transaction.currency, Transaction.merchant_vpa, Transaction.description, Transaction.status,
+    Transaction.account_id, _row_account.name.label("account"), _row_account.account_last4,
+    Transaction.subcategory_id, _row_category.name.label("category"), _row_subcategory.name.label("subcategory"),
+    Transaction.linked_transaction_hash, Transaction.override_reimbursable, Transaction.unique_hash,
+    Transaction.raw_sms_content,
+)
+EXPORT_FIELDS = tuple(column.key for column in _EXPORT_COLUMNS)
+
+
 def get_transaction(db: Session, id: int, include_relations: bool = True) -> Transaction | None:
     return _get_transaction_query(db, include_relations).filter(Transaction.id == id).first()
 
-def get_transactions(db: Session, skip: int = 0, limit: int = 100, include_relations: bool = True) -> list[Transaction]:
-    return _get_transaction_query(db, include_relations)\
-        .order_by(Transaction.received_at.desc())\
-        .offset(skip)\
+def _received_at_key(db: Session):
+    """
+    received_at as the keyset pagination compares it. SQLite keeps datetimes as text and
+    the server default writes them without microseconds, while SQLAlchemy binds them with;
+    so there the cursor carries the stored text and is compared as text.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return type_coerce(Transaction.received_at, String)
+    return Transaction.received_at
+
+
+def encode_cursor(received_at, transaction_id: int) -> str:
+    if isinstance(received_at, datetime):
+        received_at = received_at.isoformat()
+    payload = json.dumps([received_at, transaction_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(db: Session, cursor: str) -> Tuple[object, int]:
+    """The (received_at, id) of an `encode_cursor` string. Raises ValueError if it is not one."""
+    try:
+        received_at, transaction_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(received_at, str) or not isinstance(transaction_id, int):
+            raise ValueError
+        if db.get_bind().dialect.name != "sqlite":
+            received_at = datetime.fromisoformat(received_at)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    return received_at, transaction_id
+
+
+def _filter_conditions(filters: TransactionFilter) -> list:
+    """
+    The WHERE clauses of `filters`, except category_id (see get_transactions_page). Each
+    one can be answered from an index of Transaction.__table_args__ (checked by
+    benchmarks/bench_list.py --check).
+    """
+    conditions = []
+    if filters.date_from is not None:
+        conditions.append(Transaction.transaction_datetime_from_sms >= filters.date_from)
+    if filters.date_to is not None:
+        conditions.append(Transaction.transaction_datetime_from_sms <= filters.date_to)
+    if filters.account_id is not None:
+        conditions.append(Transaction.account_id == filters.account_id)
+    if filters.subcategory_id is not None:
+        conditions.append(Transaction.subcategory_id == filters.subcategory_id)
+    if filters.status is not None:
+        conditions.append(Transaction.status == filters.status)
+    if filters.amount_min is not None:
+        conditions.append(Transaction.amount >= filters.amount_min)
+    if filters.amount_max is not None:
+        conditions.append(Transaction.amount <= filters.amount_max)
+    if filters.merchant:
+        if filters.merchant.isascii():
+            # A range on lower(merchant_vpa) instead of LIKE: it uses the expression index on
+            # every database, and there is no wildcard to escape. Only for an ASCII prefix,
+            # where str.lower() folds exactly like SQLite's lower() (ASCII letters only) and
+            # bumping the last character gives the next prefix.
+            prefix = filters.merchant.lower()
+            conditions.append(func.lower(Transaction.merchant_vpa) >= prefix)
+            conditions.append(func.lower(Transaction.merchant_vpa) < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        else:
+            # Any other prefix is matched with a (non-indexed) LIKE that lower()s both sides
+            # in the database. On SQLite that ignores case for ASCII letters only, so
+            # "É" does not match "é" there.
+            conditions.append(Transaction.merchant_vpa.istartswith(filters.merchant, autoescape=True))
+    return conditions
+
+
+def _category_condition(category_id: int):
+    return Transaction.subcategory_id.in_(
+        select(SubCategory.id).where(SubCategory.parent_category_id == category_id)
+    )
+
+
+def get_transactions_page(
+    db: Session, *, limit: int = 100, cursor: Optional[str] = None,
+    filters: Optional[TransactionFilter] = None, include_relations: bool = True, projected: bool = False
+) -> Tuple[list, Optional[str]]:
+    """
+    One page of transactions matching `filters`, newest first, and the cursor of the next
+    page (None on the last one). Keyset pagination on (received_at, id): every page is an
+    index range scan of `limit` rows, however deep, and rows arriving in between do not
+    shift the pages a client is walking through. Raises ValueError for a malformed cursor.
+    With `projected`, the page holds rows of _get_transaction_rows_query, not ORM objects.
+    """
+    received_at = _received_at_key(db)
+    order = (received_at.desc(), Transaction.id.desc())
+    conditions = _filter_conditions(filters) if filters is not None else []
+    if cursor:
+        after_received_at, after_id = decode_cursor(db, cursor)
+        conditions.append(tuple_(received_at, Transaction.id) < tuple_(after_received_at, after_id))
+
+    base_query = _get_transaction_rows_query(db) if projected else _get_transaction_query(db, include_relations)
+    query = base_query.add_columns(received_at.label("cursor_received_at"))
+    if filters is not None and filters.category_id is not None:
+        # A category is several subcategories, and no index returns those in page order:
+        # SQLite would either sort all of the category's rows or walk the whole list
+        # filtering (slow for a rare category). Instead take the first rows of each
+        # subcategory in order from its index and keep the newest of those.
+        subcategory_ids = db.scalars(
+            select(SubCategory.id).where(SubCategory.parent_category_id == filters.category_id)
+        ).all()
+        if not subcategory_ids:
+            return [], None
+        first_rows = [
+            select(Transaction.id)
+            .where(Transaction.subcategory_id == subcategory_id, *conditions)
+            .order_by(*order).limit(limit + 1).subquery()
+            for subcategory_id in subcategory_ids
+        ]
+        query = query.filter(Transaction.id.in_(union_all(*(select(rows.c.id) for rows in first_rows))))
+    else:
+        query = query.filter(*conditions)
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.cursor_received_at, last.id if projected else last[0].id)
+    if projected:
+        return rows, next_cursor
+    return [transaction for transaction, _ in rows], next_cursor
+
+# bm25 weights of the FTS columns (merchant_vpa, description, raw_sms_content): a hit on
+# the merchant says more than the same word somewhere in the SMS boilerplate.
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+# bm25 scores this many of the newest matches. Scoring is per matching row, so ranking
+# every match of a common word (tens of thousands) would cost ~100 ms; the newest
+# matches are the ones the search is for anyway.
+SEARCH_CANDIDATES = 1000
+
+
+def search_terms(text: str) -> List[str]:
+    """The words of a search box input, lowercased; punctuation and FTS syntax are dropped."""
+    return re.findall(r"\w+", text.lower())
+
+
+def search_transactions(
+    db: Session, *, text: str, filters: Optional[TransactionFilter] = None,
+    limit: int = 20, include_relations: bool = True, projected: bool = False
+) -> list:
+    """
+    Transactions containing every word of `text` (as a word prefix, so "swig" finds
+    SWIGGY) in merchant_vpa, description or raw_sms_content, best match first, narrowed by
+    `filters`. On SQLite this is an FTS5 query ranking the newest SEARCH_CANDIDATES
+    matches by bm25; elsewhere a LIKE scan, newest first. With `projected`, returns rows
+    of _get_transaction_rows_query instead of ORM objects.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+    conditions = _filter_conditions(filters) if filters is not None else []
+    if filters is not None and filters.category_id is not None:
+        conditions.append(_category_condition(filters.category_id))
+    query = _get_transaction_rows_query(db) if projected else _get_transaction_query(db, include_relations)
+
+    if db.get_bind().dialect.name == "sqlite":
+        fts_query = " ".join(f'"{term}"*' for term in terms)
+        # FTS5 walks its matches newest (highest rowid) first, so the LIMIT stops it early.
+        candidates = select(
+            TRANSACTIONS_FTS.c.rowid.label("id"),
+            func.bm25(literal_column("transactions_fts"), *SEARCH_WEIGHTS).label("score"),
+        )\
+            .join(Transaction, Transaction.id == TRANSACTIONS_FTS.c.rowid)\
+            .where(TRANSACTIONS_FTS.c.transactions_fts.match(fts_query), *conditions)\
+            .order_by(TRANSACTIONS_FTS.c.rowid.desc())\
+            .limit(SEARCH_CANDIDATES)\
+            .subquery()
+        return query\
+            .join(candidates, candidates.c.id == Transaction.id)\
+            .order_by(candidates.c.score, Transaction.id.desc())\
+            .limit(limit)\
+            .all()
+
+    searched = (Transaction.merchant_vpa, Transaction.description, Transaction.raw_sms_content)
+    return query\
+        .filter(*(or_(*(column.ilike(f"%{term}%") for column in searched)) for term in terms), *conditions)\
+        .order_by(Transaction.received_at.desc(), Transaction.id.desc())\
         .limit(limit)\
         .all()
 
+
+def iter_transactions_for_export(
+    db: Session, *, filters: Optional[TransactionFilter] = None, batch_size: int = 1000
+) -> Iterator[tuple]:
+    """
+    Every transaction matching `filters`, newest first, as rows of EXPORT_FIELDS. Rows are
+    fetched `batch_size` at a time from a server-side cursor, so memory stays flat however
+    many there are; the session is busy until the iterator is exhausted or closed.
+    """
+    conditions = _filter_conditions(filters) if filters is not None else []
+    if filters is not None and filters.category_id is not None:
+        conditions.append(_category_condition(filters.category_id))
+    query = _join_references(db.query(*_EXPORT_COLUMNS))\
+        .filter(*conditions)\
+        .order_by(Transaction.received_at.desc(), Transaction.id.desc())\
+        .yield_per(batch_size)
+    yield from query
+
+
 def get_transaction_by_hash(db: Session, *, hash_str: str, include_relations: bool = True) -> Transaction | None:
     return _get_transaction_query(db, include_relations).filter(Transaction.unique_hash == hash_str).first()
 
@@ -1,17 +1,88 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+import asyncio
+import functools
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.db.sqlite_profile import apply_sqlite_profile
 
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URL,
     # connect_args required for SQLite to support multi-threading (FastAPI uses threads)
     connect_args={"check_same_thread": False}
 )
+apply_sqlite_profile(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def create_read_only_engine(url: "str | URL") -> Engine:
+    """
+    An engine that can only read. A SQLite file is opened with mode=ro and query_only, so
+    in WAL mode its connections read in parallel with the writer and never take its lock;
+    any other URL (a replica) is used as is.
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url, pool_pre_ping=True)
+    database = url.database if url.database.startswith("file:") else f"file:{url.database}"
+    read_engine = create_engine(
+        url.set(database=database, query={**url.query, "mode": "ro", "uri": "true"}),
+        connect_args={"check_same_thread": False}
+    )
+    apply_sqlite_profile(read_engine, read_only=True)
+    return read_engine
+
+
+def _read_engine() -> Engine:
+    url = make_url(settings.SQLALCHEMY_READ_DATABASE_URL or settings.SQLALCHEMY_DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        # An in-memory database exists only inside the main engine's connections.
+        if url.database in (None, "", ":memory:"):
+            return engine
+        return create_read_only_engine(url)
+    return create_read_only_engine(url) if settings.SQLALCHEMY_READ_DATABASE_URL else engine
+
+
+read_engine = _read_engine()
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Runs the blocking database work of async code, see run_in_db_thread.
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=settings.DB_THREAD_POOL_SIZE, thread_name_prefix="db")
+
+T = TypeVar("T")
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db():
+    """Like get_db, for endpoints that only read; see SQLALCHEMY_READ_DATABASE_URL."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def dialect_insert(db: Session):
+    """The INSERT construct with ON CONFLICT support for the session's database."""
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+
+async def run_in_db_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Calls `func(*args, **kwargs)` on DB_EXECUTOR and waits for it without blocking the
+    event loop. Async endpoints pass their whole database step (queries, commit) as one
+    function; a session must only be used by one thread at a time, so never run two
+    calls with the same session concurrently.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(DB_EXECUTOR, functools.partial(func, *args, **kwargs))
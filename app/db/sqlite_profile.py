@@ -0,0 +1,58 @@
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORE = {"DEFAULT", "FILE", "MEMORY"}
+
+
+def _choice(name: str, value: str, allowed: set) -> str:
+    value = value.upper()
+    if value not in allowed:
+        raise ValueError(f"{name} must be one of {', '.join(sorted(allowed))}, got {value!r}")
+    return value
+
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """
+    The PRAGMA statements run on every new SQLite connection, from Settings. A read-only
+    connection leaves the journal mode to the writers and refuses any write.
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA temp_store={_choice('SQLITE_TEMP_STORE', settings.SQLITE_TEMP_STORE, _TEMP_STORE)}",
+    ]
+    if read_only:
+        return pragmas + ["PRAGMA query_only=ON"]
+    return [
+        # WAL lets readers and the single writer run at the same time, and with
+        # synchronous=NORMAL a commit no longer waits for an fsync (durability of the last
+        # transactions is traded only on power loss, never on an app crash).
+        f"PRAGMA journal_mode={_choice('SQLITE_JOURNAL_MODE', settings.SQLITE_JOURNAL_MODE, _JOURNAL_MODES)}",
+        f"PRAGMA synchronous={_choice('SQLITE_SYNCHRONOUS', settings.SQLITE_SYNCHRONOUS, _SYNCHRONOUS)}",
+    ] + pragmas
+
+
+def apply_sqlite_profile(engine: Engine, read_only: bool = False) -> None:
+    """
+    Runs `sqlite_pragmas()` on every connection `engine` opens. Does nothing for other
+    databases. Call it once per engine, right after creating it.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
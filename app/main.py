@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -13,12 +15,32 @@ from app.api.v1.endpoints import (
     categories as categories_v1,
     accounts as accounts_v1,
     telegram_webhook as telegram_webhook_v1,
-    budget as budget_v1_router
+    budget as budget_v1_router,
+    analytics as analytics_v1,
+    admin as admin_v1
 )
+from app.services.db_maintenance import DB_MAINTENANCE
+from app.services.notification_outbox import OUTBOX_WORKER
+from app.services.parser_engine import get_parser_stats
+from app.services.telegram_sender import TELEGRAM_SENDER
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await DB_MAINTENANCE.start()
+    await TELEGRAM_SENDER.start()
+    await OUTBOX_WORKER.start()
+    yield
+    await OUTBOX_WORKER.stop()
+    await TELEGRAM_SENDER.stop()
+    await DB_MAINTENANCE.stop()
+    get_parser_stats().flush()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    version=settings.VERSION
+    version=settings.VERSION,
+    lifespan=lifespan,
 )
 
 app.include_router(
@@ -46,6 +68,18 @@ app.include_router(
 )
 
 
+app.include_router(
+    analytics_v1.router,
+    prefix=f"{settings.API_V1_STR}/analytics",
+    tags=["Analytics"]
+)
+
+app.include_router(
+    admin_v1.router,
+    prefix=f"{settings.API_V1_STR}/admin",
+    tags=["Admin"],
+)
+
 app.include_router(
     telegram_webhook_v1.router,
     prefix=f"{settings.API_V1_STR}/telegram",
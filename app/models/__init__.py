@@ -3,6 +3,9 @@ from .category import Category
 from .subcategory import SubCategory
 from .account import Account, AccountType, AccountPurpose 
 from .monthly_budget import MonthlyBudget
+from .monthly_spend import MonthlySpend
+from .notification_outbox import NotificationOutbox, OutboxStatus
+from .transaction_search import TRANSACTIONS_FTS
 
 __all__ = [
     "Transaction",
@@ -13,4 +16,8 @@ __all__ = [
     "AccountType",
     "AccountPurpose", 
     "MonthlyBudget", 
+    "MonthlySpend",
+    "NotificationOutbox",
+    "OutboxStatus",
+    "TRANSACTIONS_FTS",
 ]
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Float, UniqueConstraint
+from app.db.base_class import Base
+
+class MonthlySpend(Base):
+    """
+    Budgeted spending per calendar month, kept up to date by the transaction, account and
+    subcategory writes (see crud_spend). Rebuild it with `python -m scripts.rebuild_monthly_spend`.
+    """
+    __tablename__ = "monthly_spend"
+
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    spent = Column(Float, nullable=False, default=0.0)
+    # Bumped by every write to the row, so readers can tell that the month's spending
+    # changed: the analytics cache keeps a closed month for as long as this is unchanged.
+    revision = Column(Integer, nullable=False, default=1, server_default='1')
+
+    __table_args__ = (UniqueConstraint('year', 'month', name='uq_year_month_spend'),)
+
+    def __repr__(self):
+        return f"<MonthlySpend(year={self.year}, month={self.month}, spent={self.spent})>"
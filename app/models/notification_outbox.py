@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum as SQLAlchemyEnum, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from enum import Enum
+
+from app.db.base_class import Base
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class NotificationOutbox(Base):
+    """A Telegram notification waiting to be sent, written in the same commit as its transaction."""
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    transaction_id = Column(Integer, ForeignKey("transactions.id", ondelete="CASCADE"), nullable=False)
+    transaction = relationship("Transaction")
+
+    kind = Column(String(32), nullable=False, default="new_transaction")
+    status = Column(SQLAlchemyEnum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.now)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('ix_notification_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f"<NotificationOutbox(id={self.id}, transaction_id={self.transaction_id}, status='{self.status}', attempts={self.attempts})>"
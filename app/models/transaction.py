@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, Text, Enum as SQLAlchemyEnum, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, Text, Enum as SQLAlchemyEnum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum
@@ -41,8 +41,22 @@ class Transaction(Base):
     subcategory_id = Column(Integer, ForeignKey("subcategories.id"), nullable=False)
     subcategory = relationship("SubCategory", back_populates="transactions")
 
-    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
     account = relationship("Account", back_populates="transactions")
-    
+
+    __table_args__ = (
+        # Newest-first listing with keyset pagination (crud_transaction.get_transactions_page).
+        Index('ix_transactions_received_at_id', 'received_at', 'id'),
+        # Its filters: equality filters walk their rows already in page order, ranges and
+        # the merchant prefix narrow the rows down before the sort.
+        Index('ix_transactions_account_received_at', 'account_id', 'received_at', 'id'),
+        Index('ix_transactions_subcategory_received_at', 'subcategory_id', 'received_at', 'id'),
+        Index('ix_transactions_subcategory_datetime_from_sms', 'subcategory_id', 'transaction_datetime_from_sms'),
+        Index('ix_transactions_status_received_at', 'status', 'received_at', 'id'),
+        Index('ix_transactions_datetime_from_sms', 'transaction_datetime_from_sms'),
+        Index('ix_transactions_amount', 'amount'),
+        Index('ix_transactions_merchant_vpa_lower', func.lower(merchant_vpa)),
+    )
+
     def __repr__(self):
         return f"<Transaction(id={self.id}, amount={self.amount}, subcategory_id={self.subcategory_id}, account_id={self.account_id})>"
\ No newline at end of file
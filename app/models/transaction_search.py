@@ -0,0 +1,52 @@
+from sqlalchemy import Integer, column, event, table
+
+from .transaction import Transaction
+
+# Full-text index over the searchable text of every transaction (SQLite FTS5). It is an
+# external-content table: it stores only the index and reads the text from `transactions`,
+# kept in sync by the triggers below. Not an ORM model; query it through TRANSACTIONS_FTS.
+FTS_TABLE = "transactions_fts"
+FTS_COLUMNS = ("merchant_vpa", "description", "raw_sms_content")
+
+TRANSACTIONS_FTS = table(FTS_TABLE, column("rowid", Integer), column(FTS_TABLE))
+
+_columns = ", ".join(FTS_COLUMNS)
+_new_values = ", ".join(f"new.{name}" for name in FTS_COLUMNS)
+_old_values = ", ".join(f"old.{name}" for name in FTS_COLUMNS)
+
+# Also in the add_transactions_fts migration, which must not change when this does.
+CREATE_STATEMENTS = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_columns}, content='transactions', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); END",
+    # Only when the indexed text changes, not on every status or category update.
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+]
+DROP_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _create_search_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        for statement in CREATE_STATEMENTS:
+            connection.exec_driver_sql(statement)
+
+
+def _drop_search_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        for statement in DROP_STATEMENTS:
+            connection.exec_driver_sql(statement)
+
+
+# So that Base.metadata.create_all (scripts, benchmarks) builds the same schema as Alembic.
+event.listen(Transaction.__table__, "after_create", _create_search_index)
+event.listen(Transaction.__table__, "before_drop", _drop_search_index)
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class ParserStatsEntry(BaseModel):
+    bank_name: str
+    hits: int
+    misses: int
+    hit_rate: float
+    avg_latency_us: float
+    rank: Optional[int] = None
+
+
+class ParserStatsResponse(BaseModel):
+    order: List[str] = []
+    reordered_at: Optional[str] = None
+    attempts_since_reorder: int = 0
+    parsers: List[ParserStatsEntry] = []
+
+
+class TelegramSenderMetrics(BaseModel):
+    queue_depth: int
+    pending_edits: int
+    paused_for_seconds: float
+    worker_running: bool
+    sent: int
+    failed: int
+    retried: int
+    rate_limited: int
+    coalesced: int
@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from datetime import date
+from enum import Enum
+from typing import List, Optional
+
+
+class SpendDimension(str, Enum):
+    CATEGORY = "category"
+    SUBCATEGORY = "subcategory"
+    ACCOUNT = "account"
+    MERCHANT = "merchant"
+
+
+class SpendPeriod(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class SpendGroup(BaseModel):
+    """
+    Budgeted spending of one group. `period` is the day, the Monday of the week or the
+    month ("2025-03") when grouping by period; `id` and `name` identify the category,
+    subcategory or account (a merchant has only a name).
+    """
+    period: Optional[str] = None
+    id: Optional[int] = None
+    name: Optional[str] = None
+    spent: float
+    count: int
+
+
+class SpendAnalytics(BaseModel):
+    """Spending between two dates (inclusive), with the budget rules; groups by period, then spent."""
+    date_from: date
+    date_to: date
+    group_by: Optional[SpendDimension] = None
+    period: Optional[SpendPeriod] = None
+    total: float
+    groups: List[SpendGroup]
+    # Months read from the cache and months computed by this request.
+    cached_months: int
+    computed_months: int
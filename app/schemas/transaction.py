@@ -1,6 +1,7 @@
 from pydantic import BaseModel,Field
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Optional, List
 from app.models.transaction import TransactionStatus
 
 class SMSRecieved(BaseModel):
@@ -82,4 +83,57 @@ class TransactionInDB(TransactionBase):
     subcategory: Optional[SubCategoryForTransaction] = None
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class TransactionFilter(BaseModel):
+    """
+    Server-side filters of /transactions/list, all optional and combined with AND.
+    Date and amount bounds are inclusive; `merchant` matches the start of merchant_vpa,
+    ignoring case.
+    """
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    account_id: Optional[int] = None
+    subcategory_id: Optional[int] = None
+    category_id: Optional[int] = None
+    status: Optional[TransactionStatus] = None
+    amount_min: Optional[float] = None
+    amount_max: Optional[float] = None
+    merchant: Optional[str] = Field(None, min_length=1, max_length=255)
+
+class TransactionPage(BaseModel):
+    """A page of /transactions/list; pass `next_cursor` back as `cursor` for the next one."""
+    items: List[TransactionInDB]
+    next_cursor: Optional[str] = None
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+class SMSBulkReceived(BaseModel):
+    """A batch of raw SMS texts, e.g. a historical backfill from a newly onboarded phone."""
+    sms_contents: List[str] = Field(..., min_length=1, max_length=10000)
+
+
+class BulkIngestStatus(str, Enum):
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    IGNORED = "ignored"
+    ERROR = "error"
+
+
+class BulkIngestItemResult(BaseModel):
+    """Outcome for one SMS of a bulk ingest, `index` is its position in the request."""
+    index: int
+    status: BulkIngestStatus
+    unique_hash: Optional[str] = None
+    transaction_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkIngestResponse(BaseModel):
+    created: int = 0
+    duplicates: int = 0
+    ignored: int = 0
+    errors: int = 0
+    results: List[BulkIngestItemResult] = []
@@ -0,0 +1,79 @@
+from typing import Any, Dict, Iterable, List, Optional
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.crud import crud_account
+from app.models.account import AccountType
+from app.schemas.account import AccountCreate
+from app.services.taxonomy import TAXONOMY, AccountKey, TaxonomyCache
+
+# Serialises placeholder creation within the process; the unique constraint on
+# (bank_name, account_last4) covers other processes.
+_CREATE_LOCK = threading.Lock()
+
+
+class AccountResolver:
+    """
+    Finds or creates the account a parsed SMS belongs to.
+
+    This is the only part of the SMS pipeline that touches the database, so it is bound
+    to one session and created per request, while the ParserEngine itself is shared.
+    Known accounts are looked up in the process-wide TAXONOMY snapshot.
+    """
+
+    def __init__(self, db_session: Session, cache: TaxonomyCache = TAXONOMY):
+        self.db: Session = db_session
+        self.cache = cache
+
+    def resolve(self, parsed_data: Dict[str, Any]) -> Optional[int]:
+        """
+        Takes parsed data and finds or creates an account, returning the account_id.
+        Returns None if the account is ambiguous (e.g., last4 is None).
+        """
+        return self.resolve_many([parsed_data])[0]
+
+    def resolve_many(self, parsed_items: Iterable[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        `resolve` for a whole batch: one cache lookup per item and one placeholder
+        creation per new account, however often it appears in the batch.
+        """
+        ids = self.cache.current(self.db).account_ids
+        created: Dict[AccountKey, int] = {}
+        account_ids: List[Optional[int]] = []
+        for parsed_data in parsed_items:
+            bank_name = parsed_data.get("bank_name")
+            account_last4 = parsed_data.get("account_last4")
+
+            if not account_last4:
+                print(f"DEBUG: Ambiguous account for {bank_name}. Requires user selection.")
+                account_ids.append(None)
+                continue
+
+            key = (bank_name, account_last4)
+            account_id = ids.get(key) or created.get(key)
+            if account_id is None:
+                account_id = created[key] = self._create_placeholder(bank_name, account_last4)
+            account_ids.append(account_id)
+        return account_ids
+
+    def _create_placeholder(self, bank_name: str, account_last4: str) -> int:
+        key = (bank_name, account_last4)
+        with _CREATE_LOCK:
+            # Another request may have created it while we waited for the lock.
+            if (account_id := self.cache.current(self.db).account_ids.get(key)) is not None:
+                return account_id
+
+            print(f"DEBUG: No existing account found for {bank_name} ending in {account_last4}. Creating placeholder.")
+            account_in = AccountCreate(
+                name=f"New Account - {bank_name} {account_last4}",
+                account_type=AccountType.UNKNOWN,
+                bank_name=bank_name,
+                account_last4=account_last4
+            )
+            account, created = crud_account.get_or_create_account(self.db, obj_in=account_in)
+            if created:
+                print(f"DEBUG: Created placeholder account: ID {account.id} ({account.name})")
+                # TODO Code to trigger a notification to the user here in the future  Telegram Bot/UI
+            self.cache.invalidate()
+            return account.id
@@ -1,8 +1,6 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
 from datetime import datetime, timedelta
-from app.models import Transaction, SubCategory, Account, AccountPurpose
-from app.crud import crud_budget
+from app.crud import crud_budget, crud_spend
 
 def get_current_budget_period() -> tuple[datetime, datetime]:
     """
@@ -19,36 +17,13 @@ def get_current_budget_period() -> tuple[datetime, datetime]:
 
 def get_current_month_spending(db: Session) -> float:
     """
-    Calculates total spending for the current budget period, respecting all the new rules.
+    Total spending for the current budget period, respecting all the budget rules
+    (see crud_spend.spending_conditions). Read from the monthly_spend aggregate, which
+    every transaction, account and subcategory write keeps current, so this is a single
+    primary-key lookup instead of a SUM over the transactions.
     """
-    start_date, end_date = get_current_budget_period()
-
-    # Conditions for a transaction to be INCLUDED in spending:
-    # 1. override_reimbursable is explicitly False OR
-    # 2. override_reimbursable is None AND subcategory.is_reimbursable is False
-    # This is equivalent to: NOT ( (override_reimbursable is True) OR (override_reimbursable is None AND subcategory.is_reimbursable is True) )
-
-    condition_is_spending = or_(
-        Transaction.override_reimbursable.is_(False),
-        and_(
-            Transaction.override_reimbursable.is_(None),
-            SubCategory.is_reimbursable.is_(False)
-        )
-    )
-
-    total_spent = db.query(func.sum(Transaction.amount)).join(
-        Transaction.subcategory
-    ).join(
-        Transaction.account  
-    ).filter(
-        Transaction.transaction_datetime_from_sms.between(start_date, end_date),
-        Account.purpose == AccountPurpose.PERSONAL,                     
-        SubCategory.exclude_from_budget.is_(False), 
-        Transaction.linked_transaction_hash.is_(None),    
-        condition_is_spending                    
-    ).scalar()
-
-    return total_spent or 0.0
+    today = datetime.now()
+    return crud_spend.get_spent(db, year=today.year, month=today.month) or 0.0
 
 def get_remaining_spend_power(db: Session) -> dict | None:
     """
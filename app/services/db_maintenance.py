@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.session import engine as default_engine, run_in_db_thread
+
+
+class DatabaseMaintenance:
+    """
+    Periodic SQLite upkeep while the app runs:
+
+      - `PRAGMA optimize`: refreshes the planner statistics of tables whose indexes were
+        used enough to matter since the last run (cheap, SQLite decides what to analyze)
+      - `ANALYZE`: full statistics, for the large shifts optimize skips
+      - `PRAGMA wal_checkpoint(PASSIVE)`: copies the WAL back into the database without
+        waiting on readers, so the WAL file does not keep growing between quiet moments
+
+    Each task has its own interval in Settings (0 disables it). The statements run on the
+    DB thread pool. Does nothing when the database is not SQLite.
+    """
+
+    def __init__(self, engine: Engine = default_engine, tick: float = 30.0):
+        self.engine = engine
+        self.tick = tick
+        self.last_run: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _schedule(self) -> List[Tuple[str, float]]:
+        return [
+            ("PRAGMA optimize", settings.SQLITE_OPTIMIZE_INTERVAL_SECONDS),
+            ("ANALYZE", settings.SQLITE_ANALYZE_INTERVAL_SECONDS),
+            ("PRAGMA wal_checkpoint(PASSIVE)", settings.SQLITE_CHECKPOINT_INTERVAL_SECONDS),
+        ]
+
+    async def start(self) -> None:
+        if self.engine.dialect.name != "sqlite":
+            return
+        # Analyzes the tables that have never been analyzed, as SQLite recommends for
+        # long-lived applications at startup; later runs only look at what changed.
+        await self.run("PRAGMA optimize=0x10002")
+        now = time.monotonic()
+        for statement, _ in self._schedule():
+            self.last_run.setdefault(statement, now)
+        self._task = asyncio.create_task(self._run())
+        print("INFO: SQLite maintenance started.")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _execute(self, statement: str):
+        with self.engine.connect() as connection:
+            cursor = connection.exec_driver_sql(statement)
+            # ANALYZE returns no rows; fetching from it raises.
+            result = cursor.fetchall() if cursor.returns_rows else None
+            connection.commit()
+        return result
+
+    async def run(self, statement: str) -> None:
+        """
+        Runs one maintenance statement now. Failures are logged, never raised, and count as
+        a run: a failing statement is tried again after its interval, not on every tick.
+        """
+        started = time.perf_counter()
+        try:
+            result = await run_in_db_thread(self._execute, statement)
+        except Exception as e:
+            print(f"ERROR: SQLite maintenance '{statement}' failed: {e}")
+            return
+        finally:
+            self.last_run[statement] = time.monotonic()
+        print(f"DEBUG: SQLite maintenance '{statement}' took {(time.perf_counter() - started) * 1000:.0f} ms"
+              + (f" -> {result[0]}" if result else ""))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            now = time.monotonic()
+            for statement, interval in self._schedule():
+                if interval > 0 and now - self.last_run.get(statement, now) >= interval:
+                    await self.run(statement)
+
+
+DB_MAINTENANCE = DatabaseMaintenance()
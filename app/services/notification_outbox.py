@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+import asyncio
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_outbox
+from app.db.session import SessionLocal, run_in_db_thread
+from app.models.notification_outbox import NotificationOutbox
+from app.services import telegram_notifier
+from app.services.telegram_sender import TELEGRAM_SENDER
+
+# (outbox row id, end of its lease, message text, inline keyboard)
+PreparedMessage = Tuple[int, datetime, str, Optional[dict]]
+
+# Added to the longest a Telegram call can take when the lease is derived from it: time
+# queued behind other calls and pauses for a 429.
+LEASE_MARGIN = timedelta(seconds=60)
+
+
+class OutboxWorker:
+    """
+    Sends the Telegram notifications queued in the notification outbox.
+
+    `receive_sms` only commits the transaction together with its outbox row and calls
+    `wake()`; this worker then formats the message, sends it and stores the returned
+    message id on the transaction. Failed sends are retried with exponential backoff up
+    to `max_attempts` times. Rows are claimed in batches with a lease, so several worker
+    processes can share one database. The lease of each row is renewed right before it is
+    sent and covers the longest a single send can take (`TELEGRAM_SENDER.max_call_seconds()`
+    plus LEASE_MARGIN by default), so a slow send never lets another process claim the
+    rest of the batch. A row whose lease ran out and was claimed elsewhere is skipped. A
+    notification may be sent twice if a process dies between sending and recording it,
+    never zero times.
+
+    Database work runs on the DB thread pool so the event loop only ever waits on Telegram.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        poll_interval: float = 5.0,
+        batch_size: int = 20,
+        max_attempts: int = 8,
+        lease: Optional[timedelta] = None,
+        max_backoff: timedelta = timedelta(hours=1),
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease = lease if lease is not None else timedelta(seconds=TELEGRAM_SENDER.max_call_seconds()) + LEASE_MARGIN
+        self.max_backoff = max_backoff
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        if not telegram_notifier.is_configured():
+            print("WARN: Telegram credentials not set. Notification outbox worker not started.")
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print("INFO: Notification outbox worker started.")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        """Asks the worker to look at the outbox now instead of at its next poll. Thread-safe."""
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def drain(self) -> int:
+        """Sends everything that is due. Returns the number of notifications sent."""
+        sent = 0
+        while (prepared := await run_in_db_thread(self._claim_and_prepare)):
+            for outbox_id, leased_until, text, keyboard in prepared:
+                if not await run_in_db_thread(self._renew_lease, outbox_id, leased_until):
+                    print(f"WARN: Outbox notification {outbox_id} was claimed by another worker after its lease ran out, skipping.")
+                    continue
+                message_id = await telegram_notifier.send_message(text=text, reply_markup=keyboard)
+                await run_in_db_thread(self._record, outbox_id, message_id)
+                sent += bool(message_id)
+            if len(prepared) < self.batch_size:
+                break
+        return sent
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.drain()
+            except Exception as e:
+                print(f"ERROR: Notification outbox drain failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _claim_and_prepare(self) -> List[PreparedMessage]:
+        db = self.session_factory()
+        try:
+            prepared = []
+            for row in crud_outbox.claim_due(db, limit=self.batch_size, lease=self.lease):
+                try:
+                    text, keyboard = telegram_notifier.build_new_transaction_message(row.transaction, db)
+                except Exception as e:
+                    crud_outbox.mark_failed(db, db_obj=row, error=f"Could not format message: {e}", retry_at=self._retry_at(row))
+                    continue
+                prepared.append((row.id, row.next_attempt_at, text, keyboard))
+            return prepared
+        finally:
+            db.close()
+
+    def _renew_lease(self, outbox_id: int, leased_until: datetime) -> bool:
+        db = self.session_factory()
+        try:
+            return crud_outbox.renew_lease(db, outbox_id=outbox_id, leased_until=leased_until, lease=self.lease) is not None
+        finally:
+            db.close()
+
+    def _record(self, outbox_id: int, message_id: Optional[int]) -> None:
+        db = self.session_factory()
+        try:
+            row = db.get(NotificationOutbox, outbox_id)
+            if row is None:
+                return
+            if message_id:
+                crud_outbox.mark_sent(db, db_obj=row, message_id=message_id)
+                print(f"DEBUG: Sent outbox notification {outbox_id} as Telegram message {message_id}.")
+            else:
+                retry_at = self._retry_at(row)
+                crud_outbox.mark_failed(db, db_obj=row, error="Telegram did not accept the message.", retry_at=retry_at)
+                print(f"WARN: Outbox notification {outbox_id} failed (attempt {row.attempts}), "
+                      f"{'retrying at ' + retry_at.isoformat(timespec='seconds') if retry_at else 'giving up'}.")
+        finally:
+            db.close()
+
+    def _retry_at(self, row: NotificationOutbox) -> Optional[datetime]:
+        if row.attempts >= self.max_attempts:
+            return None
+        backoff = min(timedelta(seconds=5 * 2 ** (row.attempts - 1)), self.max_backoff)
+        return datetime.now() + backoff
+
+
+OUTBOX_WORKER = OutboxWorker(
+    poll_interval=settings.OUTBOX_POLL_SECONDS,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+)
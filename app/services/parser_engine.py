@@ -1,129 +1,110 @@
+from pathlib import Path
+import threading
+import time
 from typing import Dict, Optional, Any, List
 
-from sqlalchemy.orm import Session
-
-from app.crud import crud_account
-from app.schemas.account import AccountCreate
-from app.models.account import AccountType
-
 from .parsers.base_parser import BaseParser
-from .parsers.hdfc_parser import HDFCParser
-from .parsers.federal_parser import FederalBankParser
-from .parsers.amex_parser import AmexParser
-from .parsers.sbi_parser import SBIParser
-from .parsers.icici_parser import ICICIBankParser
-from .parsers.idfc_parser import IDFCFirstBankParser
-from .parsers.onecard_parser import OneCardParser
-from .parsers.axis_parser  import AXISParser
+from .parsers.dispatcher import ParserDispatcher
+from .parsers.classifier import SMSClassifier, SMSClassification
+from .parsers.registry import BUNDLED_SPEC_DIR, ParserRegistry
+from .parsers.stats import ParserStats
 
 from app.core.hashing import generate_transaction_hash
 from app.core.config import settings
+from .account_resolver import AccountResolver
 from .unparsed_sms_logger import UnparsedSMSLogger
-import re
+
+# Parsers are compiled from the spec files once per process; the registry swaps in a
+# freshly compiled snapshot when the files change.
+_REGISTRY = ParserRegistry(
+    Path(settings.PARSER_SPEC_DIR) if settings.PARSER_SPEC_DIR else BUNDLED_SPEC_DIR,
+    credit_keywords=["credited to", "credited to your a/c", "credited to acct", "received", "deposited"],
+    debit_keywords=["debited", "spent", "sent from"],
+    reload_interval=settings.PARSER_SPEC_RELOAD_SECONDS,
+)
+_STATS = ParserStats(
+    Path(settings.PARSER_STATS_PATH) if settings.PARSER_STATS_PATH else None,
+    reorder_every=settings.PARSER_REORDER_EVERY,
+    save_every=settings.PARSER_STATS_SAVE_SECONDS,
+)
+
+
+_ENGINE: Optional["ParserEngine"] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_parser_stats() -> ParserStats:
+    """The process-wide parser counters, as recorded by every ParserEngine."""
+    return _STATS
+
+
+def get_parser_engine() -> "ParserEngine":
+    """The process-wide ParserEngine, built on first use and shared by every request."""
+    global _ENGINE
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            if _ENGINE is None:
+                _ENGINE = ParserEngine()
+    return _ENGINE
+
 
 class ParserEngine:
-    def __init__(self, db_session: Session):
+    def __init__(self, registry: ParserRegistry = _REGISTRY, stats: ParserStats = _STATS):
         """
-        The engine is initialized with a database session to be able to resolve accounts.
+        The engine holds no per-request state, so one instance (see `get_parser_engine`)
+        is shared across threads and requests. Everything that needs the database is
+        done by the AccountResolver passed to `run`.
         """
-        self.db: Session = db_session
-        
-        self.parsers: List[BaseParser] = [
-            HDFCParser(),
-            FederalBankParser(),
-            AmexParser(),
-            SBIParser(),
-            ICICIBankParser(),
-            IDFCFirstBankParser(),
-            OneCardParser(),
-            AXISParser()
-        ]
-        self._credit_keywords = ["credited to", "credited to your a/c", "credited to acct", "received", "deposited"]
-        self._debit_keywords = ["debited", "spent", "sent from", "debited"]
+        self.registry: ParserRegistry = registry
+        self.stats: ParserStats = stats
         
         if settings.LOG_UNPARSED_FINANCE_SMS:
             self.unparsed_logger = UnparsedSMSLogger()
         else:
             self.unparsed_logger = None
         
-    def _get_flow_type(self, sms_text: str) -> Optional[str]:
-        """Determines if the SMS is a credit, debit, or unknown transaction."""
-        sms_lower = sms_text.lower()
-        if any(keyword in sms_lower for keyword in self._credit_keywords):
-            return "CREDIT"
-        if any(keyword in sms_lower for keyword in self._debit_keywords):
-            return "DEBIT"
-        return None
-
-    def _resolve_account_id(self, parsed_data: Dict[str, Any]) -> Optional[int]:
-        """
-        Takes parsed data and finds or creates an account, returning the account_id.
-        Returns None if the account is ambiguous (e.g., last4 is None).
-        """
-        bank_name = parsed_data.get("bank_name")
-        account_last4 = parsed_data.get("account_last4")
-        
-        if not account_last4:
-            print(f"DEBUG: Ambiguous account for {bank_name}. Requires user selection.")
-            return None
+    @property
+    def parsers(self) -> List[BaseParser]:
+        return self.registry.current().parsers
 
-        account = crud_account.get_account_by_identifier(
-            self.db, bank_name=bank_name, account_last4=account_last4
-        )
+    @property
+    def dispatcher(self) -> ParserDispatcher:
+        return self.registry.current().dispatcher
 
-        if account:
-            print(f"DEBUG: Found existing account: ID {account.id} ({account.name})")
-            return account.id
-
-        print(f"DEBUG: No existing account found for {bank_name} ending in {account_last4}. Creating placeholder.")
-        placeholder_name = f"New Account - {bank_name} {account_last4}"
-        
-        account_in = AccountCreate(
-            name=placeholder_name,
-            account_type=AccountType.UNKNOWN,
-            bank_name=bank_name,
-            account_last4=account_last4
-        )
-        new_account = crud_account.create_account(self.db, obj_in=account_in)
-        print(f"DEBUG: Created placeholder account: ID {new_account.id} ({new_account.name})")
-        # TODO Code to trigger a notification to the user here in the future  Telegram Bot/UI
-        
-        return new_account.id
-    
-    def _extract_sender_info(self, sms_text: str) -> Optional[str]:
-        """
-        Extract sender information from SMS text if available.
-        This is a simple implementation - could be enhanced based on SMS format.
-        """
-        
-        sender_patterns = [
-            r'^([A-Z]{2,6}[-]?[A-Z]{0,6}):',
-            r'From[:\s]+([A-Z]{2,10})',      
-            r'^([A-Z]{2,6})\s',
-        ]
-        
-        for pattern in sender_patterns:
-            match = re.search(pattern, sms_text, re.IGNORECASE)
-            if match:
-                return match.group(1)
-                
-        return None
+    @property
+    def classifier(self) -> SMSClassifier:
+        return self.registry.current().classifier
 
+    def _get_flow_type(self, sms_text: str) -> Optional[str]:
+        """Determines if the SMS is a credit, debit, or unknown transaction."""
+        return self.classifier.classify(sms_text).flow_type
 
-    def run(self, sms_text: str) -> Optional[Dict[str, Any]]:
+    def run(self, sms_text: str, accounts: AccountResolver) -> Optional[Dict[str, Any]]:
         """
         The main public method to run the full parsing and account resolution pipeline.
+        `accounts` is bound to the caller's database session.
         
         Returns a dictionary ready for transaction creation, or None if the SMS should be ignored.
         The dictionary will include 'account_id' if an account could be resolved.
         """
-        flow_type = self._get_flow_type(sms_text)
+        parsed_data = self.parse(sms_text)
+        if not parsed_data:
+            return None
+        return self.complete(parsed_data, accounts.resolve(parsed_data))
+
+    def parse(self, sms_text: str) -> Optional[Dict[str, Any]]:
+        """
+        The database-free half of `run`: classify the SMS and extract its fields.
+        Returns the parser's dict plus 'flow_type', or None if the SMS should be ignored.
+        """
+        classification: SMSClassification = self.classifier.classify(sms_text)
+        flow_type = classification.flow_type
         
         if not flow_type:
             print(f"DEBUG: Could not determine flow type (credit/debit). Ignoring SMS: {sms_text[:70]}...")
             
             if self.unparsed_logger:
-                sender_info = self._extract_sender_info(sms_text)
+                sender_info = self.classifier.sender_hint(sms_text)
                 self.unparsed_logger.log_unparsed_sms(
                     sms_text, 
                     source_info=f"No flow type detected{' | Sender: ' + sender_info if sender_info else ''}"
@@ -134,7 +115,7 @@ class ParserEngine:
         if flow_type == "CREDIT":
             print(f"DEBUG: Ignoring credit transaction for now: {sms_text[:70]}...")
             if self.unparsed_logger:
-                sender_info = self._extract_sender_info(sms_text)
+                sender_info = self.classifier.sender_hint(sms_text)
                 self.unparsed_logger.log_unparsed_sms(
                     sms_text, 
                     source_info=f"No flow type detected{' | Sender: ' + sender_info if sender_info else ''}"
@@ -142,8 +123,11 @@ class ParserEngine:
             return None
 
         parsed_data: Optional[Dict[str, Any]] = None
-        for parser in self.parsers:
-            if (result := parser.parse(sms_text)):
+        for parser in self.stats.order(classification.candidates):
+            start = time.perf_counter_ns()
+            result = parser.parse(sms_text)
+            self.stats.record(parser.bank_name, bool(result), time.perf_counter_ns() - start)
+            if result:
                 parsed_data = result
                 print(f"DEBUG: SMS structure parsed by {parser.__class__.__name__}")
                 break
@@ -152,9 +136,16 @@ class ParserEngine:
             print(f"DEBUG: No parser matched for spend SMS: {sms_text[:70]}...")
             return None
         
+        parsed_data["flow_type"] = flow_type
+        return parsed_data
+
+    def complete(self, parsed_data: Dict[str, Any], account_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """
+        The second half of `run`, for a dict from `parse` and its resolved account:
+        hashes the transaction and shapes the dict for transaction creation.
+        """
         original_bank_name = parsed_data.get("bank_name")
 
-        account_id = self._resolve_account_id(parsed_data)
         parsed_data["account_id"] = account_id
         
         if not account_id:
@@ -169,7 +160,6 @@ class ParserEngine:
         parsed_data.setdefault("currency", "INR")
         
         parsed_data["account_id"] = account_id
-        parsed_data["flow_type"] = flow_type
         
         parsed_data.pop("bank_name", None)
         parsed_data.pop("account_last4", None)
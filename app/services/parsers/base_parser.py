@@ -1,12 +1,24 @@
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
 from datetime import datetime
 from abc import ABC, abstractmethod
 
+from .date_parser import DATE_PARSER
+
 class BaseParser(ABC):
     """
     Abstract Base Class for all bank/service parsers.
     Each subclass is responsible for parsing SMS messages from a specific source.
+    Bank parsers are SpecParser instances compiled from `specs/*.json`.
+
+    Subclasses compile their regexes once, up front, and declare
+    `prefilter_patterns`: cheap regex fragments (matched case-insensitively) of which
+    at least one must appear in any SMS the parser can handle. The ParserDispatcher
+    uses them to skip parsers that cannot possibly match. A parser that declares no
+    fragments is always tried.
     """
+    bank_name: str = ""
+    prefilter_patterns: Tuple[str, ...] = ()
+
     @abstractmethod
     def parse(self, sms_text: str) -> Optional[Dict[str, Any]]:
         """
@@ -20,17 +32,6 @@ class BaseParser(ABC):
         """
         A reusable helper method to parse date strings.
         It's placed in the BaseParser so all subclasses can use it.
+        Returns None if no format matches.
         """
-        for fmt in formats:
-            try:
-                dt_obj = datetime.strptime(date_str, fmt)
-                if '%y' in fmt and dt_obj.year < 2000:
-                    dt_obj = dt_obj.replace(year=dt_obj.year + 2000)
-                if any(f in fmt for f in ["%d-%m", "%d/%m"]) and dt_obj.year == 1900:
-                    dt_obj = dt_obj.replace(year=datetime.now().year)
-                return dt_obj
-            except ValueError as e:
-                print(e)
-                continue
-            
-        return None
+        return DATE_PARSER.parse(date_str, formats)
@@ -0,0 +1,123 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import re
+
+from .base_parser import BaseParser
+from .dispatcher import ParserDispatcher
+
+
+class SMSClassification(NamedTuple):
+    flow_type: Optional[str]
+    keyword_position: Optional[int]
+    candidates: List[BaseParser]
+
+
+def _lower_literals(fragment: str) -> str:
+    """Lower-cases a regex fragment without touching escapes such as `\\S` or `\\D`."""
+    out = []
+    chars = iter(fragment)
+    for char in chars:
+        if char == "\\":
+            out.append(char)
+            out.append(next(chars, ""))
+        else:
+            out.append(char.lower())
+    return "".join(out)
+
+
+def _keyword_alternative(keyword: str, group_name: str) -> str:
+    """Consumes only the first character, so a marker starting inside the keyword is still found."""
+    keyword = keyword.lower()
+    return f"{re.escape(keyword[0])}(?={re.escape(keyword[1:])})(?P<{group_name}>)"
+
+
+class SMSClassifier:
+    """
+    Answers every routing question about an SMS in a single scan of its text.
+
+    Credit/debit keywords and the dispatcher's bank markers are folded into one
+    alternation that runs over the lower-cased text. One `finditer` pass yields the flow
+    type (any credit keyword wins over a debit one), where the deciding keyword starts
+    and the candidate parsers.
+
+    Every alternative is a literal first and an empty marker group last, so `re` can skip
+    ahead with a first-character set instead of trying each alternative at every position,
+    and `match.lastgroup` names the alternative that matched. Keywords consume a single
+    character, bank markers their whole text. When several alternatives start at the same
+    position only the first listed is reported: keywords, then bank markers.
+
+    Only debit SMS, the ones the engine parses, need the scan. The others are answered
+    with substring checks and no candidates.
+
+    The sender hint is only needed for the unparsed-SMS log, so it is looked up on demand
+    by `sender_hint` rather than in the scan, where a bank marker such as "from your A/c"
+    would consume the "from" the sender pattern needs.
+    """
+
+    # `^ABC:` and `^ABC ` only ever match at the start, so they are checked with `match`
+    # there. Group 1 is preferred over a "From" hit, which is preferred over group 2, as
+    # in the original three `re.search` calls.
+    _LEADING_SENDER = re.compile(r"([a-z]{2,6}-?[a-z]{0,6}):|([a-z]{2,6})\s", re.IGNORECASE)
+    _FROM_SENDER = re.compile(r"from[:\s]+([a-z]{2,10})", re.IGNORECASE)
+
+    def __init__(self, dispatcher: ParserDispatcher, credit_keywords: Sequence[str], debit_keywords: Sequence[str]):
+        self.dispatcher: ParserDispatcher = dispatcher
+        self._credit_keywords = tuple(keyword.lower() for keyword in credit_keywords)
+        self._keywords = self._credit_keywords + tuple(keyword.lower() for keyword in debit_keywords)
+
+        alternatives = [_keyword_alternative(keyword, f"c{index}") for index, keyword in enumerate(credit_keywords)]
+        alternatives += [_keyword_alternative(keyword, f"d{index}") for index, keyword in enumerate(debit_keywords)]
+        alternatives += [f"(?:{_lower_literals(fragment)})(?P<{group_name}>)" for group_name, fragment in dispatcher.fragments]
+        combined = "|".join(alternatives)
+
+        self._pattern = re.compile(combined)
+        # str.lower() can change the length of non-ASCII text, which would shift every
+        # reported position; such messages are scanned case-insensitively instead.
+        self._fallback_pattern = re.compile(combined, re.IGNORECASE)
+
+    def classify(self, sms_text: str) -> SMSClassification:
+        text = sms_text.lower()
+        # SMS without a flow keyword (OTPs, offers, balances) and credits, which the engine
+        # ignores, are settled by substring checks, ~4x cheaper than the scan.
+        if not any(keyword in text for keyword in self._keywords):
+            return SMSClassification(flow_type=None, keyword_position=None, candidates=[])
+
+        pattern = self._pattern
+        if len(text) != len(sms_text):
+            text, pattern = sms_text, self._fallback_pattern
+        else:
+            credit_positions = [position for keyword in self._credit_keywords if (position := text.find(keyword)) >= 0]
+            if credit_positions:
+                return SMSClassification(flow_type="CREDIT", keyword_position=min(credit_positions), candidates=[])
+
+        first_seen: Dict[str, int] = {}
+        marker_groups: List[str] = []
+
+        for match in pattern.finditer(text):
+            group_name = match.lastgroup
+            kind = group_name[0]
+            if kind == "c" or kind == "d":
+                first_seen.setdefault(kind, match.start())
+            else:
+                marker_groups.append(group_name)
+
+        if "c" in first_seen:
+            flow_type, keyword_position = "CREDIT", first_seen["c"]
+        elif "d" in first_seen:
+            flow_type, keyword_position = "DEBIT", first_seen["d"]
+        else:
+            flow_type, keyword_position = None, None
+
+        return SMSClassification(
+            flow_type=flow_type,
+            keyword_position=keyword_position,
+            candidates=self.dispatcher.parsers_for_groups(marker_groups),
+        )
+
+    def sender_hint(self, sms_text: str) -> Optional[str]:
+        """A sender name for the unparsed-SMS log: "ABC-XYZ:" at the start, "From: XYZ", or "ABC " at the start."""
+        leading = self._LEADING_SENDER.match(sms_text, 0, 14)
+        if leading is not None and leading.group(1) is not None:
+            return leading.group(1)
+        if (from_sender := self._FROM_SENDER.search(sms_text)) is not None:
+            return from_sender.group(1)
+        return leading.group(2) if leading is not None else None
@@ -0,0 +1,191 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+import re
+import threading
+
+_MONTHS = ["january", "february", "march", "april", "may", "june", "july",
+           "august", "september", "october", "november", "december"]
+_MONTH_NUMBERS: Dict[str, int] = {}
+for _number, _name in enumerate(_MONTHS, start=1):
+    _MONTH_NUMBERS[_name] = _number
+    _MONTH_NUMBERS[_name[:3]] = _number
+
+# Same sub-patterns `time.strptime` uses for these directives (C locale).
+_DIRECTIVES: Dict[str, str] = {
+    "d": r"(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "y": r"(?P<y>\d\d)",
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "H": r"(?P<H>2[0-3]|[01]\d|\d)",
+    "I": r"(?P<I>1[0-2]|0[1-9]|[1-9])",
+    "M": r"(?P<M>[0-5]\d|\d)",
+    "S": r"(?P<S>6[01]|[0-5]\d|\d)",
+    "p": r"(?P<p>am|pm)",
+    "b": f"(?P<b>{'|'.join(name[:3] for name in _MONTHS)})",
+    "B": f"(?P<B>{'|'.join(sorted(_MONTHS, key=len, reverse=True))})",
+}
+
+
+class CompiledDateFormat:
+    """
+    One strptime format turned into a single anchored regex plus integer conversions.
+    The conversion is generated once per format with each field's group position
+    inlined, so a parse is one `fullmatch`, one `groups()` and a few `int()` calls.
+
+    Formats using a directive outside `_DIRECTIVES` fall back to `datetime.strptime`.
+    `%y` always lands in 2000-2099 and a format without a year takes the current one.
+    The old `_parse_date` turned `%y` 69-99 (strptime's 1969-1999) into 3969-3999.
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.has_year = "%y" in fmt or "%Y" in fmt
+        self._pattern: Optional["re.Pattern[str]"] = None
+        # Position of each directive's group in `match.groups()`, e.g. {"d": 0, "m": 1}.
+        self._positions: Dict[str, int] = {}
+
+        parts = []
+        seen = set()
+        index = 0
+        while index < len(fmt):
+            char = fmt[index]
+            if char == "%" and index + 1 < len(fmt):
+                directive = fmt[index + 1]
+                index += 2
+                if directive == "%":
+                    parts.append("%")
+                elif directive in _DIRECTIVES and directive not in seen:
+                    seen.add(directive)
+                    self._positions[directive] = len(self._positions)
+                    parts.append(_DIRECTIVES[directive])
+                else:
+                    return
+            elif char.isspace():
+                parts.append(r"\s+")
+                index += 1
+            else:
+                parts.append(re.escape(char))
+                index += 1
+        self._pattern = re.compile("".join(parts), re.IGNORECASE)
+        self._compile_converter()
+
+    def parse(self, date_str: str) -> Optional[datetime]:
+        if self._pattern is None:
+            return self._parse_with_strptime(date_str)
+
+        match = self._pattern.fullmatch(date_str)
+        if match is None:
+            return None
+        try:
+            return self._convert(match.groups())
+        except ValueError:
+            return None
+
+    def _compile_converter(self) -> None:
+        """
+        Generates `self._convert(groups) -> datetime` for this format, with the group
+        positions inlined, as SpecParser does for its field converters.
+        """
+        positions = self._positions
+
+        def group(directive: str) -> str:
+            return f"g[{positions[directive]}]"
+
+        if "Y" in positions:
+            year = f"int({group('Y')})"
+        elif "y" in positions:
+            year = f"2000 + int({group('y')})"
+        else:
+            year = "_datetime.now().year"
+        if "m" in positions:
+            month = f"int({group('m')})"
+        elif "b" in positions or "B" in positions:
+            month = f"_MONTH_NUMBERS[{group('b' if 'b' in positions else 'B')}.lower()]"
+        else:
+            month = "1"
+        if "H" in positions:
+            hour = f"int({group('H')})"
+        elif "I" in positions:
+            hour = f"int({group('I')}) % 12"
+            if "p" in positions:
+                hour += f" + (12 if {group('p')}.lower() == 'pm' else 0)"
+        else:
+            hour = "0"
+        day, minute, second = (f"int({group(d)})" if d in positions else default for d, default in
+                               (("d", "1"), ("M", "0"), ("S", "0")))
+
+        source = f"def convert(g):\n    return _datetime({year}, {month}, {day}, {hour}, {minute}, {second})\n"
+        namespace = {"_datetime": datetime, "_MONTH_NUMBERS": _MONTH_NUMBERS}
+        exec(compile(source, f"<date format {self.fmt!r}>", "exec"), namespace)
+        self._convert = namespace["convert"]
+
+    def _parse_with_strptime(self, date_str: str) -> Optional[datetime]:
+        try:
+            dt_obj = datetime.strptime(date_str, self.fmt)
+        except ValueError:
+            return None
+        if "%y" in self.fmt:
+            # strptime puts 69-99 in the 1900s.
+            dt_obj = dt_obj.replace(year=2000 + dt_obj.year % 100)
+        if not self.has_year and dt_obj.year == 1900:
+            dt_obj = dt_obj.replace(year=datetime.now().year)
+        return dt_obj
+
+
+class DateParser:
+    """
+    Parses SMS date strings against a list of formats without raising or printing.
+
+    Formats are compiled once and shared. The results for recently seen
+    (date string, formats) pairs are kept in a bounded LRU; formats without a year are
+    never cached, since their result depends on the current year. Misses are counted in
+    `misses` instead of being reported on stdout. Safe to share between threads.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self.cache_size = cache_size
+        self._formats: Dict[str, CompiledDateFormat] = {}
+        self._cache: "OrderedDict[Tuple[str, Tuple[str, ...]], datetime]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compiled(self, fmt: str) -> CompiledDateFormat:
+        if (compiled := self._formats.get(fmt)) is None:
+            compiled = self._formats[fmt] = CompiledDateFormat(fmt)
+        return compiled
+
+    def parse(self, date_str: str, formats: Sequence[str]) -> Optional[datetime]:
+        if self.cache_size <= 0:
+            return self._parse_uncached(date_str, formats)[0]
+        key = (date_str, tuple(formats))
+        with self._lock:
+            if (cached := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        dt_obj, has_year = self._parse_uncached(date_str, formats)
+        if has_year:
+            self._remember(key, dt_obj)
+        return dt_obj
+
+    def _parse_uncached(self, date_str: str, formats: Sequence[str]) -> Tuple[Optional[datetime], bool]:
+        """The date, and whether the format that matched has a year (so it can be cached)."""
+        for fmt in formats:
+            compiled = self.compiled(fmt)
+            if (dt_obj := compiled.parse(date_str)) is not None:
+                return dt_obj, compiled.has_year
+        self.misses += 1
+        return None, False
+
+    def _remember(self, key: Tuple[str, Tuple[str, ...]], dt_obj: datetime) -> None:
+        with self._lock:
+            self._cache[key] = dt_obj
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+# Shared by every parser instance; see BaseParser._parse_date.
+DATE_PARSER = DateParser()
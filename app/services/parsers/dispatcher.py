@@ -0,0 +1,53 @@
+from typing import Dict, List, Tuple
+import re
+
+from .base_parser import BaseParser
+
+
+class ParserDispatcher:
+    """
+    Routes an SMS straight to the parsers that could possibly handle it.
+
+    The `prefilter_patterns` of every parser are folded into a single, case-insensitive
+    alternation that is compiled once. Finding the candidate parsers for a message is
+    therefore one scan over the text, and an SMS that no bank recognises never reaches
+    a parser regex at all.
+    """
+
+    def __init__(self, parsers: List[BaseParser]):
+        self.parsers: List[BaseParser] = parsers
+        self._group_to_parser: Dict[str, int] = {}
+        self._always_tried: List[int] = []
+
+        # (group name, fragment) pairs, also folded into SMSClassifier's combined regex.
+        self.fragments: List[Tuple[str, str]] = []
+        alternatives = []
+        for index, parser in enumerate(parsers):
+            if not parser.prefilter_patterns:
+                self._always_tried.append(index)
+                continue
+            for fragment_index, fragment in enumerate(parser.prefilter_patterns):
+                group_name = f"p{index}_{fragment_index}"
+                self._group_to_parser[group_name] = index
+                self.fragments.append((group_name, fragment))
+                alternatives.append(f"(?P<{group_name}>{fragment})")
+
+        # The alternation sits inside a lookahead so matches never consume text:
+        # overlapping markers of different parsers are all reported.
+        self._prefilter = (
+            re.compile(f"(?=(?:{'|'.join(alternatives)}))", re.IGNORECASE) if alternatives else None
+        )
+
+    def parsers_for_groups(self, group_names: List[str]) -> List[BaseParser]:
+        """Maps matched prefilter group names back to parsers, keeping the configured order."""
+        hits = set(self._always_tried)
+        for group_name in group_names:
+            if (index := self._group_to_parser.get(group_name)) is not None:
+                hits.add(index)
+        return [self.parsers[index] for index in sorted(hits)]
+
+    def candidates(self, sms_text: str) -> List[BaseParser]:
+        """Returns the parsers worth trying for this SMS, in their configured order."""
+        if self._prefilter is None:
+            return list(self.parsers)
+        return self.parsers_for_groups([match.lastgroup for match in self._prefilter.finditer(sms_text)])
@@ -0,0 +1,133 @@
+from pathlib import Path
+from typing import List, NamedTuple, Sequence, Tuple
+import hashlib
+import json
+import re
+import threading
+import time
+
+from .base_parser import BaseParser
+from .classifier import SMSClassifier
+from .dispatcher import ParserDispatcher
+from .spec_parser import ParserSpecError, SpecParser
+
+BUNDLED_SPEC_DIR = Path(__file__).with_name("specs")
+
+
+class EngineSnapshot(NamedTuple):
+    """Everything compiled from one version of the spec files. Never mutated once built."""
+    digest: str
+    parsers: List[BaseParser]
+    dispatcher: ParserDispatcher
+    classifier: SMSClassifier
+
+
+class ParserRegistry:
+    """
+    Compiles the parser specs in `spec_dir` into an EngineSnapshot and keeps it current.
+
+    `current()` is called on every SMS, so it only looks at the spec files (one `stat`
+    each) once every `reload_interval` seconds. When they changed, the new set is compiled
+    off to the side and swapped in with a single assignment: callers see either the old
+    snapshot or the new one, never a mix. A spec that fails to compile leaves the old
+    snapshot in place. A `reload_interval` of 0 disables reloading.
+    """
+
+    def __init__(
+        self,
+        spec_dir: Path,
+        credit_keywords: Sequence[str],
+        debit_keywords: Sequence[str],
+        reload_interval: float = 1.0,
+    ):
+        self.spec_dir = Path(spec_dir)
+        self.reload_interval = reload_interval
+        self._credit_keywords = list(credit_keywords)
+        self._debit_keywords = list(debit_keywords)
+        self._reload_lock = threading.Lock()
+
+        self._fingerprint = self._stat_fingerprint()
+        self._snapshot: EngineSnapshot = self._compile(self._read_specs())
+        self._next_check = time.monotonic() + reload_interval
+
+    def current(self) -> EngineSnapshot:
+        if self.reload_interval and time.monotonic() >= self._next_check:
+            self._maybe_reload()
+        return self._snapshot
+
+    def reload(self) -> bool:
+        """Recompiles unconditionally. Returns False (and keeps the old snapshot) on a bad spec."""
+        with self._reload_lock:
+            return self._reload(self._stat_fingerprint())
+
+    def _maybe_reload(self) -> None:
+        # Only one thread checks; the others keep using the current snapshot meanwhile.
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.reload_interval
+            fingerprint = self._stat_fingerprint()
+            if fingerprint != self._fingerprint:
+                self._reload(fingerprint)
+        finally:
+            self._reload_lock.release()
+
+    def _reload(self, fingerprint: Tuple) -> bool:
+        # Remember the fingerprint even on failure, so a broken spec is reported once and
+        # retried only after it is edited again.
+        self._fingerprint = fingerprint
+        try:
+            specs = self._read_specs()
+            if self._digest(specs) == self._snapshot.digest:
+                return True
+            snapshot = self._compile(specs)
+        except (OSError, ValueError, re.error) as e:
+            print(f"ERROR: Parser specs in {self.spec_dir} not reloaded, keeping the current ones: {e}")
+            return False
+        self._snapshot = snapshot
+        print(f"INFO: Reloaded {len(snapshot.parsers)} parser specs from {self.spec_dir} ({snapshot.digest[:12]})")
+        return True
+
+    def _spec_paths(self) -> List[Path]:
+        return sorted(self.spec_dir.glob("*.json"))
+
+    def _stat_fingerprint(self) -> Tuple:
+        fingerprint = []
+        for path in self._spec_paths():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            fingerprint.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    def _read_specs(self) -> List[Tuple[str, bytes]]:
+        specs = [(path.name, path.read_bytes()) for path in self._spec_paths()]
+        if not specs:
+            raise ParserSpecError(f"no *.json parser specs found in {self.spec_dir}")
+        return specs
+
+    @staticmethod
+    def _digest(specs: List[Tuple[str, bytes]]) -> str:
+        hasher = hashlib.sha256()
+        for name, content in specs:
+            hasher.update(name.encode("utf-8"))
+            hasher.update(b"\0")
+            hasher.update(content)
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    def _compile(self, specs: List[Tuple[str, bytes]]) -> EngineSnapshot:
+        parsers = []
+        for name, content in specs:
+            try:
+                spec = json.loads(content)
+            except ValueError as e:
+                raise ParserSpecError(f"{name}: invalid JSON: {e}") from e
+            parsers.append(SpecParser(spec, source=name))
+
+        # Stable: specs with equal priority keep file-name order.
+        parsers.sort(key=lambda parser: parser.priority)
+        dispatcher = ParserDispatcher(parsers)
+        classifier = SMSClassifier(dispatcher, self._credit_keywords, self._debit_keywords)
+        return EngineSnapshot(self._digest(specs), parsers, dispatcher, classifier)
@@ -0,0 +1,121 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+import re
+
+from .base_parser import BaseParser
+
+# "{group}" or "{group|filter}" inside a field template
+_PLACEHOLDER = re.compile(r"\{(?P<group>\w+)(?:\|(?P<filter>\w+))?\}")
+
+# Filters as Python expressions around the group value `{}`.
+_FILTERS: Dict[str, str] = {
+    "strip": "{}.strip()",
+    "amount": "float({}.replace(',', ''))",
+    "last4": "{}[-4:]",
+}
+
+Converter = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class ParserSpecError(ValueError):
+    """A parser spec is malformed; raised while compiling, never while parsing."""
+
+
+class SpecParser(BaseParser):
+    """
+    A parser described as data, see `app/services/parsers/specs/`.
+
+    Each rule is compiled once into its regex and a generated converter function that
+    builds the whole result dict in one expression, so parsing a match costs the same as
+    the hand-written parsers did. Spec values only ever reach the generated code as bound
+    names, and group names are checked against the pattern.
+    """
+
+    def __init__(self, spec: Dict[str, Any], source: str = "<spec>"):
+        self.source = source
+        try:
+            self.bank_name = spec["bank_name"]
+            self.priority: int = int(spec.get("priority", 100))
+            self.prefilter_patterns = tuple(spec.get("prefilter_patterns", ()))
+            for fragment in self.prefilter_patterns:
+                re.compile(fragment)
+            self.description: str = spec.get("description", "")
+            self._rules = [self._compile_rule(rule) for rule in spec["rules"]]
+        except ParserSpecError:
+            raise
+        except (KeyError, TypeError, ValueError, re.error) as e:
+            raise ParserSpecError(f"{source}: {e!r}") from e
+
+    def __repr__(self) -> str:
+        return f"<SpecParser {self.bank_name!r} from {self.source}>"
+
+    def parse(self, sms_text: str) -> Optional[Dict[str, Any]]:
+        for requires, pattern, convert in self._rules:
+            if requires is not None and requires not in sms_text:
+                continue
+            if (match := pattern.search(sms_text)):
+                return convert(match.groupdict())
+        return None
+
+    def _compile_rule(self, rule: Dict[str, Any]) -> Tuple[Optional[str], "re.Pattern[str]", Converter]:
+        name = rule.get("name", "?")
+        pattern = re.compile(rule["pattern"], re.IGNORECASE if rule.get("ignore_case") else 0)
+        if "account_last4" not in rule["fields"]:
+            raise ParserSpecError(f"{self.source}: rule '{name}' does not set 'account_last4'")
+
+        namespace: Dict[str, Any] = {"_parse_date": self._parse_date}
+        items = [f"{self._bind(namespace, 'bank_name')}: {self._bind(namespace, self.bank_name)}"]
+        for field, value in rule["fields"].items():
+            try:
+                items.append(f"{self._bind(namespace, field)}: {self._field_expression(value, pattern, namespace)}")
+            except ParserSpecError as e:
+                raise ParserSpecError(f"{self.source}: rule '{name}', field '{field}': {e}") from None
+
+        source = f"def convert(data):\n    return {{{', '.join(items)}}}\n"
+        exec(compile(source, f"<{self.source}:{name}>", "exec"), namespace)
+        return rule.get("requires"), pattern, namespace["convert"]
+
+    def _field_expression(self, value: Any, pattern: "re.Pattern[str]", namespace: Dict[str, Any]) -> str:
+        if value is None or isinstance(value, (int, float, bool)):
+            return self._bind(namespace, value)
+        if isinstance(value, str):
+            return self._template_expression(value, pattern, namespace)
+        if isinstance(value, dict) and "date" in value:
+            formats = self._bind(namespace, list(value["formats"]))
+            return f"_parse_date({self._template_expression(value['date'], pattern, namespace)}, {formats})"
+        if isinstance(value, dict) and "map" in value:
+            group = self._group(value["group"], pattern, namespace)
+            mapping, default = self._bind(namespace, dict(value["map"])), self._bind(namespace, value.get("default"))
+            return f"{mapping}.get(data[{group}], {default})"
+        raise ParserSpecError(f"unsupported field value {value!r}")
+
+    def _template_expression(self, template: str, pattern: "re.Pattern[str]", namespace: Dict[str, Any]) -> str:
+        parts = []
+        position = 0
+        for placeholder in _PLACEHOLDER.finditer(template):
+            if placeholder.start() > position:
+                parts.append(self._bind(namespace, template[position:placeholder.start()]))
+            expression = f"data[{self._group(placeholder.group('group'), pattern, namespace)}]"
+            if (filter_name := placeholder.group("filter")) is not None:
+                if filter_name not in _FILTERS:
+                    raise ParserSpecError(f"unknown filter '{filter_name}' (known: {', '.join(_FILTERS)})")
+                expression = _FILTERS[filter_name].format(expression)
+            parts.append(expression)
+            position = placeholder.end()
+        if position < len(template) or not parts:
+            parts.append(self._bind(namespace, template[position:]))
+
+        # A lone placeholder keeps its converted type (e.g. the float from `|amount`).
+        if len(parts) == 1:
+            return parts[0]
+        return f"''.join(({', '.join(f'str({part})' for part in parts)}))"
+
+    @staticmethod
+    def _bind(namespace: Dict[str, Any], value: Any) -> str:
+        name = f"_v{len(namespace)}"
+        namespace[name] = value
+        return name
+
+    def _group(self, group: str, pattern: "re.Pattern[str]", namespace: Dict[str, Any]) -> str:
+        if group not in pattern.groupindex:
+            raise ParserSpecError(f"pattern has no group named '{group}'")
+        return self._bind(namespace, group)
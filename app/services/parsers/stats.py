@@ -0,0 +1,135 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import os
+import threading
+import time
+
+from .base_parser import BaseParser
+
+
+class ParserStats:
+    """
+    Per-parser hit/miss/latency counters and the candidate order derived from them.
+
+    Every `reorder_every` recorded attempts the parsers are re-ranked by hit count, so the
+    banks that actually send most of the SMS are tried first when the dispatcher returns
+    more than one candidate. Counters and ranking are written to `path` at the same time,
+    at most `save_every` seconds after an attempt was recorded, and by `flush()` at
+    shutdown; they are loaded again on start-up. Parsers are keyed by `bank_name`, which
+    survives spec reloads.
+    """
+
+    def __init__(self, path: Optional[Path] = None, reorder_every: int = 500, save_every: float = 60.0):
+        self.path = path
+        self.reorder_every = reorder_every
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._rank: Dict[str, int] = {}
+        self._since_reorder = 0
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self.reordered_at: Optional[str] = None
+        self._load()
+
+    def record(self, bank_name: str, hit: bool, elapsed_ns: int) -> None:
+        with self._lock:
+            counters = self._counters.get(bank_name)
+            if counters is None:
+                counters = self._counters[bank_name] = {"hits": 0, "misses": 0, "total_ns": 0}
+            counters["hits" if hit else "misses"] += 1
+            counters["total_ns"] += elapsed_ns
+            self._since_reorder += 1
+            self._dirty = True
+            if self._since_reorder >= self.reorder_every:
+                self._reorder()
+            elif self.save_every <= 0 or time.monotonic() - self._saved_at < self.save_every:
+                return
+            payload = self._take_payload()
+        self._save(payload)
+
+    def order(self, candidates: List[BaseParser]) -> List[BaseParser]:
+        """Returns the candidates busiest-first; parsers not ranked yet follow in dispatcher order."""
+        if len(candidates) < 2 or not self._rank:
+            return candidates
+        rank, last = self._rank, len(self._rank)
+        return sorted(candidates, key=lambda parser: rank.get(parser.bank_name, last))
+
+    def reorder(self) -> None:
+        with self._lock:
+            self._reorder()
+            payload = self._take_payload()
+        self._save(payload)
+
+    def flush(self) -> None:
+        """Writes the counters recorded since the last save, if any; called at shutdown."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = self._take_payload()
+        self._save(payload)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            parsers = []
+            for bank_name, counters in self._counters.items():
+                attempts = counters["hits"] + counters["misses"]
+                parsers.append({
+                    "bank_name": bank_name,
+                    "hits": counters["hits"],
+                    "misses": counters["misses"],
+                    "hit_rate": counters["hits"] / attempts if attempts else 0.0,
+                    "avg_latency_us": counters["total_ns"] / attempts / 1000 if attempts else 0.0,
+                    "rank": self._rank.get(bank_name),
+                })
+            return {
+                "order": sorted(self._rank, key=self._rank.get),
+                "reordered_at": self.reordered_at,
+                "attempts_since_reorder": self._since_reorder,
+                "parsers": sorted(parsers, key=lambda entry: -entry["hits"]),
+            }
+
+    def _reorder(self) -> None:
+        ranked = sorted(self._counters, key=lambda bank_name: -self._counters[bank_name]["hits"])
+        self._rank = {bank_name: index for index, bank_name in enumerate(ranked)}
+        self._since_reorder = 0
+        self.reordered_at = datetime.now().isoformat(timespec="seconds")
+
+    def _take_payload(self) -> Dict[str, Any]:
+        """The state to save, marked as saved; call with the lock held."""
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        return {
+            "counters": {bank_name: dict(counters) for bank_name, counters in self._counters.items()},
+            "order": sorted(self._rank, key=self._rank.get),
+            "reordered_at": self.reordered_at,
+        }
+
+    def _save(self, payload: Dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        with self._save_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(self.path.name + ".tmp")
+                tmp_path.write_text(json.dumps(payload, indent=2))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"ERROR: Could not save parser stats to {self.path}: {e}")
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text())
+            self._counters = {
+                bank_name: {key: int(counters.get(key, 0)) for key in ("hits", "misses", "total_ns")}
+                for bank_name, counters in payload.get("counters", {}).items()
+            }
+            self._rank = {bank_name: index for index, bank_name in enumerate(payload.get("order", []))}
+            self.reordered_at = payload.get("reordered_at")
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"ERROR: Ignoring unreadable parser stats in {self.path}: {e}")
@@ -0,0 +1,130 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.crud import crud_transaction
+from app.schemas.transaction import TransactionCreate, BulkIngestItemResult, BulkIngestStatus, BulkIngestResponse
+from app.services.account_resolver import AccountResolver
+from app.services.parser_engine import get_parser_engine
+from app.services.rule_engine import RuleEngine
+from app.services.taxonomy import TAXONOMY
+from app.services.transaction_status_manager import TransactionStatusManager
+
+
+class BatchIngestor:
+    """
+    Parses and stores SMS in batches without any per-message commits or notifications.
+
+    Used by the bulk endpoint and the backup importer. Every batch is committed before
+    the next one starts, so duplicates across batches are caught by the hash lookup and
+    only the current batch's hashes are kept in memory.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db: Session = db_session
+        self.parser = get_parser_engine()
+        self.accounts = AccountResolver(db_session=db_session)
+        self.rule_engine = RuleEngine(db_session=db_session)
+        self._status_cache = {}
+
+    def _prepare(
+        self, index: int, sms_text: str, parsed_data: Optional[Dict[str, Any]], seen_hashes: set
+    ) -> Tuple[BulkIngestItemResult, TransactionCreate | None]:
+        if not parsed_data:
+            return BulkIngestItemResult(
+                index=index, status=BulkIngestStatus.IGNORED,
+                detail="SMS is not a processable debit transaction or has an unparseable format."
+            ), None
+
+        unique_hash = parsed_data["unique_hash"]
+        if unique_hash in seen_hashes:
+            return BulkIngestItemResult(index=index, status=BulkIngestStatus.DUPLICATE, unique_hash=unique_hash), None
+        seen_hashes.add(unique_hash)
+
+        if parsed_data.get("account_id") is None:
+            return BulkIngestItemResult(
+                index=index, status=BulkIngestStatus.ERROR, unique_hash=unique_hash,
+                detail="Account could not be resolved from the SMS."
+            ), None
+
+        if (auto_subcategory_id := self.rule_engine.run(parsed_data)):
+            parsed_data["subcategory_id"] = auto_subcategory_id
+
+        # Status only depends on the (account, subcategory) pair, so resolve each pair once.
+        status_key = (parsed_data.get("account_id"), parsed_data.get("subcategory_id"))
+        if status_key not in self._status_cache:
+            self._status_cache[status_key] = TransactionStatusManager.determine_initial_status(
+                creation_data=parsed_data, db=self.db
+            )
+        parsed_data["status"] = self._status_cache[status_key].value
+        parsed_data["raw_sms_content"] = sms_text
+        parsed_data.pop("flow_type", None)
+
+        try:
+            transaction_to_create = TransactionCreate(**parsed_data)
+        except Exception as e:
+            return BulkIngestItemResult(
+                index=index, status=BulkIngestStatus.ERROR, unique_hash=unique_hash, detail=f"Invalid transaction data: {e}"
+            ), None
+
+        return BulkIngestItemResult(index=index, status=BulkIngestStatus.CREATED, unique_hash=unique_hash), transaction_to_create
+
+    def ingest(self, sms_texts: Iterable[Tuple[int, str]]) -> List[BulkIngestItemResult]:
+        """
+        Ingest one batch of `(index, sms_text)` pairs.
+
+        Existing hashes are checked with one set-based query and all new rows are
+        inserted in a single database transaction.
+        """
+        results: List[BulkIngestItemResult] = []
+        pending: List[Tuple[BulkIngestItemResult, TransactionCreate]] = []
+        seen_hashes = set()
+
+        # Parse the whole batch first so its accounts are resolved in one go.
+        parsed_batch = [(index, sms_text, self.parser.parse(sms_text)) for index, sms_text in sms_texts]
+        account_ids = iter(self.accounts.resolve_many(parsed for _, _, parsed in parsed_batch if parsed))
+
+        for index, sms_text, parsed_data in parsed_batch:
+            if parsed_data:
+                parsed_data = self.parser.complete(parsed_data, next(account_ids))
+            item_result, transaction_to_create = self._prepare(index, sms_text, parsed_data, seen_hashes)
+            results.append(item_result)
+            if transaction_to_create is not None:
+                pending.append((item_result, transaction_to_create))
+
+        existing_hashes = crud_transaction.get_existing_hashes(
+            self.db, hashes=[obj_in.unique_hash for _, obj_in in pending]
+        )
+        to_create = []
+        for item_result, obj_in in pending:
+            if obj_in.unique_hash in existing_hashes:
+                item_result.status = BulkIngestStatus.DUPLICATE
+            else:
+                to_create.append((item_result, obj_in))
+
+        taxonomy = TAXONOMY.current(self.db)
+        created_ids = crud_transaction.create_transactions_bulk(
+            self.db,
+            objs_in=[obj_in for _, obj_in in to_create],
+            valid_subcategory_ids=set(taxonomy.subcategories),
+            default_subcategory_id=taxonomy.default_subcategory_id,
+        )
+        for item_result, obj_in in to_create:
+            item_result.transaction_id = created_ids.get(obj_in.unique_hash)
+
+        return results
+
+
+def summarize_results(results: List[BulkIngestItemResult]) -> BulkIngestResponse:
+    """Builds the bulk response with per-status counts."""
+    response = BulkIngestResponse(results=results)
+    for item_result in results:
+        if item_result.status == BulkIngestStatus.CREATED:
+            response.created += 1
+        elif item_result.status == BulkIngestStatus.DUPLICATE:
+            response.duplicates += 1
+        elif item_result.status == BulkIngestStatus.IGNORED:
+            response.ignored += 1
+        else:
+            response.errors += 1
+    return response
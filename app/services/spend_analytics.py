@@ -0,0 +1,180 @@
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_spend
+from app.schemas.analytics import SpendAnalytics, SpendDimension, SpendGroup, SpendPeriod
+from app.services.taxonomy import TAXONOMY, TaxonomySnapshot
+
+Month = Tuple[int, int]
+# (bucket, key, spent, count) rows of one month, from crud_spend.spend_groups.
+MonthRows = List[Tuple[Optional[str], object, float, int]]
+
+
+class SpendAnalyticsCache:
+    """
+    Grouped spending of closed months, keyed by (year, month, period, key) and tagged with
+    the month's MonthlySpend.revision when it was computed. Every write that changes what
+    a month's spending is made of bumps that revision (see crud_spend), so an entry is
+    used only while its revision is still the month's: a back-dated import or a
+    re-categorised transaction in an old month is picked up on the next request, from
+    any process. Least recently used entries are dropped beyond ANALYTICS_CACHE_SIZE.
+    """
+
+    def __init__(self, max_entries: int = settings.ANALYTICS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[int, MonthRows]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, revision: int) -> Optional[MonthRows]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != revision:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, revision: int, rows: MonthRows) -> None:
+        with self._lock:
+            self._entries[key] = (revision, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+SPEND_ANALYTICS_CACHE = SpendAnalyticsCache()
+
+
+def _months(date_from: date, date_to: date) -> List[Month]:
+    months = []
+    year, month = date_from.year, date_from.month
+    while (year, month) <= (date_to.year, date_to.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """First and last day of a month."""
+    first = date(year, month, 1)
+    next_first = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first, next_first - timedelta(days=1)
+
+
+def _runs(months: List[Month], selected: List[Month]) -> List[List[Month]]:
+    """`selected` split into runs of months that are consecutive in `months`."""
+    selected_set, runs, previous = set(selected), [], False
+    for month in months:
+        if month in selected_set:
+            if previous:
+                runs[-1].append(month)
+            else:
+                runs.append([month])
+        previous = month in selected_set
+    return runs
+
+
+def _describe(
+    taxonomy: TaxonomySnapshot, category_names: Dict[int, str], group_by: Optional[SpendDimension], key: object
+) -> Tuple[Optional[int], Optional[str]]:
+    """The (id, name) of a group key (a category key is already rolled up), with current names."""
+    if group_by == SpendDimension.MERCHANT:
+        return None, key
+    if group_by == SpendDimension.ACCOUNT:
+        account = taxonomy.accounts.get(key)
+        return key, account.name if account else None
+    if group_by == SpendDimension.SUBCATEGORY:
+        subcategory = taxonomy.subcategories.get(key)
+        return key, subcategory.name if subcategory else None
+    if group_by == SpendDimension.CATEGORY:
+        return key, category_names.get(key)
+    return None, None
+
+
+def get_spend_analytics(
+    db: Session, *, date_from: date, date_to: date,
+    group_by: Optional[SpendDimension] = None, period: Optional[SpendPeriod] = None,
+    cache: SpendAnalyticsCache = SPEND_ANALYTICS_CACHE
+) -> SpendAnalytics:
+    """
+    Budgeted spending between `date_from` and `date_to` (inclusive, by SMS date), with the
+    same rules as the monthly budget (crud_spend.spending_conditions), grouped by
+    `group_by` and/or `period`, computed with GROUP BY in the database.
+
+    Work is done per calendar month. Months that are over and entirely inside the range
+    come from `cache` while their revision is unchanged; the current month, partially
+    covered months and cache misses are computed. Categories are rolled up from
+    subcategories, and names are looked up, at read time: renaming or moving a subcategory
+    never leaves a stale cache entry.
+    """
+    months = _months(date_from, date_to)
+    today = date.today()
+    # Group keys stored in the cache: a category is the sum of its subcategories.
+    key = {SpendDimension.CATEGORY: "subcategory"}.get(group_by, group_by.value if group_by else None)
+    bucket = period.value if period else None
+
+    closed = []
+    for month in months:
+        first, last = _month_bounds(*month)
+        if month < (today.year, today.month) and date_from <= first and last <= date_to:
+            closed.append(month)
+    # Read before the spending, so what is cached is never older than the revision it is tagged with.
+    revisions = crud_spend.get_revisions(db, closed)
+    month_rows: Dict[Month, MonthRows] = {}
+    for month in closed:
+        rows = cache.get((*month, bucket, key), revisions.get(month, 0))
+        if rows is not None:
+            month_rows[month] = rows
+    cached_months = len(month_rows)
+
+    to_compute = [month for month in months if month not in month_rows]
+    computed: Dict[Month, MonthRows] = {month: [] for month in to_compute}
+    # One query per run of consecutive months to compute, each scanning only its own dates
+    # (through the SMS date index): usually just the current month.
+    for run in _runs(months, to_compute):
+        start = max(date_from, _month_bounds(*run[0])[0])
+        end = min(date_to, _month_bounds(*run[-1])[1]) + timedelta(days=1)
+        for year, month, row_bucket, row_key, spent, count in crud_spend.spend_groups(
+            db, start=datetime.combine(start, time.min), end=datetime.combine(end, time.min), bucket=bucket, key=key
+        ):
+            computed[(year, month)].append((row_bucket, row_key, spent, count))
+    closed_months = set(closed)
+    for month, rows in computed.items():
+        if month in closed_months:
+            cache.put((*month, bucket, key), revisions.get(month, 0), rows)
+        month_rows[month] = rows
+
+    # Merge the months: a week spanning two months was summed in each.
+    taxonomy = TAXONOMY.current(db) if group_by else None
+    totals: Dict[Tuple[Optional[str], object], List[float]] = {}
+    for rows in month_rows.values():
+        for row_bucket, row_key, spent, count in rows:
+            if group_by == SpendDimension.CATEGORY:
+                subcategory = taxonomy.subcategories.get(row_key)
+                row_key = subcategory.parent_category_id if subcategory else None
+            total = totals.setdefault((row_bucket, row_key), [0.0, 0])
+            total[0] += spent
+            total[1] += count
+
+    category_names = {}
+    if group_by == SpendDimension.CATEGORY:
+        category_names = {s.parent_category_id: s.parent_category_name for s in taxonomy.subcategories.values()}
+    groups = []
+    for (row_bucket, row_key), (spent, count) in totals.items():
+        group_id, name = _describe(taxonomy, category_names, group_by, row_key)
+        groups.append(SpendGroup(period=row_bucket, id=group_id, name=name, spent=round(spent, 2), count=count))
+    groups.sort(key=lambda group: (group.period or "", -group.spent))
+
+    return SpendAnalytics(
+        date_from=date_from, date_to=date_to, group_by=group_by, period=period,
+        total=round(sum(spent for spent, _ in totals.values()), 2), groups=groups,
+        cached_months=cached_months, computed_months=len(to_compute),
+    )
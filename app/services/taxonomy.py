@@ -0,0 +1,105 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.models.account import Account, AccountType
+from app.models.category import Category
+from app.models.subcategory import SubCategory
+
+
+AccountKey = Tuple[str, str]
+
+
+class AccountRef(NamedTuple):
+    id: int
+    name: str
+    account_type: AccountType
+    bank_name: str
+    account_last4: str
+
+
+class SubCategoryRef(NamedTuple):
+    id: int
+    name: str
+    icon_name: Optional[str]
+    parent_category_id: int
+    parent_category_name: str
+    is_reimbursable: bool
+    exclude_from_budget: bool
+
+
+class TaxonomySnapshot(NamedTuple):
+    """Accounts and subcategories (with their category names) as of one load. Never mutated once built."""
+    version: int
+    accounts: Dict[int, AccountRef]
+    account_ids: Dict[AccountKey, int]
+    subcategories: Dict[int, SubCategoryRef]
+    default_subcategory_id: Optional[int]
+
+    def accounts_by_name(self, limit: Optional[int] = None) -> List[AccountRef]:
+        """Accounts in the order crud_account.get_accounts returns them."""
+        return sorted(self.accounts.values(), key=lambda account: account.name)[:limit]
+
+
+class TaxonomyCache:
+    """
+    Versioned in-memory copy of the accounts, categories and subcategories tables.
+
+    Account resolution, status checks, default-subcategory lookup, response mapping and
+    the Telegram message and keyboard all read from here instead of querying these tiny
+    tables per request. Every write to an account, category or subcategory calls
+    `invalidate()`, which bumps `version`; the next `current()` reloads the snapshot
+    with two queries. A snapshot carries the version it was loaded at.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[TaxonomySnapshot] = None
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def current(self, db: Session) -> TaxonomySnapshot:
+        if (snapshot := self._snapshot) is not None:
+            return snapshot
+        snapshot = self._load(db, self._version)
+        with self._lock:
+            # An invalidate() while we were loading may mean `snapshot` is already stale.
+            if snapshot.version == self._version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._version += 1
+
+    @staticmethod
+    def _load(db: Session, version: int) -> TaxonomySnapshot:
+        accounts = {
+            row.id: AccountRef(row.id, row.name, row.account_type, row.bank_name, row.account_last4)
+            for row in db.query(
+                Account.id, Account.name, Account.account_type, Account.bank_name, Account.account_last4
+            ).all()
+        }
+        account_ids = {(account.bank_name, account.account_last4): account.id for account in accounts.values()}
+
+        subcategories = {}
+        default_subcategory_id = None
+        rows = db.query(
+            SubCategory.id, SubCategory.name, SubCategory.icon_name, SubCategory.parent_category_id,
+            Category.name.label("parent_category_name"), SubCategory.is_reimbursable, SubCategory.exclude_from_budget,
+        ).join(Category, SubCategory.parent_category_id == Category.id).all()
+        for row in rows:
+            subcategories[row.id] = SubCategoryRef(*row)
+            if row.name == "Uncategorized" and row.parent_category_name == "General":
+                default_subcategory_id = row.id
+
+        return TaxonomySnapshot(version, accounts, account_ids, subcategories, default_subcategory_id)
+
+
+# Shared by every request; the account, category and subcategory endpoints invalidate it.
+TAXONOMY = TaxonomyCache()
@@ -1,51 +1,39 @@
-import httpx
-from typing import Optional
+from typing import Optional, Tuple
 from sqlalchemy.orm import Session
 import enum
 
 from app.core.config import settings
 from app.core.security import create_mini_app_access_token 
+from app.db.session import run_in_db_thread
 from app.schemas.transaction import TransactionInDB
 from app.models.transaction import TransactionStatus
-from app.crud import crud_account
-
 from app.services.budget_service import get_remaining_spend_power
+from app.services.taxonomy import TAXONOMY
+from app.services.telegram_sender import TELEGRAM_SENDER
 
 
-API_BASE_URL = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}"
-
 class TransactionType(str, enum.Enum):
     NEW = "New Transaction Captured"
     UPDATED = "Transaction UPDATED"
 
+def is_configured() -> bool:
+    """Whether a bot token and chat ID are set, i.e. whether notifications can be sent at all."""
+    return bool(settings.TELEGRAM_BOT_TOKEN and settings.TELEGRAM_CHAT_ID)
+
 async def send_message(text: str, reply_markup: Optional[dict] = None) -> Optional[int]:
-    """A simple async function to send a message using httpx."""
-    if not settings.TELEGRAM_BOT_TOKEN or not settings.TELEGRAM_CHAT_ID:
+    """Sends a message through the rate-limited TELEGRAM_SENDER queue. Returns its message id."""
+    if not is_configured():
         print("WARN: Telegram credentials not set. Skipping notification.")
         return
 
-    async with httpx.AsyncClient() as client:
-        payload = {
-            "chat_id": settings.TELEGRAM_CHAT_ID,
-            "text": text,
-            "parse_mode": "MarkdownV2",
-        }
-        if reply_markup:
-            payload["reply_markup"] = reply_markup
-            
-        try:
-            response = await client.post(f"{API_BASE_URL}/sendMessage", json=payload)
-            response.raise_for_status()
-            response_data = response.json()
-            if response_data.get("ok"):
-                return response_data["result"]["message_id"]
-            
-        except httpx.HTTPStatusError as e:
-            print(f"ERROR sending Telegram message: {e.response.text}")
-        except Exception as e:
-            print(f"ERROR during Telegram notification: {e}")
-            
-        return None
+    payload = {
+        "chat_id": settings.TELEGRAM_CHAT_ID,
+        "text": text,
+        "parse_mode": "MarkdownV2",
+    }
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
+    return await TELEGRAM_SENDER.send_message(payload)
 
 def _format_transaction_message(transaction: TransactionInDB, type_str: TransactionType, db: Session) -> str:
     """Formats a transaction object into a nice string for Telegram."""
@@ -75,15 +63,18 @@ def _format_transaction_message(transaction: TransactionInDB, type_str: Transact
             f"`[{progress_bar}] {percentage:.0f}% Used`"
         )
     
+    # Names come from the cached taxonomy, so the transaction's relationships are never loaded.
+    taxonomy = TAXONOMY.current(db)
+
     account_name = "⚠️ *Not Set*"
-    if transaction.account:
-        account_name = escape_md(transaction.account.name)
+    if (account := taxonomy.accounts.get(transaction.account_id)) is not None:
+        account_name = escape_md(account.name)
 
     subcategory_display_name  = "⚠️ *Not Set*"
-    if transaction.subcategory:
-        parent_name = transaction.subcategory.parent_category.name if transaction.subcategory.parent_category else ""
+    if (subcategory := taxonomy.subcategories.get(transaction.subcategory_id)) is not None:
+        parent_name = subcategory.parent_category_name
         subcategory_display_name = escape_md(
-            f"{transaction.subcategory.name} ({parent_name})" if parent_name else transaction.subcategory.name
+            f"{subcategory.name} ({parent_name})" if parent_name else subcategory.name
         )
 
     status_emoji_map = { 
@@ -126,7 +117,7 @@ def _build_inline_keyboard(transaction: TransactionInDB, db: Session) -> Optiona
         buttons.append([{"text": "🏷️ Select Category (App)", "web_app": {"url": mini_app_url}}])
 
     elif transaction.status == TransactionStatus.PENDING_ACCOUNT_SELECTION:
-        accounts = crud_account.get_accounts(db, limit=5)
+        accounts = TAXONOMY.current(db).accounts_by_name(limit=5)
         for acc in accounts:
             buttons.append([{"text": f"{acc.name}", "callback_data": f"set_acc:{transaction.unique_hash}:{acc.id}"}])
         if len(accounts) >= 5: 
@@ -143,31 +134,35 @@ def _build_inline_keyboard(transaction: TransactionInDB, db: Session) -> Optiona
 
     return {"inline_keyboard": buttons} if buttons else None 
 
+def build_new_transaction_message(transaction: TransactionInDB, db: Session) -> Tuple[str, Optional[dict]]:
+    """Text and keyboard of a new-transaction notification. Only this part needs the database."""
+    return _format_transaction_message(transaction, TransactionType.NEW, db), _build_inline_keyboard(transaction, db)
+
+def build_updated_transaction_message(transaction: TransactionInDB, db: Session) -> Tuple[str, Optional[dict]]:
+    """Text and keyboard of an updated-transaction message."""
+    return _format_transaction_message(transaction, TransactionType.UPDATED, db), _build_inline_keyboard(transaction, db)
+
 async def send_new_transaction_notification(transaction: TransactionInDB, db: Session):
     """The main function to call from an endpoint."""
-    message_text = _format_transaction_message(transaction, TransactionType.NEW, db)
-    keyboard = _build_inline_keyboard(transaction, db)
+    message_text, keyboard = await run_in_db_thread(build_new_transaction_message, transaction, db)
     return await send_message(text=message_text, reply_markup=keyboard)
 
 async def send_update_notification(transaction: TransactionInDB, db: Session):
     """Sends a simpler notification when a transaction is updated."""
-    message_text = _format_transaction_message(transaction, TransactionType.UPDATED)
-    keyboard = _build_inline_keyboard(transaction, db)
+    message_text, keyboard = await run_in_db_thread(build_updated_transaction_message, transaction, db)
     await send_message(text=message_text, reply_markup=keyboard)
     
 async def edit_message_after_update(transaction: TransactionInDB, chat_id: int, message_id: int, db: Session):
     """Edits an existing Telegram message to reflect the updated transaction state."""
-    new_text = _format_transaction_message(transaction, TransactionType.UPDATED, db)
-    keyboard = _build_inline_keyboard(transaction, db)
-    async with httpx.AsyncClient() as client:
-        payload = {
-            "chat_id": chat_id,
-            "message_id": message_id,
-            "text": new_text,
-            "parse_mode": "MarkdownV2",
-            "reply_markup": keyboard
-        }
-        try:
-            await client.post(f"{API_BASE_URL}/editMessageText", json=payload)
-        except httpx.HTTPStatusError as e:
-            print(f"INFO: Could not edit Telegram message (this is often okay): {e.response.text}")
\ No newline at end of file
+    # The spend-power line reads the database, so the message is built on the DB thread pool.
+    new_text, keyboard = await run_in_db_thread(build_updated_transaction_message, transaction, db)
+    payload = {
+        "chat_id": chat_id,
+        "message_id": message_id,
+        "text": new_text,
+        "parse_mode": "MarkdownV2",
+        "reply_markup": keyboard
+    }
+    # Several quick edits of one message are coalesced into the latest by the sender.
+    if not await TELEGRAM_SENDER.edit_message(payload):
+        print(f"INFO: Could not edit Telegram message {message_id} (this is often okay).")
@@ -0,0 +1,322 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+import asyncio
+import math
+import random
+import time
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when the h2 package is installed)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+class TokenBucket:
+    """`rate` tokens per second, at most `capacity` saved up for bursts."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available; 0 if one is available now."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+@dataclass
+class _Job:
+    method: str
+    payload: Dict[str, Any]
+    future: "asyncio.Future[Optional[Dict[str, Any]]]"
+    attempts: int = 0
+    edit_key: Optional[Tuple[Any, Any]] = None
+    not_before: float = field(default=0.0)
+
+
+class TelegramSender:
+    """
+    Single queue in front of the Bot API, shared by every notification and message edit.
+
+    A worker task sends the queued calls in order within each chat. Each call waits for a
+    token from a global bucket (`global_rate` per second) and from its chat's bucket
+    (`chat_rate` per second, bursts of `chat_burst`), which keeps us under Telegram's
+    limits instead of finding them with 429s. A 429 pauses the whole queue for the
+    `retry_after` Telegram asks for. Network errors and 5xx are retried with exponential
+    backoff and jitter, up to `max_retries` times. Other 4xx errors are final. A chat that
+    is backing off or out of tokens only holds up its own calls: the worker sends the
+    first queued call of any other chat that may go.
+
+    An `editMessageText` for a message that already has an edit waiting in the queue
+    replaces that edit's payload. Only the latest text is sent, and every caller gets
+    its result.
+
+    All calls share one pooled `httpx.AsyncClient` (keep-alive, HTTP/2 when `h2` is
+    installed), so only the first message pays for DNS, TCP and TLS. The app opens it in
+    its lifespan with `start()` and closes it with `stop()`. Scripts that never call
+    `start()` get one on first use. The worker is started on first use, in the running
+    event loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        http2: bool = True,
+        timeout: httpx.Timeout = httpx.Timeout(15.0, connect=5.0),
+    ):
+        self.base_url = base_url
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.http2 = http2
+        self.timeout = timeout
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_bucket = TokenBucket(global_rate, global_rate)
+        self._chat_buckets: Dict[Any, TokenBucket] = {}
+        self._queue: Deque[_Job] = deque()
+        self._in_flight: Optional[_Job] = None
+        self._pending_edits: Dict[Tuple[Any, Any], _Job] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._paused_until = 0.0
+        self._counters = {"sent": 0, "failed": 0, "retried": 0, "rate_limited": 0, "coalesced": 0}
+
+    async def send_message(self, payload: Dict[str, Any]) -> Optional[int]:
+        """Queues a sendMessage call and waits for it. Returns the message id, or None on failure."""
+        result = await self.call("sendMessage", payload)
+        return result.get("message_id") if isinstance(result, dict) else None
+
+    async def edit_message(self, payload: Dict[str, Any]) -> bool:
+        """Queues an editMessageText call, coalesced with any pending edit of the same message."""
+        return await self.call("editMessageText", payload) is not None
+
+    async def call(self, method: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        self._ensure_worker()
+        edit_key = None
+        if method == "editMessageText":
+            edit_key = (payload.get("chat_id"), payload.get("message_id"))
+            if (pending := self._pending_edits.get(edit_key)) is not None:
+                pending.payload = payload
+                self._counters["coalesced"] += 1
+                return await asyncio.shield(pending.future)
+
+        job = _Job(method, payload, self._loop.create_future(), edit_key=edit_key)
+        if edit_key is not None:
+            self._pending_edits[edit_key] = job
+        self._queue.append(job)
+        self._wake.set()
+        return await asyncio.shield(job.future)
+
+    def max_call_seconds(self) -> float:
+        """
+        The longest a call can take once the worker picks it up: every attempt timing out
+        and every retry backoff. Pauses for a 429 and time spent queued come on top.
+        """
+        attempt = (self.timeout.connect or 0.0) + (self.timeout.read or 0.0)
+        backoffs = sum(min(self.max_backoff, self.base_backoff * 2 ** retry) for retry in range(self.max_retries))
+        return (self.max_retries + 1) * attempt + backoffs
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and counters since start-up."""
+        return {
+            "queue_depth": len(self._queue),
+            "pending_edits": len(self._pending_edits),
+            "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "worker_running": self._task is not None and not self._task.done(),
+            **self._counters,
+        }
+
+    async def start(self) -> None:
+        """Opens the pooled HTTP client. Called from the app's lifespan."""
+        self._ensure_worker()
+
+    async def stop(self) -> None:
+        """Stops the worker, fails whatever is still queued and closes the HTTP client."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        for job in [self._in_flight, *self._queue]:
+            if job is not None and not job.future.done():
+                job.future.set_result(None)
+        self._queue.clear()
+        self._pending_edits.clear()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (e.g. a script calling asyncio.run twice).
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._queue.clear()
+            self._pending_edits.clear()
+            self._task = None
+            self._client = None
+        if self._client is None:
+            if self.http2 and not _HTTP2_AVAILABLE:
+                print("INFO: h2 is not installed, Telegram calls use HTTP/1.1 keep-alive (pip install 'httpx[http2]').")
+            self._client = httpx.AsyncClient(
+                http2=self.http2 and _HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60.0),
+            )
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    def _next_job(self) -> Tuple[Optional[int], float]:
+        """
+        The queue index of the first call that may be sent now, skipping every call of a
+        chat whose earliest queued call is still backing off or waiting for a chat token.
+        Otherwise (None, seconds until one of them may go).
+        """
+        now = time.monotonic()
+        blocked = set()
+        delay = math.inf
+        for index, job in enumerate(self._queue):
+            chat_id = job.payload.get("chat_id")
+            if chat_id in blocked:
+                continue
+            job_delay = max(job.not_before - now, self._chat_bucket(chat_id).wait_time())
+            if job_delay <= 0:
+                return index, 0.0
+            blocked.add(chat_id)
+            delay = min(delay, job_delay)
+        return None, delay
+
+    async def _run(self) -> None:
+        while True:
+            index = None
+            delay = self._paused_until - time.monotonic()
+            if delay <= 0:
+                index, delay = self._next_job()
+                if index is not None:
+                    delay = self._global_bucket.wait_time()
+            if delay > 0:
+                # New calls wake us up: one for another chat may be sendable right away.
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=None if math.isinf(delay) else delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job = self._queue[index]
+            del self._queue[index]
+            self._global_bucket.take()
+            self._chat_bucket(job.payload.get("chat_id")).take()
+            if job.edit_key is not None:
+                # From here on a new edit of this message is queued separately.
+                self._pending_edits.pop(job.edit_key, None)
+            self._in_flight = job
+            try:
+                await self._attempt(job)
+            except Exception as e:
+                print(f"ERROR: Unexpected error calling Telegram {job.method}: {e}")
+                self._finish(job, None)
+            finally:
+                self._in_flight = None
+
+    async def _attempt(self, job: _Job) -> None:
+        job.attempts += 1
+        try:
+            response = await self._client.post(f"{self.base_url}/{job.method}", json=job.payload)
+        except httpx.HTTPError as e:
+            self._retry_or_fail(job, f"{type(e).__name__}: {e}")
+            return
+
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+
+        if response.status_code == 429:
+            retry_after = float((data.get("parameters") or {}).get("retry_after", self.base_backoff))
+            self._counters["rate_limited"] += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            print(f"WARN: Telegram rate limit hit on {job.method}, pausing sends for {retry_after:.0f}s.")
+            job.attempts -= 1  # a 429 is Telegram's pacing, not a failed attempt
+            self._requeue(job)
+            return
+        if response.status_code >= 500:
+            self._retry_or_fail(job, f"HTTP {response.status_code}: {response.text[:200]}")
+            return
+        if response.status_code >= 400 or not data.get("ok"):
+            description = data.get("description", response.text[:200])
+            if job.method == "editMessageText" and "message is not modified" in description:
+                self._finish(job, {"message_id": job.payload.get("message_id")})
+                return
+            print(f"ERROR sending Telegram {job.method}: {description}")
+            self._finish(job, None)
+            return
+
+        result = data.get("result")
+        self._finish(job, result if isinstance(result, dict) else {"result": result})
+
+    def _retry_or_fail(self, job: _Job, error: str) -> None:
+        if job.attempts > self.max_retries:
+            print(f"ERROR: Giving up on Telegram {job.method} after {job.attempts} attempts: {error}")
+            self._finish(job, None)
+            return
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (job.attempts - 1))
+        job.not_before = time.monotonic() + backoff * random.uniform(0.5, 1.0)
+        self._counters["retried"] += 1
+        print(f"WARN: Telegram {job.method} failed ({error}), retry {job.attempts}/{self.max_retries} in {backoff:.1f}s.")
+        self._requeue(job)
+
+    def _requeue(self, job: _Job) -> None:
+        # Back to the front, so retries never overtake later calls to the same chat; while
+        # it backs off, _next_job skips that chat only.
+        self._queue.appendleft(job)
+        if job.edit_key is not None:
+            self._pending_edits.setdefault(job.edit_key, job)
+
+    def _finish(self, job: _Job, result: Optional[Dict[str, Any]]) -> None:
+        self._counters["sent" if result is not None else "failed"] += 1
+        if not job.future.done():
+            job.future.set_result(result)
+
+    def _chat_bucket(self, chat_id: Any) -> TokenBucket:
+        if (bucket := self._chat_buckets.get(chat_id)) is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+
+TELEGRAM_SENDER = TelegramSender(
+    f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}",
+    global_rate=settings.TELEGRAM_GLOBAL_RATE,
+    chat_rate=settings.TELEGRAM_CHAT_RATE,
+    chat_burst=settings.TELEGRAM_CHAT_BURST,
+    max_retries=settings.TELEGRAM_MAX_RETRIES,
+    http2=settings.TELEGRAM_HTTP2,
+    timeout=httpx.Timeout(settings.TELEGRAM_TIMEOUT_SECONDS, connect=settings.TELEGRAM_CONNECT_TIMEOUT_SECONDS),
+)
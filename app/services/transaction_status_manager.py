@@ -1,38 +1,30 @@
 from typing import Dict, Any, Optional
 
 from app.models.account import AccountType
-from app.crud import crud_account 
 from app.models.transaction import TransactionStatus, Transaction 
-from app.models.subcategory import SubCategory 
+from app.services.taxonomy import TAXONOMY
 
 
 class TransactionStatusManager:
-    """Manages transaction status transitions based on account and subcategory validation"""
+    """
+    Manages transaction status transitions based on account and subcategory validation.
+    Both are checked against the in-memory TAXONOMY, not the database.
+    """
     
     @staticmethod
     def is_account_valid(db, account_id: Optional[int]) -> bool:
         if account_id is None:
             return False
-        try:
-            account = crud_account.get_account(db=db, account_id=account_id)
-            return account is not None and account.account_type != AccountType.UNKNOWN
-        except Exception:
-            return False
+        account = TAXONOMY.current(db).accounts.get(account_id)
+        return account is not None and account.account_type != AccountType.UNKNOWN
     
     @staticmethod
     def is_subcategory_valid(db, subcategory_id: Optional[int]) -> bool:
         """Check if provided subcategory_id is valid and not 'Uncategorized'."""
         if subcategory_id is None:
             return False
-        
-        try:
-            subcategory = db.query(SubCategory).filter(SubCategory.id == subcategory_id).first()
-            
-            if subcategory and subcategory.name.lower() != "uncategorized":
-                 return True
-            return False
-        except Exception:
-            return False
+        subcategory = TAXONOMY.current(db).subcategories.get(subcategory_id)
+        return subcategory is not None and subcategory.name.lower() != "uncategorized"
         
     @staticmethod
     def determine_initial_status(db, creation_data: Dict[str, Any]) -> TransactionStatus:
@@ -0,0 +1,143 @@
+"""
+Latency of GET /analytics/spend (spend_analytics.get_spend_analytics) with and without its
+cache of closed months.
+
+Seeds --rows transactions (as bench_list does, 15 minutes apart from 2024-01-01) into a
+throwaway SQLite database, rebuilds monthly_spend and analyzes, then runs each grouping of GROUPINGS
+over the whole seeded range up to today:
+
+  - cold[...]: an empty cache, every month computed by the GROUP BY
+  - warm[...]: closed months from the cache, only the open month(s) computed
+
+Then a transaction in a closed month is moved to another subcategory through
+crud_transaction.update_transaction, which bumps that month's revision.
+
+With --check the run fails if a warm result differs from the cold one, if the warm p50 is
+not --min-speedup times lower, or if after the update the cache serves anything but the
+recomputed month (and the open ones) and the same totals as a cold run.
+
+Usage (from the repository root, with the usual .env in place):
+    python -m benchmarks.bench_analytics
+    python -m benchmarks.bench_analytics --rows 300000 --check
+"""
+import argparse
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import crud_spend, crud_transaction
+from app.models import SubCategory, Transaction
+from app.schemas.analytics import SpendAnalytics, SpendDimension, SpendPeriod
+from app.schemas.transaction import TransactionUpdate
+from app.services.spend_analytics import SpendAnalyticsCache, get_spend_analytics
+
+from .bench_ingest import seeded_session_factory
+from .bench_list import START, seed_transactions
+from .common import BenchResult, measure, print_results
+
+GROUPINGS: Dict[str, Tuple[Optional[SpendDimension], Optional[SpendPeriod]]] = {
+    "total by month": (None, SpendPeriod.MONTH),
+    "category by month": (SpendDimension.CATEGORY, SpendPeriod.MONTH),
+    "subcategory": (SpendDimension.SUBCATEGORY, None),
+    "account by week": (SpendDimension.ACCOUNT, SpendPeriod.WEEK),
+    "merchant": (SpendDimension.MERCHANT, None),
+    "category by day": (SpendDimension.CATEGORY, SpendPeriod.DAY),
+}
+
+
+def same_groups(a: SpendAnalytics, b: SpendAnalytics) -> bool:
+    return abs(a.total - b.total) < 0.01 and [
+        (g.period, g.id, g.name, round(g.spent, 2), g.count) for g in a.groups
+    ] == [(g.period, g.id, g.name, round(g.spent, 2), g.count) for g in b.groups]
+
+
+def move_one_transaction(session_factory: sessionmaker, month: Tuple[int, int]) -> None:
+    """Re-categorises one transaction of `month` the way the PATCH endpoint does."""
+    db = session_factory()
+    try:
+        transaction = db.query(Transaction)\
+            .filter(Transaction.transaction_datetime_from_sms >= date(*month, 1))\
+            .order_by(Transaction.transaction_datetime_from_sms).first()
+        other = db.query(SubCategory.id).filter(SubCategory.id != transaction.subcategory_id)\
+            .order_by(SubCategory.id.desc()).limit(1).scalar()
+        crud_transaction.update_transaction(db, db_obj=transaction, obj_in=TransactionUpdate(subcategory_id=other))
+    finally:
+        db.close()
+
+
+def run_benchmarks(rows: int, repeat: int) -> Tuple[List[BenchResult], List[str], Dict[str, int]]:
+    problems: List[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory, _ = seeded_session_factory(Path(tmp) / "bench_analytics.db")
+        seed_transactions(session_factory, rows)
+        db = session_factory()
+        months = crud_spend.rebuild(db)
+        # The planner statistics db_maintenance keeps up to date on a real database.
+        db.connection().exec_driver_sql("ANALYZE")
+        db.close()
+        date_from, date_to = START.date(), date.today()
+        warm_cache = SpendAnalyticsCache()
+
+        def run(grouping: Tuple[Optional[SpendDimension], Optional[SpendPeriod]], cache: SpendAnalyticsCache) -> SpendAnalytics:
+            run_db = session_factory()
+            try:
+                return get_spend_analytics(
+                    run_db, date_from=date_from, date_to=date_to, group_by=grouping[0], period=grouping[1], cache=cache
+                )
+            finally:
+                run_db.close()
+
+        results: List[BenchResult] = []
+        for name, grouping in GROUPINGS.items():
+            results.append(measure(f"cold[{name}]", lambda g: run(g, SpendAnalyticsCache()), [grouping] * repeat))
+            run(grouping, warm_cache)
+            results.append(measure(f"warm[{name}]", lambda g: run(g, warm_cache), [grouping] * repeat))
+            cold, warm = run(grouping, SpendAnalyticsCache()), run(grouping, warm_cache)
+            if not same_groups(cold, warm):
+                problems.append(f"warm[{name}] differs from the cold result")
+
+        # A write to a closed month: only that month is recomputed, with the new totals.
+        open_months = run(GROUPINGS["subcategory"], warm_cache).computed_months
+        move_one_transaction(session_factory, (START.year, START.month + 1))
+        after = run(GROUPINGS["subcategory"], warm_cache)
+        if after.computed_months != open_months + 1:
+            problems.append(f"after the update {after.computed_months} months were computed, expected {open_months + 1}")
+        if not same_groups(after, run(GROUPINGS["subcategory"], SpendAnalyticsCache())):
+            problems.append("after the update the cached result differs from a cold one")
+    return results, problems, {"months": months, "open": open_months, "after update": after.computed_months}
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark grouped spending analytics and their cache.")
+    arg_parser.add_argument("--rows", type=int, default=100_000, help="Transactions in the table")
+    arg_parser.add_argument("--repeat", type=int, default=10, help="Runs per grouping")
+    arg_parser.add_argument("--min-speedup", type=float, default=5.0, help="cold/warm p50 required by --check")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero if the cache is wrong or slow")
+    args = arg_parser.parse_args(argv)
+
+    results, problems, months = run_benchmarks(args.rows, args.repeat)
+    print_results(results)
+    print(f"\n{months['months']} months with spending; a warm run computes {months['open']} "
+          f"(the open ones), {months['after update']} after a write to a closed month")
+
+    by_name = {result.name: result for result in results}
+    for name in GROUPINGS:
+        speedup = by_name[f"cold[{name}]"].p50_us / by_name[f"warm[{name}]"].p50_us
+        print(f"{name:<20} warm {speedup:.1f}x faster")
+        if speedup < args.min_speedup:
+            problems.append(f"warm[{name}] is only {speedup:.1f}x faster (required {args.min_speedup:.1f}x)")
+
+    if args.check and problems:
+        print("\nERROR: spending analytics regressed:")
+        for line in problems:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
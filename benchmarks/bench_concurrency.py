@@ -0,0 +1,223 @@
+"""
+Do parallel SMS ingests and reads queue behind each other?
+
+All requests go through one event loop (httpx's ASGITransport, like a single uvicorn
+worker):
+
+  1. reads alone: --reads mini-app (GET /transactions/get/by-token and
+     /accounts/for-mini-app) or --reads list (GET /transactions/list?limit=50)
+  2. the same reads while --ingest-concurrency clients post every corpus SMS to receive_sms
+
+A probe task sleeps 5 ms in a loop and records how late it wakes up. Any query run on the
+event loop itself shows up there as lag, and as read latency during ingest. With --check
+the run fails if the loop's median lag during ingest exceeds --max-lag-ms. The median, not
+the p99: worker threads busy with queries also hold the GIL, which puts a few tens of ms
+on the tail whatever the endpoints do, while a query on the loop lags every other probe.
+
+The database is configured like the app's (app/db/sqlite_profile.py: WAL, busy timeout,
+...), and the read endpoints that use deps.get_read_db get their own read-only engine.
+--compare runs everything twice, first on one bare SQLite engine for everything, to show
+what the profile and the read-only engine change.
+
+Usage (from the repository root, with the usual .env in place):
+    python -m benchmarks.bench_concurrency
+    python -m benchmarks.bench_concurrency --ingest-concurrency 16 --check
+    python -m benchmarks.bench_concurrency --reads list --compare
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.core.config import settings
+from app.core.security import create_mini_app_access_token
+from app.db.session import create_read_only_engine
+from app.main import app
+from app.models import Transaction
+from app.services.taxonomy import TAXONOMY
+
+from .bench_ingest import create_accounts, ingestible_corpora, seeded_session_factory
+from .common import BenchResult, percentile, print_results, quiet_stdout
+
+PROBE_INTERVAL = 0.005
+
+
+def _result(name: str, latencies_us: List[float], elapsed: float) -> BenchResult:
+    latencies_us.sort()
+    return BenchResult(
+        name=name,
+        count=len(latencies_us),
+        ops_per_sec=len(latencies_us) / elapsed if elapsed else 0.0,
+        p50_us=percentile(latencies_us, 0.50),
+        p99_us=percentile(latencies_us, 0.99),
+    )
+
+
+async def _timed(call: Callable[[], Awaitable[httpx.Response]], latencies_us: List[float]) -> None:
+    start = time.perf_counter_ns()
+    response = await call()
+    latencies_us.append((time.perf_counter_ns() - start) / 1000)
+    if response.status_code != 200:
+        # Not SystemExit: raised in a task, it would skip the event loop's shutdown and
+        # leave the process waiting on the server's worker threads.
+        raise RuntimeError(f"{response.request.url.path} returned {response.status_code}: {response.text[:200]}")
+
+
+async def _probe_loop_lag(done: asyncio.Event, lags_us: List[float]) -> None:
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags_us.append(max(0.0, time.perf_counter() - start - PROBE_INTERVAL) * 1e6)
+
+
+async def run_benchmarks(
+    scale: int, ingest_concurrency: int, read_concurrency: int, idle_reads: int,
+    reads_kind: str = "mini-app", sqlite_profile: bool = True,
+) -> Tuple[List[BenchResult], List[float]]:
+    corpora, parsed_items = ingestible_corpora(scale)
+    messages = list(dict.fromkeys(sms for messages in corpora.values() for sms in messages))
+    settings.APP_SECRET_KEY = settings.APP_SECRET_KEY or "bench-concurrency"
+    settings.IPHONE_SHORTCUT_API_KEY = settings.IPHONE_SHORTCUT_API_KEY or "bench-concurrency"
+    headers = {"X-API-KEY": settings.IPHONE_SHORTCUT_API_KEY}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench_concurrency.db"
+        session_factory, _ = seeded_session_factory(path, sqlite_profile)
+        # Without the profile, reads share the writer's engine like they used to.
+        read_session_factory = sessionmaker(bind=create_read_only_engine(f"sqlite:///{path}")) \
+            if sqlite_profile else session_factory
+
+        def override(factory: sessionmaker):
+            def get_db():
+                db = factory()
+                try:
+                    yield db
+                finally:
+                    db.close()
+            return get_db
+
+        app.dependency_overrides[deps.get_db] = override(session_factory)
+        app.dependency_overrides[deps.get_read_db] = override(read_session_factory)
+        TAXONOMY.invalidate()
+        create_accounts(session_factory, parsed_items)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as client:
+            with quiet_stdout():
+                await _timed(
+                    lambda: client.post("/api/v1/transactions/", json={"sms_content": messages.pop()}, headers=headers),
+                    [],
+                )
+            db = session_factory()
+            token = create_mini_app_access_token(transaction_hash=db.query(Transaction.unique_hash).scalar())
+            db.close()
+            read_headers = {"Authorization": f"Bearer {token}"}
+
+            if reads_kind == "list":
+                reads = [lambda: client.get("/api/v1/transactions/list", params={"limit": 50})]
+            else:
+                reads = [
+                    lambda: client.get("/api/v1/transactions/get/by-token", headers=read_headers),
+                    lambda: client.get("/api/v1/accounts/for-mini-app"),
+                ]
+
+            async def reader(latencies_us: List[float], keep_going: Callable[[], bool]) -> None:
+                i = 0
+                while keep_going():
+                    await _timed(reads[i % len(reads)], latencies_us)
+                    i += 1
+
+            # 1. Reads alone.
+            idle_us: List[float] = []
+            started = time.perf_counter()
+            await asyncio.gather(*(reader(idle_us, lambda: len(idle_us) < idle_reads) for _ in range(read_concurrency)))
+            idle = _result(f"{reads_kind} read[idle]", idle_us, time.perf_counter() - started)
+
+            # 2. Reads while SMS are being ingested.
+            queue = list(reversed(messages))
+            done = asyncio.Event()
+            ingest_us: List[float] = []
+            busy_us: List[float] = []
+            lags_us: List[float] = []
+
+            async def ingester() -> None:
+                while queue:
+                    sms = queue.pop()
+                    await _timed(
+                        lambda: client.post("/api/v1/transactions/", json={"sms_content": sms}, headers=headers),
+                        ingest_us,
+                    )
+
+            async def ingest_all() -> None:
+                await asyncio.gather(*(ingester() for _ in range(ingest_concurrency)))
+                done.set()
+
+            started = time.perf_counter()
+            with quiet_stdout():
+                await asyncio.gather(
+                    ingest_all(),
+                    _probe_loop_lag(done, lags_us),
+                    *(reader(busy_us, lambda: not done.is_set()) for _ in range(read_concurrency)),
+                )
+            elapsed = time.perf_counter() - started
+
+        app.dependency_overrides.pop(deps.get_db, None)
+        app.dependency_overrides.pop(deps.get_read_db, None)
+
+    results = [
+        idle,
+        _result(f"{reads_kind} read[during ingest]", busy_us, elapsed),
+        _result(f"receive_sms[{ingest_concurrency} concurrent]", ingest_us, elapsed),
+    ]
+    return results, sorted(lags_us)
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark concurrent SMS ingests and reads.")
+    arg_parser.add_argument("--scale", type=int, default=50, help="Messages per bank corpus")
+    arg_parser.add_argument("--ingest-concurrency", type=int, default=8, help="Parallel receive_sms clients")
+    arg_parser.add_argument("--read-concurrency", type=int, default=4, help="Parallel reading clients")
+    arg_parser.add_argument("--reads", choices=("mini-app", "list"), default="mini-app", help="Which endpoints the readers call")
+    arg_parser.add_argument("--compare", action="store_true", help="Run once without the SQLite profile first")
+    arg_parser.add_argument("--idle-reads", type=int, default=200, help="Reads measured without ingest load")
+    arg_parser.add_argument("--max-lag-ms", type=float, default=15.0, help="Median event loop lag allowed by --check")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero if the event loop lags more than --max-lag-ms")
+    args = arg_parser.parse_args(argv)
+
+    for sqlite_profile in ((False, True) if args.compare else (True,)):
+        if args.compare:
+            print(f"\n=== {'with' if sqlite_profile else 'without'} the SQLite profile ===")
+        try:
+            results, lags_us = asyncio.run(run_benchmarks(
+                args.scale, args.ingest_concurrency, args.read_concurrency, args.idle_reads,
+                reads_kind=args.reads, sqlite_profile=sqlite_profile,
+            ))
+        except RuntimeError as e:
+            print(f"ERROR: {e}")
+            return 1
+        print_results(results)
+
+        lag_p50_ms = percentile(lags_us, 0.50) / 1000
+        print(
+            f"\nEvent loop lag during ingest: p50 {lag_p50_ms:.1f} ms, "
+            f"p99 {percentile(lags_us, 0.99) / 1000:.1f} ms, max {lags_us[-1] / 1000:.1f} ms ({len(lags_us)} probes)"
+        )
+        idle, busy = results[0], results[1]
+        print(f"Read p50 during ingest: {busy.p50_us / idle.p50_us:.1f}x idle.")
+
+    if args.check and lag_p50_ms > args.max_lag_ms:
+        print(f"\nERROR: event loop median lag {lag_p50_ms:.1f} ms exceeds {args.max_lag_ms:.1f} ms; "
+              f"something is blocking it (a query in an async endpoint?).")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
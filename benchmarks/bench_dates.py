@@ -0,0 +1,127 @@
+"""
+Micro-benchmark of BaseParser._parse_date: the strptime loop it used to run against the
+compiled DateParser, for every date format the parsers use.
+
+Each format is measured on matching strings ("hit") and on strings that fail the first
+format ("miss", where the old loop raised, caught and printed a ValueError). The new
+parser is measured cold (LRU disabled) and warm (every string seen before; misses and
+formats without a year are never cached, so those stay cold). The three take turns pass
+by pass, so load on the machine does not favour one of them.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_dates           # print results
+    python -m benchmarks.bench_dates --check   # exit 1 if the new path is slower than the old one
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from app.services.parsers.date_parser import DateParser
+
+from .common import BenchResult, measure, print_results
+
+# (name, formats as passed by the parser, strftime format to generate inputs with)
+FORMATS = [
+    ("hdfc_card", ["%Y-%m-%d %H:%M:%S"], "%Y-%m-%d %H:%M:%S"),
+    ("hdfc_upi", ["%d-%m"], "%d-%m"),
+    ("federal_upi", ["%d-%m-%Y %H:%M:%S"], "%d-%m-%Y %H:%M:%S"),
+    ("federal_fednet", ["%d%b%Y %H:%M:%S"], "%d%b%Y %H:%M:%S"),
+    ("sbi", ["%d/%m/%y"], "%d/%m/%y"),
+    ("icici", ["%d-%b-%y", "%d-%B-%y"], "%d-%B-%y"),
+    ("idfc", ["%d %b %Y %I:%M %p"], "%d %b %Y %I:%M %p"),
+    ("axis", ["%d-%m-%y %H:%M:%S"], "%d-%m-%y %H:%M:%S"),
+    ("amex", ["%d %B %Y %I:%M %p"], "%d %B %Y %I:%M %p"),
+]
+
+
+def legacy_parse_date(date_str: str, formats: List[str]) -> Optional[datetime]:
+    """BaseParser._parse_date as it was before DateParser, kept here for comparison."""
+    for fmt in formats:
+        try:
+            dt_obj = datetime.strptime(date_str, fmt)
+            if '%y' in fmt and dt_obj.year < 2000:
+                dt_obj = dt_obj.replace(year=dt_obj.year + 2000)
+            if any(f in fmt for f in ["%d-%m", "%d/%m"]) and dt_obj.year == 1900:
+                dt_obj = dt_obj.replace(year=datetime.now().year)
+            return dt_obj
+        except ValueError as e:
+            print(e)
+            continue
+
+    return None
+
+
+def _date_strings(strftime_format: str, count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [(start + timedelta(minutes=rng.randint(0, 365 * 24 * 60))).strftime(strftime_format) for _ in range(count)]
+
+
+def measure_interleaved(variants: Dict[str, Callable[[str], object]], inputs: List[str], repeat: int) -> List[BenchResult]:
+    """
+    One pass of each variant in turn, `repeat` times, keeping each variant's fastest pass:
+    a busy moment on the machine then slows every variant alike instead of only the one
+    being measured, which would flip the legacy/cold comparison.
+    """
+    best: Dict[str, BenchResult] = {}
+    for _ in range(repeat):
+        for name, func in variants.items():
+            result = measure(name, func, inputs)
+            if name not in best or result.ops_per_sec > best[name].ops_per_sec:
+                best[name] = result
+    return list(best.values())
+
+
+def run_benchmarks(count: int, repeat: int) -> List[BenchResult]:
+    results: List[BenchResult] = []
+    for name, formats, strftime_format in FORMATS:
+        hits = _date_strings(strftime_format, count)
+        misses = [f"{value}x" for value in hits]
+
+        for kind, inputs in (("hit", hits), ("miss", misses)):
+            cold = DateParser(cache_size=0)
+            warm = DateParser(cache_size=len(inputs))
+            for value in inputs:
+                warm.parse(value, formats)
+            results += measure_interleaved({
+                f"legacy[{name}].{kind}": lambda s: legacy_parse_date(s, formats),
+                f"cold[{name}].{kind}": lambda s: cold.parse(s, formats),
+                f"warm[{name}].{kind}": lambda s: warm.parse(s, formats),
+            }, inputs, repeat)
+    return results
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark SMS date parsing.")
+    arg_parser.add_argument("--count", type=int, default=2000, help="Date strings per format")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Passes over each input list")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero if DateParser is slower than the old loop")
+    args = arg_parser.parse_args(argv)
+
+    results = run_benchmarks(args.count, args.repeat)
+    print_results(results)
+
+    by_name = {result.name: result for result in results}
+    slower = []
+    print()
+    for name, _, _ in FORMATS:
+        for kind in ("hit", "miss"):
+            legacy = by_name[f"legacy[{name}].{kind}"].ops_per_sec
+            cold = by_name[f"cold[{name}].{kind}"].ops_per_sec
+            warm = by_name[f"warm[{name}].{kind}"].ops_per_sec
+            print(f"{name + '.' + kind:<24} cold {cold / legacy:>6.1f}x   warm {warm / legacy:>6.1f}x")
+            if cold < legacy:
+                slower.append(f"{name}.{kind}: {cold / legacy:.0%} of the old throughput")
+
+    if args.check and slower:
+        print("\nERROR: DateParser is slower than the strptime loop:")
+        for line in slower:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Time and peak memory of transaction exports (/transactions/export, scripts/export_transactions)
+as the number of exported rows grows.
+
+Seeds --rows transactions into a throwaway SQLite database (as bench_list does), then
+exports the newest n rows for each n in --sizes, in each format:
+
+  - stream[...]: transaction_export.stream_transactions, the chunks going to a sink
+  - all at once[...]: the same rows fetched with .all() and written in one piece, for
+    comparison
+
+Peak memory is measured with tracemalloc in a separate run from the timing. With --check
+the run fails if streaming the largest size takes more than --max-memory-ratio times the
+peak memory of the smallest.
+
+Usage (from the repository root, with the usual .env in place):
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --rows 1000000 --sizes 1000 1000000 --check
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.crud import crud_transaction
+from app.schemas.transaction import ExportFormat, TransactionFilter
+from app.services import transaction_export
+
+from .bench_ingest import seeded_session_factory
+from .bench_list import START, seed_transactions
+
+
+def newest(rows: int, n: int) -> TransactionFilter:
+    """The newest `n` of the seeded rows (their SMS dates are 15 minutes apart)."""
+    return TransactionFilter(date_from=START + timedelta(minutes=15 * (rows - n)))
+
+
+def measure_export(export: Callable[[], int]) -> Tuple[float, float, int]:
+    """(seconds, peak MiB, bytes) of one export; the peak comes from a second, traced run."""
+    started = time.perf_counter()
+    size = export()
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    try:
+        export()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak / 2**20, size
+
+
+def run_benchmarks(rows: int, sizes: List[int], batch_size: int) -> Dict[str, Tuple[float, float, int]]:
+    results: Dict[str, Tuple[float, float, int]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory, _ = seeded_session_factory(Path(tmp) / "bench_export.db")
+        seed_transactions(session_factory, rows)
+
+        for export_format in ExportFormat:
+            for n in sizes:
+                filters = newest(rows, n)
+
+                def stream() -> int:
+                    return sum(len(chunk) for chunk in transaction_export.stream_transactions(
+                        session_factory, export_format, filters, batch_size
+                    ))
+
+                def all_at_once() -> int:
+                    db = session_factory()
+                    try:
+                        found = list(crud_transaction.iter_transactions_for_export(db, filters=filters, batch_size=n))
+                        chunks = transaction_export._csv_chunks if export_format == ExportFormat.CSV \
+                            else transaction_export._ndjson_chunks
+                        return len(b"".join(chunks(found, len(found) or 1)))
+                    finally:
+                        db.close()
+
+                results[f"stream[{export_format.value}, {n:,} rows]"] = measure_export(stream)
+                results[f"all at once[{export_format.value}, {n:,} rows]"] = measure_export(all_at_once)
+    return results
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark streaming transaction exports.")
+    arg_parser.add_argument("--rows", type=int, default=200_000, help="Transactions in the table")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 200_000], help="Rows per export")
+    arg_parser.add_argument("--batch-size", type=int, default=1000, help="Rows per fetch and chunk")
+    arg_parser.add_argument("--max-memory-ratio", type=float, default=2.0,
+                            help="Largest/smallest streaming peak memory allowed by --check")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero if streaming memory grows with the rows")
+    args = arg_parser.parse_args(argv)
+    sizes = sorted(set(min(n, args.rows) for n in args.sizes))
+
+    results = run_benchmarks(args.rows, sizes, args.batch_size)
+    print(f"{'export':<40} {'seconds':>8} {'rows/s':>10} {'MiB out':>8} {'peak MiB':>9}")
+    print("-" * 79)
+    for name, (seconds, peak_mib, size) in results.items():
+        n = int(name.rsplit(", ", 1)[1].split()[0].replace(",", ""))
+        print(f"{name:<40} {seconds:>8.2f} {n / seconds:>10,.0f} {size / 2**20:>8.1f} {peak_mib:>9.2f}")
+
+    problems = []
+    for export_format in ExportFormat:
+        smallest = results[f"stream[{export_format.value}, {sizes[0]:,} rows]"][1]
+        largest = results[f"stream[{export_format.value}, {sizes[-1]:,} rows]"][1]
+        ratio = largest / smallest
+        print(f"\n{export_format.value}: streaming peak memory {smallest:.2f} MiB at {sizes[0]:,} rows, "
+              f"{largest:.2f} MiB at {sizes[-1]:,} rows ({ratio:.1f}x)", end="")
+        if ratio > args.max_memory_ratio:
+            problems.append(f"{export_format.value}: streaming peak memory grows {ratio:.1f}x "
+                            f"(allowed {args.max_memory_ratio:.1f}x)")
+    print()
+
+    if args.check and problems:
+        print("\nERROR: transaction export memory is not flat:")
+        for line in problems:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+SQL statement count and latency of POST /api/v1/transactions/ (receive_sms).
+
+Every SMS from the bank corpora is posted once (new transactions), then once more
+(duplicates). The number of SQL statements each request sends is counted on the engine.
+With --check the run fails if any request goes over the budget below, which guards the
+single-round-trip write path:
+
+  - new transaction: the INSERT ... ON CONFLICT DO NOTHING RETURNING, the monthly spend
+    upsert, plus the outbox INSERT when Telegram is configured
+  - duplicate: the same INSERT, then the existing row (its account and subcategory are
+    mapped from the cached taxonomy)
+
+Placeholder accounts for every card are created before measuring, and account and
+reference lookups are served from the in-process TAXONOMY once warm, so neither is part of
+the budget. The database is a throwaway SQLite file.
+
+Usage (from the repository root, with the usual .env in place):
+    python -m benchmarks.bench_ingest           # print counts and latency
+    python -m benchmarks.bench_ingest --check   # exit 1 if a request exceeds the budget
+"""
+import argparse
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.core.config import settings
+from app.db.base_class import Base
+from app.db.sqlite_profile import apply_sqlite_profile
+from app.main import app
+from app.models import Account, AccountType, Category, SubCategory
+from app.services.account_resolver import AccountResolver
+from app.services.parser_engine import get_parser_engine
+from app.services.parsers.stats import ParserStats
+from app.services.taxonomy import TAXONOMY
+
+from .common import BenchResult, measure, print_results, quiet_stdout
+from .corpora import BANK_CORPORA, build_corpora
+
+STATEMENT_BUDGET = {"new": 3, "duplicate": 2}
+
+
+def seeded_session_factory(path: Path, sqlite_profile: bool = True) -> Tuple[sessionmaker, Counter]:
+    """
+    A throwaway SQLite database with the default category and a statement counter,
+    configured like the app's engine unless `sqlite_profile` is False.
+    """
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if sqlite_profile:
+        apply_sqlite_profile(engine)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    general = Category(name="General")
+    db.add(general)
+    db.flush()
+    db.add(SubCategory(name="Uncategorized", parent_category_id=general.id))
+    db.add(Account(name="Seeded card", account_type=AccountType.CREDIT_CARD, bank_name="AXIS", account_last4="0000"))
+    db.commit()
+    db.close()
+
+    statements: Counter = Counter()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements["total"] += 1
+
+    return session_factory, statements
+
+
+def ingestible_corpora(scale: int) -> Tuple[Dict[str, List[str]], List[dict]]:
+    """
+    The bank corpora reduced to debits the engine turns into transactions (the rest are
+    rejected with a 422), and their parsed data.
+    """
+    corpora = build_corpora(per_bank=scale, negatives=0)
+    engine = get_parser_engine()
+    engine.stats = ParserStats(path=None)  # never touch parser_stats.json
+    with quiet_stdout():
+        parsed = {name: [(sms, engine.parse(sms)) for sms in corpora[name]] for name in BANK_CORPORA}
+    corpora = {name: [sms for sms, parsed_data in items if parsed_data] for name, items in parsed.items()}
+    parsed_items = [parsed_data for items in parsed.values() for _, parsed_data in items if parsed_data]
+    return {name: messages for name, messages in corpora.items() if messages}, parsed_items
+
+
+def create_accounts(session_factory: sessionmaker, parsed_items: List[dict]) -> None:
+    """
+    Creates the placeholder account of every card up front: that happens once per card,
+    not per SMS, so it is kept out of the measurements.
+    """
+    with quiet_stdout():
+        db = session_factory()
+        AccountResolver(db).resolve_many(parsed_items)
+        db.close()
+
+
+def run_benchmarks(scale: int) -> Tuple[List[BenchResult], Dict[str, List[int]]]:
+    corpora, parsed_items = ingestible_corpora(scale)
+    messages = list(dict.fromkeys(sms for messages in corpora.values() for sms in messages))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory, statements = seeded_session_factory(Path(tmp) / "bench_ingest.db")
+
+        def get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[deps.get_db] = get_db
+        TAXONOMY.invalidate()
+        client = TestClient(app)
+        settings.IPHONE_SHORTCUT_API_KEY = settings.IPHONE_SHORTCUT_API_KEY or "bench-ingest"
+        headers = {"X-API-KEY": settings.IPHONE_SHORTCUT_API_KEY}
+
+        # One SMS per bank warms the caches.
+        create_accounts(session_factory, parsed_items)
+        with quiet_stdout():
+            for name in corpora:
+                client.post("/api/v1/transactions/", json={"sms_content": corpora[name][-1]}, headers=headers)
+        warm_up = {messages[-1] for messages in corpora.values()}
+        messages = [sms for sms in messages if sms not in warm_up]
+
+        counts: Dict[str, List[int]] = {"new": [], "duplicate": []}
+        results: List[BenchResult] = []
+        for kind in ("new", "duplicate"):
+            def post(sms: str, kind: str = kind) -> None:
+                before = statements["total"]
+                response = client.post("/api/v1/transactions/", json={"sms_content": sms}, headers=headers)
+                if response.status_code != 200:
+                    raise SystemExit(f"ERROR: receive_sms returned {response.status_code}: {response.text[:200]}")
+                counts[kind].append(statements["total"] - before)
+            results.append(measure(f"receive_sms[{kind}]", post, messages, repeat=1))
+
+        app.dependency_overrides.pop(deps.get_db, None)
+    return results, counts
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Count SQL statements per ingested SMS.")
+    arg_parser.add_argument("--scale", type=int, default=50, help="Messages per bank corpus")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero if a request exceeds the statement budget")
+    args = arg_parser.parse_args(argv)
+
+    results, counts = run_benchmarks(args.scale)
+    print_results(results)
+
+    over_budget = []
+    print()
+    for kind, per_request in counts.items():
+        histogram = ", ".join(f"{n} stmt x{c}" for n, c in sorted(Counter(per_request).items()))
+        print(f"{kind:<10} budget {STATEMENT_BUDGET[kind]}   max {max(per_request)}   ({histogram})")
+        if max(per_request) > STATEMENT_BUDGET[kind]:
+            over_budget.append(f"{kind}: {max(per_request)} statements, budget {STATEMENT_BUDGET[kind]}")
+
+    if args.check and over_budget:
+        print("\nERROR: receive_sms went over its SQL statement budget:")
+        for line in over_budget:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Latency of /transactions/list pages by depth, and the query plans behind them.
+
+Seeds --rows transactions (spread over accounts, categories, statuses, merchants, amounts
+and dates) into a throwaway SQLite database, then fetches pages of --page-size rows:
+
+  - keyset[...]: crud_transaction.get_transactions_page at the start, the middle and the
+    end of the list, following the cursor
+  - offset[...]: the same pages with ORDER BY received_at DESC OFFSET n, as /list used to
+  - filter[...]: the first page of each filter in FILTERS
+
+The SQL each keyset and filtered page sends is captured and run through EXPLAIN QUERY
+PLAN. With --check the run fails if:
+
+  - the unfiltered pages sort (a TEMP B-TREE) or do not walk ix_transactions_received_at_id
+  - any filter scans the transactions table instead of searching one of its indexes
+  - the last page is more than --max-depth-ratio times slower than the first
+
+Usage (from the repository root, with the usual .env in place):
+    python -m benchmarks.bench_list
+    python -m benchmarks.bench_list --rows 200000 --check
+"""
+import argparse
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.crud import crud_transaction
+from app.models import Account, AccountType, Category, SubCategory, Transaction, TransactionStatus
+from app.schemas.transaction import TransactionFilter
+
+from .bench_ingest import seeded_session_factory
+from .common import BenchResult, measure, print_results
+
+INDEX_NAME = "ix_transactions_received_at_id"
+START = datetime(2024, 1, 1)
+MERCHANTS = ["AMAZON", "Swiggy", "zomato@okaxis", "UBER", "BigBasket", "irctc@sbi", "Netflix", "paytm-shop@paytm"]
+STATUSES = [TransactionStatus.PROCESSED] * 8 + [TransactionStatus.PENDING_CATEGORIZATION, TransactionStatus.FAILED]
+
+# The filters the mini app and scripts use, alone and in the combinations they send.
+FILTERS: Dict[str, TransactionFilter] = {
+    "date range": TransactionFilter(date_from=START + timedelta(days=100), date_to=START + timedelta(days=107)),
+    "account": TransactionFilter(account_id=2),
+    "subcategory": TransactionFilter(subcategory_id=3),
+    "category": TransactionFilter(category_id=2),
+    "status": TransactionFilter(status=TransactionStatus.FAILED),
+    "amount range": TransactionFilter(amount_min=500, amount_max=510),
+    "merchant": TransactionFilter(merchant="zom"),
+    "account + date range": TransactionFilter(account_id=2, date_from=START + timedelta(days=100), date_to=START + timedelta(days=107)),
+    "category + date range": TransactionFilter(category_id=2, date_from=START + timedelta(days=100), date_to=START + timedelta(days=107)),
+    "status + account": TransactionFilter(status=TransactionStatus.PENDING_CATEGORIZATION, account_id=3),
+}
+
+
+def seed_transactions(session_factory: sessionmaker, rows: int) -> None:
+    """
+    `rows` transactions, received several per second like a bulk backfill, oldest first,
+    15 minutes apart in SMS time, over 5 accounts and 3 categories of 4 subcategories.
+    """
+    db = session_factory()
+    for n in range(4):
+        db.add(Account(name=f"Card {n}", account_type=AccountType.CREDIT_CARD, bank_name="HDFC", account_last4=f"{n + 1:04d}"))
+    for n in range(3):
+        category = Category(name=f"Category {n}")
+        db.add(category)
+        db.flush()
+        for m in range(4):
+            db.add(SubCategory(name=f"Subcategory {n}.{m}", parent_category_id=category.id))
+    db.commit()
+    account_ids = [account_id for account_id, in db.query(Account.id).order_by(Account.id)]
+    subcategory_ids = [subcategory_id for subcategory_id, in db.query(SubCategory.id).order_by(SubCategory.id)]
+    rng = random.Random(42)
+    batch = []
+    for i in range(rows):
+        merchant = rng.choice(MERCHANTS)
+        batch.append(dict(
+            unique_hash=f"bench-{i:012d}", raw_sms_content=f"Spent Rs.{i % 997}.00 at {merchant}",
+            amount=float(rng.randrange(5000)), merchant_vpa=merchant,
+            received_at=START + timedelta(seconds=i // 4), transaction_datetime_from_sms=START + timedelta(minutes=15 * i),
+            status=rng.choice(STATUSES), subcategory_id=rng.choice(subcategory_ids), account_id=rng.choice(account_ids),
+        ))
+        if len(batch) == 10_000:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    db.commit()
+    db.close()
+
+
+def cursors_at(db: Session, depths: Dict[str, int], page_size: int) -> Dict[str, Optional[str]]:
+    """The cursor that starts each page of `depths` (offset in rows), found by walking the list."""
+    wanted = {offset: name for name, offset in depths.items()}
+    cursors: Dict[str, Optional[str]] = {}
+    cursor, offset = None, 0
+    while True:
+        if offset in wanted:
+            cursors[wanted[offset]] = cursor
+        _, cursor = crud_transaction.get_transactions_page(db, limit=page_size, cursor=cursor, include_relations=False)
+        offset += page_size
+        if cursor is None or offset > max(depths.values()):
+            return cursors
+
+
+def explain_keyset_page(
+    db: Session, cursor: Optional[str], page_size: int, filters: Optional[TransactionFilter] = None
+) -> List[str]:
+    """EXPLAIN QUERY PLAN of the SELECT /transactions/list sends for this page."""
+    statements: List[Tuple[str, tuple]] = []
+    bind = db.get_bind()
+
+    def capture(conn, cursor_, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", capture)
+    try:
+        crud_transaction.get_transactions_page(db, limit=page_size, cursor=cursor, filters=filters, projected=True)
+    finally:
+        event.remove(bind, "before_cursor_execute", capture)
+    # The transactions SELECT (a category filter first looks up its subcategory ids).
+    statement, parameters = next((st, params) for st, params in statements if "FROM transactions" in st)
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def run_benchmarks(
+    rows: int, page_size: int, repeat: int
+) -> Tuple[List[BenchResult], Dict[str, List[str]], Dict[str, List[str]]]:
+    pages = rows // page_size
+    depths = {"first": 0, "middle": (pages // 2) * page_size, "last": (pages - 1) * page_size}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory, _ = seeded_session_factory(Path(tmp) / "bench_list.db")
+        seed_transactions(session_factory, rows)
+        db = session_factory()
+        db.connection().exec_driver_sql("ANALYZE")
+        cursors = cursors_at(db, depths, page_size)
+
+        # A fresh session per fetch, without the relation loads: this times the query itself.
+        def keyset_page(cursor: Optional[str], filters: Optional[TransactionFilter] = None) -> None:
+            page_db = session_factory()
+            try:
+                crud_transaction.get_transactions_page(
+                    page_db, limit=page_size, cursor=cursor, filters=filters, include_relations=False
+                )
+            finally:
+                page_db.close()
+
+        def offset_page(offset: int) -> None:
+            page_db = session_factory()
+            try:
+                page_db.query(Transaction).order_by(Transaction.received_at.desc()).offset(offset).limit(page_size).all()
+            finally:
+                page_db.close()
+
+        results: List[BenchResult] = []
+        for name in depths:
+            results.append(measure(f"keyset[{name} page]", keyset_page, [cursors[name]] * repeat))
+        for name, offset in depths.items():
+            results.append(measure(f"offset[{name} page]", offset_page, [offset] * repeat))
+        for name, filters in FILTERS.items():
+            results.append(measure(f"filter[{name}]", lambda _: keyset_page(None, filters), range(repeat)))
+        plans = {name: explain_keyset_page(db, cursors[name], page_size) for name in ("first", "last")}
+        filter_plans = {name: explain_keyset_page(db, None, page_size, filters) for name, filters in FILTERS.items()}
+        db.close()
+    return results, plans, filter_plans
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark /transactions/list pages at increasing depth.")
+    arg_parser.add_argument("--rows", type=int, default=100_000, help="Transactions in the table")
+    arg_parser.add_argument("--page-size", type=int, default=50)
+    arg_parser.add_argument("--repeat", type=int, default=50, help="Fetches per page")
+    arg_parser.add_argument("--max-depth-ratio", type=float, default=3.0, help="Last/first page p50 allowed by --check")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero on a bad plan or depth-dependent latency")
+    args = arg_parser.parse_args(argv)
+
+    results, plans, filter_plans = run_benchmarks(args.rows, args.page_size, args.repeat)
+    print_results(results)
+
+    problems = []
+    print()
+    for name, plan in plans.items():
+        print(f"keyset {name} page plan: {' | '.join(plan)}")
+        if not any(INDEX_NAME in step for step in plan) or any("TEMP B-TREE" in step for step in plan):
+            problems.append(f"the {name} page does not walk {INDEX_NAME}")
+    for name, plan in filter_plans.items():
+        print(f"filter[{name}] plan: {' | '.join(plan)}")
+        if any(step.startswith("SCAN transactions") for step in plan):
+            problems.append(f"filter[{name}] scans the transactions table")
+    by_name = {result.name: result for result in results}
+    ratio = by_name["keyset[last page]"].p50_us / by_name["keyset[first page]"].p50_us
+    print(f"keyset last/first page p50: {ratio:.1f}x")
+    if ratio > args.max_depth_ratio:
+        problems.append(f"the last page is {ratio:.1f}x slower than the first (allowed {args.max_depth_ratio:.1f}x)")
+
+    if args.check and problems:
+        print("\nERROR: /transactions/list pagination or filtering regressed:")
+        for line in problems:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
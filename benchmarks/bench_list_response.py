@@ -0,0 +1,127 @@
+"""
+Cost of building a /transactions/list response body, per page size.
+
+Seeds --rows transactions into a throwaway SQLite database (as bench_list does), then
+builds one page of each size in --sizes, from the query to the JSON bytes, both ways:
+
+  - schemas[...]: ORM objects with their account and subcategory loaded, a TransactionInDB
+    per row (_map_transaction_to_response_schema), then what FastAPI does with the
+    returned TransactionPage: validate it against the response_model and dump it to JSON
+  - rows[...]: the projected columns (get_transactions_page(projected=True)), a dict per
+    row (_map_row_to_response), then FastJSONResponse (orjson when installed)
+
+Peak memory of each is measured separately with tracemalloc. With --check the run fails
+if the two bodies differ, or if the rows path is not at least --min-speedup times faster
+at every size.
+
+Usage (from the repository root, with the usual .env in place):
+    python -m benchmarks.bench_list_response
+    python -m benchmarks.bench_list_response --sizes 1000 10000 --check
+"""
+import argparse
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from app.api.responses import FastJSONResponse, orjson
+from app.api.v1.endpoints.transactions import _map_row_to_response, _map_transaction_to_response_schema
+from app.crud import crud_transaction
+from app.schemas.transaction import TransactionPage
+
+from .bench_ingest import seeded_session_factory
+from .bench_list import seed_transactions
+from .common import BenchResult, measure, print_results
+
+PAGE_ADAPTER = TypeAdapter(TransactionPage)
+
+
+def peak_memory_kib(build: Callable[[], bytes]) -> float:
+    tracemalloc.start()
+    try:
+        build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run_benchmarks(
+    rows: int, sizes: List[int], repeat: int
+) -> Tuple[List[BenchResult], Dict[str, float], Dict[int, bool]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory, _ = seeded_session_factory(Path(tmp) / "bench_list_response.db")
+        seed_transactions(session_factory, rows)
+
+        def schemas_body(size: int) -> bytes:
+            db = session_factory()
+            try:
+                transactions, next_cursor = crud_transaction.get_transactions_page(db, limit=size, include_relations=True)
+                page = TransactionPage(
+                    items=[_map_transaction_to_response_schema(tx) for tx in transactions], next_cursor=next_cursor
+                )
+                return PAGE_ADAPTER.dump_json(PAGE_ADAPTER.validate_python(page))
+            finally:
+                db.close()
+
+        def rows_body(size: int) -> bytes:
+            db = session_factory()
+            try:
+                page_rows, next_cursor = crud_transaction.get_transactions_page(db, limit=size, projected=True)
+                return FastJSONResponse(
+                    {"items": [_map_row_to_response(row) for row in page_rows], "next_cursor": next_cursor}
+                ).body
+            finally:
+                db.close()
+
+        results: List[BenchResult] = []
+        memory: Dict[str, float] = {}
+        same_body: Dict[int, bool] = {}
+        for size in sizes:
+            runs = max(3, repeat * 1000 // size)
+            results.append(measure(f"schemas[{size} rows]", schemas_body, [size] * runs))
+            results.append(measure(f"rows[{size} rows]", rows_body, [size] * runs))
+            memory[f"schemas[{size} rows]"] = peak_memory_kib(lambda: schemas_body(size))
+            memory[f"rows[{size} rows]"] = peak_memory_kib(lambda: rows_body(size))
+            same_body[size] = json.loads(schemas_body(size)) == json.loads(rows_body(size))
+    return results, memory, same_body
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark building /transactions/list response bodies.")
+    arg_parser.add_argument("--rows", type=int, default=20_000, help="Transactions in the table")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Rows per response")
+    arg_parser.add_argument("--repeat", type=int, default=20, help="Builds of a 1000-row page (scaled by size)")
+    arg_parser.add_argument("--min-speedup", type=float, default=2.5, help="schemas/rows p50 required by --check")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero if the bodies differ or the rows path is slow")
+    args = arg_parser.parse_args(argv)
+
+    results, memory, same_body = run_benchmarks(args.rows, args.sizes, args.repeat)
+    print_results(results)
+    print(f"\nJSON: {'orjson' if orjson is not None else 'json (orjson is not installed)'}")
+
+    problems = []
+    by_name = {result.name: result for result in results}
+    for size in args.sizes:
+        schemas, rows = f"schemas[{size} rows]", f"rows[{size} rows]"
+        speedup = by_name[schemas].p50_us / by_name[rows].p50_us
+        print(f"{size:>6} rows: {speedup:.1f}x faster, peak memory {memory[schemas]:,.0f} KiB -> {memory[rows]:,.0f} KiB")
+        if not same_body[size]:
+            problems.append(f"the {size}-row bodies differ")
+        if speedup < args.min_speedup:
+            problems.append(f"{size} rows: only {speedup:.1f}x faster (required {args.min_speedup:.1f}x)")
+
+    if args.check and problems:
+        print("\nERROR: the /transactions/list response fast path regressed:")
+        for line in problems:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Throughput benchmark for the SMS parsing hot path.
+
+Measures messages/sec and p50/p99 latency of:
+  - ParserEngine.run over every bank corpus and the negative corpus
+  - ParserEngine._get_flow_type and SMSClassifier.classify over all corpora
+  - every parser's match path (its own bank's SMS) and miss path (everything else)
+
+Account resolution runs against an in-memory SQLite database, so the numbers include
+the account lookup but never touch the real database.
+
+Usage (from the repository root, with the usual .env in place):
+    python -m benchmarks.bench_parsers                   # print results
+    python -m benchmarks.bench_parsers --check           # exit 1 on regression vs. baseline.json
+    python -m benchmarks.bench_parsers --update-baseline # store this run as the new baseline
+"""
+import argparse
+import functools
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base_class import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.services.account_resolver import AccountResolver
+from app.services.parser_engine import ParserEngine
+from app.services.parsers.stats import ParserStats
+from app.services.taxonomy import TaxonomyCache
+
+from .common import (
+    BenchResult, calibration_ops_per_sec, compare_to_baseline, load_baseline, measure, print_results, quiet_stdout,
+    save_baseline,
+)
+from .corpora import BANK_CORPORA, build_corpora
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+def _in_memory_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def _check_corpora(parser_engine: ParserEngine, corpora: Dict[str, List[str]]) -> None:
+    """Fails loudly if a generator drifted away from what its parser accepts."""
+    by_bank = {parser.bank_name: parser for parser in parser_engine.parsers}
+    for corpus_name, (bank_name, _) in BANK_CORPORA.items():
+        parser = by_bank[bank_name]
+        sample = corpora[corpus_name][0]
+        if not parser.parse(sample):
+            raise SystemExit(f"ERROR: corpus '{corpus_name}' is not parsed by {parser.__class__.__name__}: {sample!r}")
+
+
+def run_benchmarks(scale: int, repeat: int) -> Tuple[List[BenchResult], Dict[str, float]]:
+    """The results, and the calibration measured right before each of them (by name)."""
+    corpora = build_corpora(per_bank=scale, negatives=scale * 10)
+    db = _in_memory_session()
+    parser_engine = ParserEngine(stats=ParserStats(path=None))  # count in memory, never touch parser_stats.json
+    run = functools.partial(parser_engine.run, accounts=AccountResolver(db_session=db, cache=TaxonomyCache()))
+    _check_corpora(parser_engine, corpora)
+
+    results: List[BenchResult] = []
+    calibrations: Dict[str, float] = {}
+    everything = [sms for corpus in corpora.values() for sms in corpus]
+
+    def timed(name: str, func, inputs: List[str]) -> None:
+        calibrations[name] = calibration_ops_per_sec()
+        results.append(measure(name, func, inputs, repeat))
+
+    # Warm the account table so the timed runs measure lookups, not placeholder inserts.
+    with quiet_stdout():
+        for sms in everything:
+            run(sms)
+
+    for corpus_name, corpus in corpora.items():
+        timed(f"engine.run[{corpus_name}]", run, corpus)
+    timed("engine.run[all]", run, everything)
+    timed("engine._get_flow_type[all]", parser_engine._get_flow_type, everything)
+    timed("classifier.classify[all]", parser_engine.classifier.classify, everything)
+
+    for parser in parser_engine.parsers:
+        own = [sms for name, (bank_name, _) in BANK_CORPORA.items() if bank_name == parser.bank_name for sms in corpora[name]]
+        others = [sms for name, corpus in corpora.items()
+                  if name == "negative" or BANK_CORPORA[name][0] != parser.bank_name for sms in corpus]
+        timed(f"parser[{parser.bank_name}].match", parser.parse, own)
+        timed(f"parser[{parser.bank_name}].miss", parser.parse, others)
+
+    db.close()
+    return results, calibrations
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark the SMS parsers.")
+    arg_parser.add_argument("--scale", type=int, default=200, help="Messages per bank corpus (negatives are 10x)")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Passes over each corpus")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero if a benchmark regressed")
+    arg_parser.add_argument("--update-baseline", action="store_true", help=f"Write results to {BASELINE_PATH.name}")
+    arg_parser.add_argument("--tolerance", type=float, default=0.30, help="Allowed throughput drop (0.30 = 30%%)")
+    args = arg_parser.parse_args(argv)
+
+    results, calibrations = run_benchmarks(args.scale, args.repeat)
+    print_results(results)
+
+    if args.update_baseline:
+        # A lucky fast run would make every later --check fail; store the median of three.
+        runs = [(results, calibrations)] + [run_benchmarks(args.scale, args.repeat) for _ in range(2)]
+        results, calibrations = [], {}
+        for candidates in zip(*(run_results for run_results, _ in runs)):
+            name = candidates[0].name
+            ranked = sorted(
+                (result.ops_per_sec / run_calibrations[name], result, run_calibrations[name])
+                for result, (_, run_calibrations) in zip(candidates, runs)
+            )
+            _, median, calibrations[name] = ranked[1]
+            results.append(median)
+        save_baseline(BASELINE_PATH, results, calibrations)
+        print(f"\nINFO: Baseline written to {BASELINE_PATH}")
+        return 0
+
+    if args.check:
+        baseline = load_baseline(BASELINE_PATH)
+        if not baseline:
+            print(f"ERROR: No baseline at {BASELINE_PATH}, run with --update-baseline first.")
+            return 1
+        regressions = compare_to_baseline(results, baseline, calibrations, args.tolerance)
+        if regressions:
+            # Confirm with a second run: only benchmarks that regress twice in a row count.
+            print(f"\nINFO: {len(regressions)} benchmark(s) below baseline, re-running to confirm...")
+            suspects = {line.split(":", 1)[0] for line in regressions}
+            rerun, rerun_calibrations = run_benchmarks(args.scale, args.repeat)
+            rerun = [r for r in rerun if r.name in suspects]
+            regressions = compare_to_baseline(rerun, baseline, rerun_calibrations, args.tolerance)
+        if regressions:
+            print("\nERROR: Throughput regressed:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nINFO: No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Latency of GET /transactions/search (crud_transaction.search_transactions) on a large table.
+
+Seeds --rows transactions, with SMS text from the bank corpora, into a throwaway SQLite
+database built like the migrated one (FTS5 index and triggers included), then runs each
+query of QUERIES through:
+
+  - fts[...]: search_transactions, the newest SEARCH_CANDIDATES matches of the FTS5
+    index ranked by bm25
+  - like[...]: the same words with LIKE over the three columns, newest first; fast while
+    matches are dense near the top of the table, a full scan when they are rare or absent
+
+With --check the run fails if a search does not use the FTS index, or if its p50 is over
+--max-ms.
+
+Usage (from the repository root, with the usual .env in place):
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --rows 500000 --check
+"""
+import argparse
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, insert, or_
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.crud import crud_transaction
+from app.models import Account, SubCategory, Transaction
+from app.schemas.transaction import TransactionFilter
+
+from .bench_ingest import seeded_session_factory
+from .common import BenchResult, measure, print_results
+from .corpora import BANK_CORPORA, MERCHANTS, negative_sms
+
+START = datetime(2025, 1, 1)
+
+# (search box input, filters)
+QUERIES: Dict[str, Tuple[str, Optional[TransactionFilter]]] = {
+    "merchant": ("swiggy", None),
+    "merchant prefix": ("apol", None),
+    "two words": ("apollo pharmacy", None),
+    "vpa": ("okaxis", None),
+    "merchant in March": ("swiggy", TransactionFilter(date_from=datetime(2025, 3, 1), date_to=datetime(2025, 3, 31, 23, 59))),
+    "description": ("birthday", None),
+    "common word": ("debited", None),
+    "no match": ("xyzzy", None),
+}
+
+
+def seed_transactions(session_factory: sessionmaker, rows: int) -> None:
+    """`rows` transactions with corpus SMS text; one in 500 has a description."""
+    db = session_factory()
+    subcategory_id = db.query(SubCategory.id).scalar()
+    account_id = db.query(Account.id).scalar()
+    rng = random.Random(7)
+    generators = [generator for _, generator in BANK_CORPORA.values()] + [negative_sms]
+    batch = []
+    for i in range(rows):
+        batch.append(dict(
+            unique_hash=f"search-{i:012d}", raw_sms_content=rng.choice(generators)(rng),
+            merchant_vpa=rng.choice(MERCHANTS), description="birthday dinner" if i % 500 == 0 else None,
+            amount=float(rng.randrange(5000)), transaction_datetime_from_sms=START + timedelta(minutes=2 * i),
+            subcategory_id=subcategory_id, account_id=account_id,
+        ))
+        if len(batch) == 10_000:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    db.commit()
+    db.close()
+
+
+def like_search(db: Session, text: str, filters: Optional[TransactionFilter], limit: int) -> list:
+    searched = (Transaction.merchant_vpa, Transaction.description, Transaction.raw_sms_content)
+    query = db.query(Transaction).filter(
+        *(or_(*(column.like(f"%{term}%") for column in searched)) for term in crud_transaction.search_terms(text))
+    )
+    if filters is not None:
+        query = query.filter(*crud_transaction._filter_conditions(filters))
+    return query.order_by(Transaction.received_at.desc()).limit(limit).all()
+
+
+def explain_search(db: Session, text: str, filters: Optional[TransactionFilter], limit: int) -> List[str]:
+    """EXPLAIN QUERY PLAN of the SELECT search_transactions sends."""
+    statements: List[Tuple[str, tuple]] = []
+    bind = db.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", capture)
+    try:
+        crud_transaction.search_transactions(db, text=text, filters=filters, limit=limit, include_relations=False)
+    finally:
+        event.remove(bind, "before_cursor_execute", capture)
+    statement, parameters = statements[0]
+    return [row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+
+def run_benchmarks(rows: int, limit: int, repeat: int) -> Tuple[List[BenchResult], Dict[str, List[str]], Dict[str, int]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory, _ = seeded_session_factory(Path(tmp) / "bench_search.db")
+        seed_transactions(session_factory, rows)
+        db = session_factory()
+
+        def fts(query: Tuple[str, Optional[TransactionFilter]]) -> None:
+            crud_transaction.search_transactions(db, text=query[0], filters=query[1], limit=limit)
+            db.expunge_all()
+
+        def like(query: Tuple[str, Optional[TransactionFilter]]) -> None:
+            like_search(db, query[0], query[1], limit)
+            db.expunge_all()
+
+        results: List[BenchResult] = []
+        for name, query in QUERIES.items():
+            results.append(measure(f"fts[{name}]", fts, [query] * repeat))
+        for name, query in QUERIES.items():
+            results.append(measure(f"like[{name}]", like, [query] * max(1, repeat // 10)))
+        plans = {name: explain_search(db, text, filters, limit) for name, (text, filters) in QUERIES.items()}
+        hits = {
+            name: len(crud_transaction.search_transactions(db, text=text, filters=filters, limit=limit, include_relations=False))
+            for name, (text, filters) in QUERIES.items()
+        }
+        db.close()
+    return results, plans, hits
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark full-text transaction search.")
+    arg_parser.add_argument("--rows", type=int, default=300_000, help="Transactions in the table")
+    arg_parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    arg_parser.add_argument("--repeat", type=int, default=30, help="Runs per FTS query (LIKE runs a tenth)")
+    arg_parser.add_argument("--max-ms", type=float, default=75.0, help="p50 per search allowed by --check")
+    arg_parser.add_argument("--check", action="store_true", help="Exit non-zero if a search is slow or skips the FTS index")
+    args = arg_parser.parse_args(argv)
+
+    results, plans, hits = run_benchmarks(args.rows, args.limit, args.repeat)
+    print_results(results)
+
+    problems = []
+    print()
+    by_name = {result.name: result for result in results}
+    for name, plan in plans.items():
+        print(f"fts[{name}] ({hits[name]} hits) plan: {' | '.join(plan)}")
+        if not any("VIRTUAL TABLE" in step for step in plan):
+            problems.append(f"fts[{name}] does not use the FTS index")
+        p50_ms = by_name[f"fts[{name}]"].p50_us / 1000
+        if p50_ms > args.max_ms:
+            problems.append(f"fts[{name}] p50 {p50_ms:.1f} ms exceeds {args.max_ms:.1f} ms")
+
+    if args.check and problems:
+        print("\nERROR: transaction search regressed:")
+        for line in problems:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Per-message latency of Telegram sendMessage calls against a local fake Bot API server.
+
+Compares:
+  - a new httpx.AsyncClient per message, as telegram_notifier used to do
+  - one pooled, keep-alive client reused for every message
+  - the full TelegramSender queue (pooled client, rate limits set out of the way)
+
+The fake server runs in-process on 127.0.0.1, so the gap shown here is only connection
+setup and client construction; against api.telegram.org every new client also pays DNS,
+a TLS handshake and a real round trip. Pass --url to point at another fake server (for
+example one behind TLS).
+
+Usage (from the repository root):
+    python -m benchmarks.bench_telegram
+    python -m benchmarks.bench_telegram --count 500 --url https://localhost:8443/botTEST
+"""
+import argparse
+import asyncio
+import itertools
+import socket
+import sys
+import threading
+import time
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from app.services.telegram_sender import TelegramSender
+
+from .common import BenchResult, percentile, print_results
+
+PAYLOAD = {"chat_id": 1, "text": "*✅ New Transaction Captured*", "parse_mode": "MarkdownV2"}
+
+
+def _fake_bot_api() -> FastAPI:
+    fake = FastAPI()
+    message_ids = itertools.count(1)
+
+    @fake.post("/bot{token}/{method}")
+    async def call(token: str, method: str) -> dict:
+        return {"ok": True, "result": {"message_id": next(message_ids)}}
+
+    return fake
+
+
+def _start_fake_server() -> str:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(_fake_bot_api(), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise SystemExit("ERROR: fake Bot API server did not start")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/botTEST"
+
+
+async def _measure(name: str, send: Callable[[], Awaitable[object]], count: int) -> BenchResult:
+    for _ in range(min(10, count)):
+        await send()
+    latencies_us: List[float] = []
+    started = time.perf_counter()
+    for _ in range(count):
+        start = time.perf_counter_ns()
+        await send()
+        latencies_us.append((time.perf_counter_ns() - start) / 1000)
+    elapsed = time.perf_counter() - started
+    latencies_us.sort()
+    return BenchResult(
+        name=name,
+        count=count,
+        ops_per_sec=count / elapsed,
+        p50_us=percentile(latencies_us, 0.50),
+        p99_us=percentile(latencies_us, 0.99),
+    )
+
+
+async def run_benchmarks(url: str, count: int) -> List[BenchResult]:
+    results: List[BenchResult] = []
+
+    async def per_message_client() -> None:
+        async with httpx.AsyncClient() as client:
+            (await client.post(f"{url}/sendMessage", json=PAYLOAD)).raise_for_status()
+    results.append(await _measure("sendMessage[new client per message]", per_message_client, count))
+
+    async with httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0)) as pooled:
+        async def pooled_client() -> None:
+            (await pooled.post(f"{url}/sendMessage", json=PAYLOAD)).raise_for_status()
+        results.append(await _measure("sendMessage[pooled client]", pooled_client, count))
+
+    sender = TelegramSender(url, global_rate=1e9, chat_rate=1e9, chat_burst=1e9)
+    await sender.start()
+    try:
+        async def through_sender() -> None:
+            if await sender.send_message(dict(PAYLOAD)) is None:
+                raise RuntimeError("TelegramSender failed to send")
+        results.append(await _measure("sendMessage[TelegramSender]", through_sender, count))
+    finally:
+        await sender.stop()
+    return results
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark Telegram client setup cost against a fake Bot API.")
+    arg_parser.add_argument("--count", type=int, default=300, help="Messages per variant")
+    arg_parser.add_argument("--url", help="Bot API base URL incl. /bot<token> (default: start a local fake server)")
+    args = arg_parser.parse_args(argv)
+
+    url = args.url or _start_fake_server()
+    results = asyncio.run(run_benchmarks(url, args.count))
+    print_results(results)
+
+    fresh, pooled = results[0], results[1]
+    print(f"\nPooled client: p50 {fresh.p50_us / pooled.p50_us:.1f}x lower latency than a new client per message.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Small timing helpers shared by the benchmark scripts."""
+import contextlib
+import gc
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+
+@dataclass
+class BenchResult:
+    name: str
+    count: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+
+    def row(self) -> str:
+        return f"{self.name:<48} {self.count:>8} {self.ops_per_sec:>14,.0f} {self.p50_us:>10.2f} {self.p99_us:>10.2f}"
+
+
+HEADER = f"{'benchmark':<48} {'n':>8} {'ops/sec':>14} {'p50 µs':>10} {'p99 µs':>10}"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+@contextlib.contextmanager
+def quiet_stdout():
+    """Parsers and the engine print DEBUG lines; keep the terminal quiet but pay the same cost."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def measure(name: str, func: Callable[[str], object], inputs: Iterable[str], repeat: int = 1) -> BenchResult:
+    """
+    Calls `func` once per input, `repeat` passes over the inputs.
+
+    Latency percentiles use every call; throughput comes from the fastest pass, which is
+    far less sensitive to a noisy neighbour than the mean.
+    """
+    inputs = list(inputs)
+    latencies_ns: List[int] = []
+    best_pass_ns = None
+    perf_counter_ns = time.perf_counter_ns
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with quiet_stdout():
+            for _ in range(repeat):
+                pass_ns = 0
+                for item in inputs:
+                    start = perf_counter_ns()
+                    func(item)
+                    elapsed = perf_counter_ns() - start
+                    latencies_ns.append(elapsed)
+                    pass_ns += elapsed
+                best_pass_ns = pass_ns if best_pass_ns is None else min(best_pass_ns, pass_ns)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    latencies_us = sorted(ns / 1000 for ns in latencies_ns)
+    return BenchResult(
+        name=name,
+        count=len(latencies_ns),
+        ops_per_sec=len(inputs) / (best_pass_ns / 1e9) if best_pass_ns else float("inf"),
+        p50_us=percentile(latencies_us, 0.50),
+        p99_us=percentile(latencies_us, 0.99),
+    )
+
+
+def calibration_ops_per_sec(iterations: int = 200_000) -> float:
+    """
+    Throughput of a fixed pure-Python workload on this machine.
+
+    Baselines are stored relative to it so a run on a slower laptop does not read as a
+    regression of the code itself.
+    """
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        acc = 0
+        for i in range(iterations):
+            acc += len(str(i)) * (i & 7)
+        best = min(best, time.perf_counter() - start)
+    return iterations / best
+
+
+def print_results(results: Iterable[BenchResult]) -> None:
+    print(HEADER)
+    print("-" * len(HEADER))
+    for result in results:
+        print(result.row())
+
+
+def load_baseline(path: Path) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, results: List[BenchResult], calibrations: Dict[str, float]) -> None:
+    """`calibrations` maps each result's name to the calibration measured right before it."""
+    payload = {
+        "calibration_ops_per_sec": statistics.median(calibrations.values()),
+        "results": {r.name: {**asdict(r), "relative_ops": r.ops_per_sec / calibrations[r.name]} for r in results},
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def compare_to_baseline(
+    results: List[BenchResult], baseline: Dict[str, dict], calibrations: Dict[str, float], tolerance: float
+) -> List[str]:
+    """
+    Returns a message for every benchmark whose normalized throughput dropped more than
+    `tolerance`. Each result is normalized by its own calibration: on a shared or throttled
+    machine the speed drifts within a run, and one calibration at the start would turn
+    that drift into false regressions (or hide real ones).
+    """
+    regressions = []
+    stored = baseline.get("results", {})
+    for result in results:
+        if result.name not in stored:
+            continue
+        expected = stored[result.name]["relative_ops"]
+        actual = result.ops_per_sec / calibrations[result.name]
+        if actual < expected * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: {actual / expected:.0%} of baseline throughput "
+                f"(allowed >= {1 - tolerance:.0%})"
+            )
+    return regressions
@@ -0,0 +1,153 @@
+"""
+Deterministic synthetic SMS corpora for the parser benchmarks.
+
+Every bank corpus follows the exact wording the matching parser in
+`app/services/parsers/` expects, with varied amounts, merchants, card numbers and
+dates. The negative corpus is the noise a phone actually receives: OTPs, promos,
+deliveries, credits and balance alerts, including ones that mention bank names.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+MERCHANTS = [
+    "SWIGGY", "ZOMATO", "AMAZON PAY INDIA", "FLIPKART", "UBER INDIA", "OLA CABS", "BIGBASKET",
+    "IRCTC", "BOOKMYSHOW", "RELIANCE SMART", "DMART", "MYNTRA", "NETFLIX", "SPOTIFY", "APOLLO PHARMACY",
+    "STARBUCKS", "DECATHLON", "INDIAN OIL", "AIRTEL", "JIO PREPAID",
+]
+VPAS = [
+    "swiggy@icici", "zomatoorder@hdfcbank", "paytmqr281005050101@paytm", "merchant@okaxis",
+    "bharatpe90057@yesbank", "q123456789@ybl", "credclub@axisb", "jio@sbi",
+]  # FederalBankParser stops the VPA at the first ".", so none contain one
+
+def _amount(rng: random.Random, with_commas: bool = True) -> str:
+    value = rng.choice([rng.randint(10, 999), rng.randint(1000, 99999)]) + rng.choice([0, 0.5, 0.99, 0.25])
+    return f"{value:,.2f}" if with_commas else f"{value:.2f}"
+
+
+def _last4(rng: random.Random) -> str:
+    return f"{rng.randint(0, 9999):04d}"
+
+
+def _when(rng: random.Random) -> datetime:
+    return datetime(2025, 1, 1) + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+
+
+def hdfc_card(rng):
+    when = _when(rng)
+    return (f"Spent Rs.{_amount(rng)} On HDFC Bank Card {_last4(rng)} At {rng.choice(MERCHANTS)} "
+            f"On {when:%Y-%m-%d}:{when:%H:%M:%S} Not You? Call 18002586161/SMS BLOCK DC {_last4(rng)} to 7308080808")
+
+
+def hdfc_upi(rng):
+    when = _when(rng)
+    return (f"Amt Sent Rs.{_amount(rng)}\nFrom HDFC Bank A/C *{_last4(rng)}\nTo {rng.choice(MERCHANTS)}\n"
+            f"On {when:%d-%m}\nRef {rng.randint(10**11, 10**12 - 1)}\nNot You?\nCall 18002586161/SMS BLOCK UPI to 7308080808")
+
+
+def federal_upi(rng):
+    when = _when(rng)
+    return (f"Rs {_amount(rng)} debited via UPI on {when:%d-%m-%Y} {when:%H:%M:%S} to VPA {rng.choice(VPAS)}.Ref No "
+            f"{rng.randint(10**11, 10**12 - 1)}.Small txns?Use UPI Lite!-Federal Bank")
+
+
+def federal_fednet(rng):
+    when = _when(rng)
+    return (f"Rs.{_amount(rng)} debited from your A/c XX{_last4(rng)} on {when:%d%b%Y} {when:%H:%M:%S} "
+            f"through FEDNET. Not you? Call 18004251199 -Federal Bank")
+
+
+def sbi_card(rng):
+    when = _when(rng)
+    return (f"Rs.{_amount(rng)} spent on your SBI Credit Card ending {_last4(rng)} at {rng.choice(MERCHANTS)} "
+            f"on {when:%d/%m/%y}. Trxn. not done by you? Report at https://sbicard.com/Dispute")
+
+
+def icici_card(rng):
+    when = _when(rng)
+    return (f"{rng.choice(['INR', 'Rs'])} {_amount(rng)} spent using ICICI Bank Card XX{_last4(rng)} on "
+            f"{when.day}-{when:%b-%y} on {rng.choice(MERCHANTS)}. Avl Limit: INR {_amount(rng)}. "
+            f"If not you, call 1800 2662/SMS BLOCK {_last4(rng)} to 9215676766.")
+
+
+def idfc_card(rng):
+    when = _when(rng)
+    return (f"INR {_amount(rng)} spent on your IDFC FIRST Bank Credit Card ending XX{_last4(rng)} at "
+            f"{rng.choice(MERCHANTS)} on {when:%d %b %Y} at {when:%I:%M %p}. Available Limit: INR {_amount(rng)}. "
+            f"If not done by you, call 1800 10 888 to block your card")
+
+
+def onecard(rng):
+    verb = rng.choice(["paid a bill", "made a rental payment"])
+    return (f"You've {verb} for Rs. {_amount(rng)} at {rng.choice(MERCHANTS)} on card ending XX{_last4(rng)} "
+            f"using OneCard. Not you? Call 080-69879888")
+
+
+def axis_card(rng):
+    when = _when(rng)
+    return (f"Spent\nCard no. XX{_last4(rng)}\nINR {_amount(rng, with_commas=False)}\n{when:%d-%m-%y} {when:%H:%M:%S}\n"
+            f"{rng.choice(MERCHANTS)}\nAvl Lmt INR {rng.randint(1000, 99999)}\nSMS BLOCK {_last4(rng)} to 919951860002, if not you - Axis Bank")
+
+
+def amex_card(rng):
+    when = _when(rng)
+    currency = rng.choice(["INR", "$"])
+    return (f"Alert: You've spent {currency} {_amount(rng)} on your AMEX card ** {rng.randint(10000, 99999)} at "
+            f"{rng.choice(MERCHANTS)} on {when.day} {when:%B %Y} at {when:%I:%M %p} IST. "
+            f"Call 18004190691 if this was not made by you.")
+
+
+# corpus name -> (bank_name of the parser that must match it, generator)
+BANK_CORPORA: Dict[str, Tuple[str, Callable[[random.Random], str]]] = {
+    "hdfc_card": ("HDFC Bank", hdfc_card),
+    "hdfc_upi": ("HDFC Bank", hdfc_upi),
+    "federal_upi": ("Federal Bank", federal_upi),
+    "federal_fednet": ("Federal Bank", federal_fednet),
+    "sbi_card": ("SBI", sbi_card),
+    "icici_card": ("ICICI Bank", icici_card),
+    "idfc_card": ("IDFC FIRST Bank", idfc_card),
+    "onecard": ("OneCard", onecard),
+    "axis_card": ("AXIS", axis_card),
+    "amex_card": ("AMEX", amex_card),
+}
+
+
+NEGATIVE_TEMPLATES = [
+    "{otp} is your OTP for transaction of INR {amount} at {merchant}. Valid for 10 mins. Do not share with anyone.",
+    "Dear Customer, your OTP for login is {otp}. Never share your OTP. -HDFC Bank",
+    "Your order #{order} from {merchant} has been shipped and will be delivered by tomorrow.",
+    "Get FLAT 50% OFF up to Rs.{small} on your first order at {merchant}! Use code SAVE{small}. T&C apply.",
+    "Rs.{amount} credited to your A/c XX{last4} on {date} by NEFT from ACME PAYROLL. Avl Bal Rs.{amount}. -Federal Bank",
+    "Dear Customer, Rs.{amount} has been received in your SBI account XX{last4} from {merchant}.",
+    "Your A/c XX{last4} balance as on {date} is INR {amount}. Download the ICICI Bank iMobile app.",
+    "Payment of Rs.{amount} received towards your IDFC FIRST Bank Credit Card XX{last4}. Thank you!",
+    "Your Airtel bill of Rs.{small} is due on {date}. Pay now via Airtel Thanks app.",
+    "Congratulations! You are pre-approved for a personal loan of Rs.{amount}. Apply now: bit.ly/{order}",
+    "Recharge of Rs.{small} successful for {phone}. Validity 28 days. Jio",
+    "Your cab is arriving in 3 mins. Driver {merchant}, vehicle KA01AB{last4}.",
+    "Reminder: your AMEX card statement is ready. Total due INR {amount}, due date {date}.",
+    "Refund of Rs.{small} for order {order} has been deposited to your source account.",
+    "Hi, your appointment at Apollo Clinic is confirmed for {date} 10:30 AM.",
+]
+
+
+def negative_sms(rng: random.Random) -> str:
+    when = _when(rng)
+    return rng.choice(NEGATIVE_TEMPLATES).format(
+        otp=rng.randint(100000, 999999),
+        amount=_amount(rng),
+        small=rng.randint(50, 500),
+        merchant=rng.choice(MERCHANTS),
+        order=rng.randint(10**7, 10**8),
+        last4=_last4(rng),
+        date=f"{when:%d-%m-%Y}",
+        phone=f"9{rng.randint(10**8, 10**9 - 1)}",
+    )
+
+
+def build_corpora(per_bank: int, negatives: int, seed: int = 2024) -> Dict[str, List[str]]:
+    """Returns {corpus_name: [sms, ...]} including a "negative" corpus of unrelated SMS."""
+    rng = random.Random(seed)
+    corpora = {name: [generator(rng) for _ in range(per_bank)] for name, (_, generator) in BANK_CORPORA.items()}
+    corpora["negative"] = [negative_sms(rng) for _ in range(negatives)]
+    return corpora
@@ -0,0 +1,65 @@
+"""
+Exports transactions, with their account, category and subcategory names, as CSV or NDJSON.
+
+Rows are streamed from a server-side cursor and written in batches of EXPORT_BATCH_SIZE,
+so memory stays flat however many transactions there are. Filters are the ones of
+/transactions/list.
+
+Usage (from the repository root):
+    python -m scripts.export_transactions transactions.csv
+    python -m scripts.export_transactions 2025.ndjson --date-from 2025-01-01 --date-to 2025-12-31T23:59:59
+    python -m scripts.export_transactions - --format ndjson --category-id 3 | gzip > food.ndjson.gz
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.db.session import ReadSessionLocal
+from app.schemas.transaction import ExportFormat, TransactionFilter
+from app.services.transaction_export import stream_transactions
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Export transactions as CSV or NDJSON.")
+    arg_parser.add_argument("path", help="Output file, or - for stdout")
+    arg_parser.add_argument("--format", choices=[f.value for f in ExportFormat],
+                            help="Output format (default: from the file extension, else csv)")
+    arg_parser.add_argument("--date-from", type=datetime.fromisoformat, help="SMS date, inclusive")
+    arg_parser.add_argument("--date-to", type=datetime.fromisoformat, help="SMS date, inclusive")
+    arg_parser.add_argument("--account-id", type=int)
+    arg_parser.add_argument("--category-id", type=int)
+    arg_parser.add_argument("--subcategory-id", type=int)
+    arg_parser.add_argument("--batch-size", type=int, help="Rows per fetch and write (default: EXPORT_BATCH_SIZE)")
+    args = arg_parser.parse_args(argv)
+
+    if args.batch_size is not None and args.batch_size < 1:
+        print("ERROR: --batch-size must be positive.", file=sys.stderr)
+        return 1
+    suffix = Path(args.path).suffix.lower().lstrip(".")
+    export_format = ExportFormat(args.format or ("ndjson" if suffix in ("ndjson", "jsonl") else "csv"))
+    filters = TransactionFilter(
+        date_from=args.date_from, date_to=args.date_to, account_id=args.account_id,
+        category_id=args.category_id, subcategory_id=args.subcategory_id,
+    )
+
+    started = time.perf_counter()
+    written = 0
+    out = sys.stdout.buffer if args.path == "-" else open(args.path, "wb")
+    try:
+        for chunk in stream_transactions(ReadSessionLocal, export_format, filters, args.batch_size):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    # stderr: stdout may be the export itself.
+    print(f"INFO: Exported {written:,} bytes of {export_format.value} in {time.perf_counter() - started:.1f} s.",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
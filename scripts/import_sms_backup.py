@@ -0,0 +1,180 @@
+"""
+Streams a phone SMS export into the database through the regular ParserEngine.
+
+Supported inputs:
+  - xml:    "SMS Backup & Restore" exports (<smses><sms body="..." type="1" .../></smses>)
+  - ndjson: one JSON object per line with a `body`, `sms_content` or `text` field
+  - csv:    a header row and a `body`, `sms_content` or `text` column
+
+Messages are read lazily and committed in chunks. After every chunk a checkpoint is
+written next to the input file, so an interrupted import resumes where it stopped.
+
+Usage (from the repository root):
+    python -m scripts.import_sms_backup path/to/sms-backup.xml
+    python -m scripts.import_sms_backup export.ndjson --chunk-size 1000
+    python -m scripts.import_sms_backup export.csv --restart
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from app.db.session import SessionLocal
+from app.services.sms_ingest import BatchIngestor, summarize_results
+
+BODY_FIELDS = ("body", "sms_content", "text")
+# "SMS Backup & Restore" message types: 1 = received, 2 = sent. Bank alerts are always received.
+XML_INBOX_TYPE = "1"
+
+# Each reader yields (record_number, resume_position, sms_text). `resume_position` is what
+# the checkpoint stores: a byte offset for NDJSON, otherwise the number of records consumed.
+
+
+def iter_xml_messages(path: Path, resume_from: int = 0) -> Iterator[Tuple[int, int, str]]:
+    record_number = 0
+    context = ET.iterparse(path, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event != "end" or elem.tag != "sms":
+            continue
+        record_number += 1
+        body = elem.get("body")
+        message_type = elem.get("type")
+        # Drop the element (and the root's reference to it) so memory stays flat.
+        elem.clear()
+        root.clear()
+        if record_number <= resume_from:
+            continue
+        if body and (message_type is None or message_type == XML_INBOX_TYPE):
+            yield record_number, record_number, body
+
+
+def iter_ndjson_messages(path: Path, resume_from: int = 0) -> Iterator[Tuple[int, int, str]]:
+    with open(path, "rb") as f:
+        f.seek(resume_from)
+        record_number = 0
+        while (line := f.readline()):
+            record_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"WARNING: Skipping malformed NDJSON line at byte {f.tell() - len(line)}")
+                continue
+            body = next((record[field] for field in BODY_FIELDS if record.get(field)), None)
+            if body:
+                yield record_number, f.tell(), body
+
+
+def iter_csv_messages(path: Path, resume_from: int = 0) -> Iterator[Tuple[int, int, str]]:
+    # Bodies may contain quoted newlines, so resume by record count rather than byte offset.
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        body_field = next((field for field in BODY_FIELDS if field in (reader.fieldnames or [])), None)
+        if body_field is None:
+            raise ValueError(f"CSV needs one of the columns {BODY_FIELDS}, found {reader.fieldnames}")
+        for record_number, row in enumerate(reader, start=1):
+            if record_number <= resume_from:
+                continue
+            if (body := row.get(body_field)):
+                yield record_number, record_number, body
+
+
+READERS = {
+    "xml": iter_xml_messages,
+    "ndjson": iter_ndjson_messages,
+    "csv": iter_csv_messages,
+}
+
+
+def detect_format(path: Path) -> str:
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in ("jsonl", "ndjson"):
+        return "ndjson"
+    if suffix in READERS:
+        return suffix
+    raise ValueError(f"Cannot infer the format of '{path.name}', pass --format explicitly.")
+
+
+def load_checkpoint(checkpoint_path: Path, source: Path, fmt: str) -> Tuple[int, dict]:
+    """Returns (resume_position, totals_so_far) or (0, {}) when there is nothing to resume."""
+    if not checkpoint_path.exists():
+        return 0, {}
+    checkpoint = json.loads(checkpoint_path.read_text())
+    if checkpoint.get("source") != str(source.resolve()) or checkpoint.get("format") != fmt:
+        print(f"WARNING: Ignoring checkpoint {checkpoint_path.name}, it belongs to a different import.")
+        return 0, {}
+    return checkpoint.get("position", 0), checkpoint.get("totals", {})
+
+
+def write_checkpoint(checkpoint_path: Path, source: Path, fmt: str, position: int, totals: dict) -> None:
+    tmp_path = checkpoint_path.with_suffix(checkpoint_path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps({
+        "source": str(source.resolve()),
+        "format": fmt,
+        "position": position,
+        "totals": totals,
+    }))
+    # Atomic on POSIX and Windows: a crash never leaves a half-written checkpoint behind.
+    os.replace(tmp_path, checkpoint_path)
+
+
+def run_import(path: Path, fmt: str, chunk_size: int, checkpoint_path: Path, restart: bool) -> dict:
+    resume_from, previous_totals = (0, {}) if restart else load_checkpoint(checkpoint_path, path, fmt)
+    if resume_from:
+        print(f"INFO: Resuming {path.name} from checkpoint position {resume_from}.")
+
+    totals = {key: previous_totals.get(key, 0) for key in ("created", "duplicates", "ignored", "errors")}
+    messages = READERS[fmt](path, resume_from)
+
+    db = SessionLocal()
+    try:
+        ingestor = BatchIngestor(db_session=db)
+        while (chunk := list(islice(messages, chunk_size))):
+            summary = summarize_results(ingestor.ingest((record_number, body) for record_number, _, body in chunk))
+            for key in totals:
+                totals[key] += getattr(summary, key)
+
+            position = chunk[-1][1]
+            write_checkpoint(checkpoint_path, path, fmt, position, totals)
+            print(f"INFO: Committed up to record {chunk[-1][0]} | {totals}")
+            # The chunk's ORM objects are no longer needed; keep the identity map from growing.
+            db.expunge_all()
+    finally:
+        db.close()
+
+    return totals
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Import an SMS backup/export file.")
+    arg_parser.add_argument("path", type=Path, help="SMS export file (.xml, .ndjson/.jsonl or .csv)")
+    arg_parser.add_argument("--format", choices=sorted(READERS), help="Input format (default: from file extension)")
+    arg_parser.add_argument("--chunk-size", type=int, default=500, help="Messages committed per transaction")
+    arg_parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <path>.checkpoint.json)")
+    arg_parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    args = arg_parser.parse_args(argv)
+
+    if not args.path.exists():
+        print(f"ERROR: {args.path} does not exist.")
+        return 1
+    if args.chunk_size < 1:
+        print("ERROR: --chunk-size must be positive.")
+        return 1
+
+    fmt = args.format or detect_format(args.path)
+    checkpoint_path = args.checkpoint or args.path.with_name(args.path.name + ".checkpoint.json")
+
+    totals = run_import(args.path, fmt, args.chunk_size, checkpoint_path, args.restart)
+    print(f"INFO: Import finished: {totals}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
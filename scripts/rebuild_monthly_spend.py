@@ -0,0 +1,27 @@
+"""
+Recomputes the monthly_spend aggregate from the transactions table.
+
+The aggregate is kept current by every write that can change it, so this is only needed
+after editing the database by hand or restoring a backup.
+
+Usage (from the repository root):
+    python -m scripts.rebuild_monthly_spend
+"""
+import sys
+
+from app.crud import crud_spend
+from app.db.session import SessionLocal
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        months = crud_spend.rebuild(db)
+    finally:
+        db.close()
+    print(f"INFO: Rebuilt monthly spend for {months} month(s).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())